@@ -0,0 +1,109 @@
+"""Load time and memory of .pth against flat memory-mapped checkpoints.
+
+Writes a synthetic Gaussian avatar checkpoint in both formats, converts
+with ``convert_checkpoint``, and loads each in fresh worker processes.
+Reports the time to open the checkpoint, to build the ``GaussianCloud``,
+and how much of each worker's memory is a private copy rather than shared
+page cache. Times are with a warm page cache, as for workers started after the
+first.
+
+Usage:
+    python -m benchmarks.checkpoint [--gaussians 200000] [--repeats 3]
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+from server.render_backends import GaussianCloud
+from server.utils.checkpoint import convert_checkpoint, load_checkpoint
+
+def memory_kb() -> Dict[str, int]:
+    """Anonymous and file-backed resident memory of this process (Linux).
+
+    Anonymous pages are private copies. File-backed pages come from the
+    page cache, which every process mapping the file shares.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as file:
+            for line in file:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0])
+    except OSError:
+        return {}
+    return {"private_kb": fields.get("Anonymous", 0),
+            "shared_kb": fields.get("Rss", 0) - fields.get("Anonymous", 0)}
+
+def load_worker(path: str, results) -> None:
+    """Load a checkpoint into a GaussianCloud and report timings and memory."""
+    before = memory_kb()
+    started = time.perf_counter()
+    checkpoint = load_checkpoint(path)
+    opened = time.perf_counter()
+    cloud = GaussianCloud.from_checkpoint(checkpoint)
+    # Touch every attribute, as the first rendered frame would
+    total = sum(float(np.sum(array)) for array in vars(cloud).values() if array is not None)
+    finished = time.perf_counter()
+    after = memory_kb()
+    results.put({
+        "open_ms": (opened - started) * 1000,
+        "cloud_ms": (finished - started) * 1000,
+        "private_mb": (after.get("private_kb", 0) - before.get("private_kb", 0)) / 1024,
+        "shared_mb": (after.get("shared_kb", 0) - before.get("shared_kb", 0)) / 1024,
+        "checksum": total,
+    })
+
+def run(path: Path, repeats: int) -> Dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeats + 1):  # The first run warms the page cache
+        results = context.Queue()
+        worker = context.Process(target=load_worker, args=(str(path), results))
+        worker.start()
+        runs.append(results.get())
+        worker.join()
+    best = min(runs[1:], key=lambda result: result["cloud_ms"])
+    return best
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gaussians", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    count = args.gaussians
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "pretrained_model.pth"
+        torch.save({
+            "gaussians": torch.from_numpy(rng.standard_normal((count, 10), dtype=np.float32)),
+            "colors": torch.from_numpy(rng.uniform(0, 1, (count, 3)).astype(np.float32)),
+            "opacities": torch.from_numpy(rng.uniform(0, 1, count).astype(np.float32)),
+            "blendshape_deltas": torch.from_numpy(
+                rng.standard_normal((52, count, 3), dtype=np.float32) * 0.001),
+        }, source)
+        started = time.perf_counter()
+        flat = convert_checkpoint(source, Path(directory) / "flat.tensors")
+        print(f"{count} gaussians, {source.stat().st_size / 2 ** 20:.0f} MB, "
+              f"converted in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        print(f"{'format':<8}{'open ms':>10}{'cloud ms':>10}{'private MB':>12}{'shared MB':>11}")
+        for name, path in (("pth", source), ("flat", flat)):
+            result = run(path, args.repeats)
+            results[name] = result
+            print(f"{name:<8}{result['open_ms']:>10.1f}{result['cloud_ms']:>10.1f}"
+                  f"{result['private_mb']:>12.1f}{result['shared_mb']:>11.1f}")
+        if results["pth"]["checksum"] != results["flat"]["checksum"]:
+            raise AssertionError("Flat checkpoint does not reproduce the .pth cloud")
+    return results
+
+if __name__ == "__main__":
+    main()
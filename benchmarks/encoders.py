@@ -0,0 +1,88 @@
+"""Encode cost and output size of the frame encoders.
+
+Encodes a synthetic talking-head clip, a static background and head with a
+mouth that opens and closes, and reports per-frame encode time and size
+for every codec, plus the bandwidth of one session at 30 fps.
+
+Usage:
+    python -m benchmarks.encoders [--frames 120] [--width 640] [--height 480]
+        [--codecs raw jpeg delta]
+"""
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server.frame_encoders import DeltaDecoder, create_encoder
+
+def synthetic_clip(frames: int, width: int, height: int, seed: int = 0) -> np.ndarray:
+    """``(frames, height, width, 3)`` uint8 clip where only the mouth moves."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    background = np.stack([x / width, y / height, np.full((height, width), 0.3)], axis=-1)
+    head = ((x - width / 2) / (0.22 * width)) ** 2 + ((y - height / 2) / (0.38 * height)) ** 2
+    texture = rng.uniform(-0.05, 0.05, (height, width, 1))
+    base = np.where((head < 1)[..., None], [0.85, 0.65, 0.55] + texture, background)
+
+    clip = np.empty((frames, height, width, 3), dtype=np.uint8)
+    for i in range(frames):
+        opening = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * i / 30)
+        mouth = (((x - width / 2) / (0.07 * width)) ** 2
+                 + ((y - 0.65 * height) / (0.005 * height + 0.03 * height * opening)) ** 2)
+        frame = np.where((mouth < 1)[..., None], [0.35, 0.1, 0.1], base)
+        clip[i] = np.clip(frame * 255 + 0.5, 0, 255)
+    return clip
+
+def run_codec(name: str, clip: np.ndarray, frame_rate: float = 30.0) -> Dict[str, float]:
+    """Encode the clip once for warm-up and once timed."""
+    encoder = create_encoder(name)
+    for frame in clip[:5]:
+        encoder.encode(frame).release()
+    encoder.reset()
+
+    times, sizes = [], []
+    decoder = DeltaDecoder() if name == "delta" else None
+    for frame in clip:
+        started = time.perf_counter()
+        encoded = encoder.encode(frame)
+        times.append(time.perf_counter() - started)
+        sizes.append(len(encoded))
+        if decoder is not None and not np.array_equal(decoder.decode(encoded.data), frame):
+            raise AssertionError("Delta stream does not reproduce the input")
+        encoded.release()
+
+    times_ms = np.array(times) * 1000
+    return {
+        "ms_per_frame": float(times_ms.mean()),
+        "p95_ms": float(np.percentile(times_ms, 95)),
+        "kb_per_frame": float(np.mean(sizes) / 1000),
+        "compression": float(clip[0].nbytes / np.mean(sizes)),
+        "mbit_per_second": float(np.mean(sizes) * 8 * frame_rate / 1e6),
+    }
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--codecs", nargs="+", default=["raw", "jpeg", "delta"])
+    args = parser.parse_args(argv)
+
+    clip = synthetic_clip(args.frames, args.width, args.height)
+    results = {}
+    print(f"{'codec':<8}{'ms/frame':>10}{'p95 ms':>9}{'KB/frame':>10}{'ratio':>8}{'Mbit/s':>9}")
+    for name in args.codecs:
+        try:
+            result = run_codec(name, clip)
+        except ImportError as e:
+            print(f"{name:<8}skipped: {e}")
+            continue
+        results[name] = result
+        print(f"{name:<8}{result['ms_per_frame']:>10.2f}{result['p95_ms']:>9.2f}"
+              f"{result['kb_per_frame']:>10.1f}{result['compression']:>8.1f}"
+              f"{result['mbit_per_second']:>9.1f}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Cost of the latency histograms and counters.
+
+Times ``Histogram.observe`` and ``Counter.inc`` against the frame budget,
+then renders a second of speech on the NumPy rasterizer and prints the
+per-stage latencies it recorded. Correctness is covered by
+tests/test_metrics.py.
+
+Usage:
+    python -m benchmarks.metrics [--observations 200000] [--gaussians 2000] [--scale 0.25]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server.utils.metrics import REGISTRY, MetricsRegistry
+
+FRAME_BUDGET = 1 / 30
+
+def overhead_ns(observations: int) -> Dict[str, float]:
+    """Nanoseconds per observation and per increment."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("overhead_seconds")
+    counter = registry.counter("overhead_total")
+    values = [float(v) for v in np.random.default_rng(1).lognormal(-4, 1, observations)]
+
+    started = time.perf_counter()
+    for value in values:
+        histogram.observe(value)
+    observe = (time.perf_counter() - started) / observations
+    started = time.perf_counter()
+    for _ in values:
+        counter.inc()
+    inc = (time.perf_counter() - started) / observations
+    started = time.perf_counter()
+    for _ in values:
+        with histogram.time():
+            pass
+    timed = (time.perf_counter() - started) / observations
+    return {"observe_ns": observe * 1e9, "inc_ns": inc * 1e9, "time_block_ns": timed * 1e9}
+
+async def render(model_path: Path, scale: float) -> None:
+    """Render a second of speech so the render and encode histograms fill."""
+    from benchmarks.animation import synthetic_speech
+    from server.render_backends import create_rasterizer
+    from server.rendering_service import RenderingService
+
+    service = RenderingService(str(model_path), str(model_path.with_name("config.yaml")),
+                               backend=create_rasterizer("numpy"), render_scale=scale,
+                               codec="jpeg")
+    async for _ in service.render_frames(synthetic_speech(1.0, 16000), sample_rate=16000):
+        pass
+    await service.cleanup()
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--observations", type=int, default=200000)
+    parser.add_argument("--gaussians", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=0.25, help="Resolution relative to 640x480")
+    args = parser.parse_args(argv)
+    logging.getLogger("server").setLevel(logging.CRITICAL)
+
+    results = overhead_ns(args.observations)
+    share = results["observe_ns"] * 2 / (FRAME_BUDGET * 1e9) * 100
+    print(f"observe {results['observe_ns']:.0f} ns, inc {results['inc_ns']:.0f} ns, "
+          f"timed block {results['time_block_ns']:.0f} ns; "
+          f"{share:.4f}% of a 30 fps frame for render and encode")
+
+    from benchmarks.sessions import write_checkpoint
+    REGISTRY.reset()
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = write_checkpoint(Path(directory), args.gaussians)
+        asyncio.run(render(model_path, args.scale))
+    snapshot = REGISTRY.snapshot()
+    print(f"{'stage':<32}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name in ("animation_inference_seconds", "render_frame_seconds", "frame_encode_seconds"):
+        stats = snapshot[name]
+        print(f"{name:<32}{stats['count']:>7}{stats['p50'] * 1000:>9.2f}"
+              f"{stats['p95'] * 1000:>9.2f}{stats['p99'] * 1000:>9.2f}")
+        results[f"{name}_p95"] = stats["p95"]
+    if share > 1.0:
+        raise AssertionError(f"Recording a frame's metrics takes {share:.2f}% of the frame budget")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""End-to-end turn latency of the conversation orchestrator.
+
+Speaks synthetic utterances into ``ConversationOrchestrator`` in real time
+and measures, from each final transcript, how long it takes until the
+first response text, synthesized audio and video frame. The same turn run
+stage after stage (full response, then full synthesis, then rendering) is
+the baseline. A second scenario starts talking over the avatar and checks
+that barge-in cancels the turn in flight without leaking its frames.
+
+The LLM and TTS use their placeholder backends and the avatar renders on
+the NumPy rasterizer. Speech recognition is ``ScriptedSTT``: real voice
+activity detection with fixed transcripts, since Vosk models are not
+available on a bare CPU box.
+
+Usage:
+    python -m benchmarks.pipeline [--gaussians 2000] [--scale 0.25] [--codec raw]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.animation import synthetic_speech
+from benchmarks.sessions import write_checkpoint
+from server.llm_service import LLMService
+from server.orchestrator import ConversationOrchestrator, PipelineEvent, PipelineEventType
+from server.render_backends import create_rasterizer
+from server.rendering_service import RenderingService
+from server.stt_service import TranscriptEvent
+from server.tts_service import TTSService
+from server.utils.audio import VADEventType, VoiceActivityDetector
+from server.utils.checkpoint import save_checkpoint
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+
+class ScriptedSTT:
+    """CPU stand-in for ``STTService.transcribe_stream``.
+
+    Segments the audio with the voice activity detector it is given and
+    yields the next scripted transcript at the end of every segment.
+    Records when each speech boundary was detected.
+    """
+
+    sample_rate = SAMPLE_RATE
+
+    def __init__(self, transcripts: List[str]):
+        self.transcripts: Iterator[str] = iter(transcripts)
+        self.speech_starts: List[float] = []
+
+    async def transcribe_stream(self,
+                                frames: AsyncIterable[bytes],
+                                session_id: Optional[str] = None,
+                                vad: Optional[VoiceActivityDetector] = None,
+                                sample_rate: Optional[int] = None) -> AsyncGenerator:
+        vad = vad or VoiceActivityDetector(self.sample_rate)
+        loop = asyncio.get_running_loop()
+        async for frame in frames:
+            for event in vad.process(np.frombuffer(frame, dtype=np.int16)):
+                if event.type == VADEventType.SPEECH_START:
+                    self.speech_starts.append(loop.time())
+                elif event.type == VADEventType.SPEECH_END:
+                    yield TranscriptEvent(text=next(self.transcripts), is_final=True)
+                if event.type != VADEventType.SPEECH:
+                    yield event
+
+async def microphone(audio: np.ndarray) -> AsyncGenerator[bytes, None]:
+    """Yield audio in 20 ms frames at the pace it would be spoken."""
+    step = SAMPLE_RATE * FRAME_MS // 1000
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for index, start in enumerate(range(0, len(audio), step)):
+        delay = started + index * FRAME_MS / 1000 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield audio[start:start + step].tobytes()
+
+def utterance(seconds: float, silence: float) -> np.ndarray:
+    """Synthetic speech followed by silence."""
+    return np.concatenate((synthetic_speech(seconds, SAMPLE_RATE),
+                           np.zeros(int(silence * SAMPLE_RATE), dtype=np.int16)))
+
+def make_tts(directory: Path) -> TTSService:
+    """Placeholder TTS on an empty flat checkpoint, without a GPU."""
+    model_path = directory / "tts.pth"
+    save_checkpoint({}, model_path)
+    config_path = directory / "tts.json"
+    config_path.write_text("{}\n")
+    return TTSService(str(model_path), str(config_path), require_gpu=False)
+
+async def sequential_turn(llm: LLMService,
+                          tts: TTSService,
+                          renderer: RenderingService,
+                          text: str) -> Dict[str, float]:
+    """The turn run one stage after another, as the baseline."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response = await llm.get_response(text, "sequential", use_cache=False)
+    first_text = loop.time() - started
+    audio = await tts.synthesize(response, use_cache=False)
+    first_audio = loop.time() - started
+    frames = renderer.render_frames(audio, tts.sample_rate, session_id="sequential")
+    try:
+        await frames.__anext__()
+    finally:
+        await frames.aclose()
+    return {"first_text": first_text, "first_audio": first_audio,
+            "first_frame": loop.time() - started}
+
+async def converse(orchestrator: ConversationOrchestrator,
+                   audio: np.ndarray,
+                   session_id: str) -> List[Tuple[float, PipelineEvent]]:
+    """Run a session to completion and collect its events with their arrival times."""
+    loop = asyncio.get_running_loop()
+    events = []
+    async for event in orchestrator.run(microphone(audio), session_id,
+                                        vad=VoiceActivityDetector(SAMPLE_RATE)):
+        if event.type == PipelineEventType.ERROR:
+            raise AssertionError(f"Turn {event.turn} failed: {event.data}")
+        events.append((loop.time(), event))
+    return events
+
+async def run_all(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        model_path = write_checkpoint(directory, args.gaussians)
+        llm = LLMService()
+        tts = make_tts(directory)
+        renderer = RenderingService(str(model_path), str(directory / "config.yaml"),
+                                    backend=create_rasterizer("numpy"),
+                                    render_scale=args.scale, codec=args.codec)
+
+        results["sequential"] = await sequential_turn(llm, tts, renderer, "Hello there.")
+
+        # One turn: speak, then listen to the whole answer
+        stt = ScriptedSTT(["Hello there."])
+        orchestrator = ConversationOrchestrator(stt, llm, tts, renderer)
+        events = await converse(orchestrator, utterance(1.0, 1.0), "pipelined")
+        turn_end = [event for _, event in events if event.type == PipelineEventType.TURN_END]
+        if len(turn_end) != 1:
+            raise AssertionError(f"Expected one finished turn, got {len(turn_end)}")
+        timings = turn_end[0].data
+        results["pipelined"] = {"first_text": timings.first_text,
+                                "first_audio": timings.first_audio,
+                                "first_frame": timings.first_frame}
+
+        # Barge-in: start the next utterance while the avatar is answering
+        stt = ScriptedSTT(["Hello there.", "Wait, one more thing."])
+        orchestrator = ConversationOrchestrator(stt, llm, tts, renderer)
+        audio = np.concatenate((utterance(1.0, 2.0), utterance(1.0, 1.0)))
+        events = await converse(orchestrator, audio, "barge-in")
+        interrupted = [index for index, (_, event) in enumerate(events)
+                       if event.type == PipelineEventType.INTERRUPTED]
+        if len(interrupted) != 1:
+            raise AssertionError(f"Expected one interrupted turn, got {len(interrupted)}")
+        cut = interrupted[0]
+        leaked = [event for _, event in events[cut:]
+                  if event.turn == 1 and event.type == PipelineEventType.VIDEO_FRAME]
+        if leaked:
+            raise AssertionError(f"{len(leaked)} frames of the interrupted turn were delivered")
+        if not any(event.type == PipelineEventType.TURN_END and event.turn == 2
+                   for _, event in events):
+            raise AssertionError("The turn after the barge-in did not finish")
+        results["barge_in"] = {"cancel": events[cut][0] - stt.speech_starts[1]}
+
+        await llm.cleanup()
+        await tts.cleanup()
+        await renderer.cleanup()
+    return results
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gaussians", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=0.25, help="Resolution relative to 640x480")
+    parser.add_argument("--codec", default="raw", choices=("raw", "jpeg", "delta"))
+    args = parser.parse_args(argv)
+    logging.getLogger("server").setLevel(logging.WARNING)
+
+    started = time.perf_counter()
+    results = asyncio.run(run_all(args))
+    print(f"{'turn':<12}{'1st text ms':>13}{'1st audio ms':>14}{'1st frame ms':>14}")
+    for name in ("sequential", "pipelined"):
+        result = results[name]
+        print(f"{name:<12}{result['first_text'] * 1000:>13.1f}"
+              f"{result['first_audio'] * 1000:>14.1f}{result['first_frame'] * 1000:>14.1f}")
+    print(f"barge-in cancelled the turn {results['barge_in']['cancel'] * 1000:.1f} ms after "
+          f"speech was detected ({time.perf_counter() - started:.1f} s total)")
+    if results["pipelined"]["first_frame"] >= results["sequential"]["first_frame"]:
+        raise AssertionError("The pipelined turn showed its first frame no earlier than "
+                             "the sequential one")
+    return results
+
+if __name__ == "__main__":
+    main()
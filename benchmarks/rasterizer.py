@@ -0,0 +1,71 @@
+"""Frame cost of a rasterizer backend against Gaussian count and resolution.
+
+Renders a synthetic head-sized cloud from the default frontal camera and
+reports the best-of-N time per frame for every combination.
+
+Usage:
+    python -m benchmarks.rasterizer [--backend numpy] [--counts 1000 10000]
+        [--scales 0.25 0.5 1.0]
+"""
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server.render_backends import Camera, GaussianCloud, create_rasterizer
+
+def synthetic_cloud(count: int, seed: int = 0) -> GaussianCloud:
+    """Ellipsoidal shell of Gaussians roughly the size of a face."""
+    rng = np.random.default_rng(seed)
+    direction = rng.standard_normal((count, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    rotations = rng.standard_normal((count, 4))
+    rotations /= np.linalg.norm(rotations, axis=1, keepdims=True)
+    return GaussianCloud(
+        means=(direction * [0.08, 0.11, 0.1]).astype(np.float32),
+        scales=np.exp(rng.uniform(-6.0, -4.5, (count, 3))).astype(np.float32),
+        rotations=rotations.astype(np.float32),
+        colors=rng.uniform(0.3, 0.9, (count, 3)).astype(np.float32),
+        opacities=rng.uniform(0.5, 1.0, count).astype(np.float32),
+        blendshape_deltas=(rng.standard_normal((52, count, 3)) * 0.002).astype(np.float32))
+
+def time_frame(backend, cloud: GaussianCloud, camera: Camera, repeats: int) -> float:
+    weights = np.zeros(52, dtype=np.float32)
+    backend.render(cloud, camera, weights)  # Warm-up and attribute caching
+    best = float("inf")
+    for i in range(repeats):
+        weights[24] = i / repeats  # jawOpen, so every frame is deformed
+        started = time.perf_counter()
+        backend.render(cloud, camera, weights)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default=None, help="numpy or cuda (default: best available)")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.25, 0.5, 1.0],
+                        help="Resolution relative to 640x480")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    backend = create_rasterizer(args.backend)
+    camera = Camera.look_at((0.0, 0.0, 1.0), (0.0, 0.0, 0.0), (640, 480))
+    results = []
+    print(f"backend: {backend.name}")
+    print(f"{'gaussians':>10}{'resolution':>12}{'ms/frame':>10}{'fps':>8}")
+    for count in args.counts:
+        cloud = synthetic_cloud(count)
+        for scale in args.scales:
+            view = camera.scaled(scale)
+            seconds = time_frame(backend, cloud, view, args.repeats)
+            results.append({"gaussians": count, "width": view.width, "height": view.height,
+                            "ms_per_frame": seconds * 1000})
+            print(f"{count:>10}{f'{view.width}x{view.height}':>12}{seconds * 1000:>10.1f}"
+                  f"{1 / seconds:>8.1f}")
+    backend.close()
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Tail latency of service calls under partial and full outages.
+
+Calls a simulated backend through ``handle_service_errors`` configured
+three ways: immediate retries only, as the decorator used to behave; with
+a deadline budget and backoff; and additionally hedged. During the partial
+outage some calls stall and some fail; during the full outage every call
+fails, and the circuit breaker should send calls to the backup handler
+without waiting on the backend.
+
+Usage:
+    python -m benchmarks.resilience [--calls 400] [--stall-rate 0.05] [--error-rate 0.1]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from server.exceptions import ProcessingError
+from server.utils.error_handler import handle_service_errors
+
+class FlakyBackend:
+    """Backend taking ``latency`` seconds per call that stalls or fails at random."""
+
+    def __init__(self, latency: float, stall: float, stall_rate: float, error_rate: float,
+                 seed: int = 0):
+        self.latency = latency
+        self.stall = stall
+        self.stall_rate = stall_rate
+        self.error_rate = error_rate
+        self.down = False
+        self.calls = 0
+        self.rng = random.Random(seed)
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        draw = self.rng.random()
+        if self.down or draw < self.error_rate:
+            await asyncio.sleep(self.latency)
+            raise ProcessingError("backend error")
+        if draw < self.error_rate + self.stall_rate:
+            await asyncio.sleep(self.stall)
+        else:
+            await asyncio.sleep(self.latency)
+        return "ok"
+
+async def backup() -> str:
+    return "backup"
+
+def configurations(backend: FlakyBackend, budget: float, hedge: float) -> Dict[str, Callable]:
+    """The backend behind the decorator in each configuration, with separate breakers."""
+    async def call():
+        return await backend()
+
+    return {
+        "retries": handle_service_errors(retries=3, backoff=0.0, service="retries",
+                                         failure_threshold=10 ** 9)(call),
+        "deadline": handle_service_errors(retries=3, timeout=budget, service="deadline",
+                                          backup_handler=backup)(call),
+        "hedged": handle_service_errors(retries=3, timeout=budget, hedge_after=hedge,
+                                        service="hedged", backup_handler=backup)(call),
+    }
+
+async def measure(function: Callable, calls: int, concurrency: int = 8) -> Dict[str, float]:
+    """Latency percentiles and outcomes of ``calls`` calls, ``concurrency`` at a time."""
+    latencies: List[float] = []
+    outcomes = {"ok": 0, "backup": 0, "error": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                outcomes[await function()] += 1
+            except Exception:
+                outcomes["error"] += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    p50, p99, worst = np.percentile(latencies, [50, 99, 100]) * 1000
+    return {"p50_ms": p50, "p99_ms": p99, "max_ms": worst, **outcomes}
+
+async def run_all(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in ("retries", "deadline", "hedged"):
+        backend = FlakyBackend(args.latency, args.stall, args.stall_rate, args.error_rate)
+        function = configurations(backend, args.budget, args.hedge_after)[name]
+        results[f"partial/{name}"] = await measure(function, args.calls)
+        backend.down = True
+        results[f"full/{name}"] = await measure(function, args.calls // 4)
+        results[f"full/{name}"]["backend_calls"] = backend.calls
+    return results
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02, help="Normal call seconds")
+    parser.add_argument("--stall", type=float, default=1.0, help="Stalled call seconds")
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--budget", type=float, default=0.25, help="Deadline per call")
+    parser.add_argument("--hedge-after", type=float, default=0.06)
+    args = parser.parse_args(argv)
+    logging.getLogger("server").setLevel(logging.CRITICAL)
+
+    results = asyncio.run(run_all(args))
+    print(f"{'outage/config':<18}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'ok':>6}{'backup':>8}{'error':>7}")
+    for name, result in results.items():
+        print(f"{name:<18}{result['p50_ms']:>9.1f}{result['p99_ms']:>9.1f}"
+              f"{result['max_ms']:>9.1f}{result['ok']:>6}{result['backup']:>8}"
+              f"{result['error']:>7}")
+    budget_ms = args.budget * 1000
+    for name in ("deadline", "hedged"):
+        if results[f"partial/{name}"]["max_ms"] > budget_ms * 1.5:
+            raise AssertionError(f"{name} calls outlived their {budget_ms:.0f} ms budget")
+    if results["partial/hedged"]["p99_ms"] >= results["partial/retries"]["p99_ms"]:
+        raise AssertionError("Hedging did not lower the tail latency")
+    if results["full/deadline"]["backup"] == 0:
+        raise AssertionError("The open circuit did not fail over to the backup handler")
+    return results
+
+if __name__ == "__main__":
+    main()
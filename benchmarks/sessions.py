@@ -0,0 +1,148 @@
+"""Concurrent avatar sessions served by one RenderingService.
+
+Streams the same utterance to several sessions at once and reports how
+many of their frames were freshly rendered rather than repeated, with and
+without cross-session batching. All sessions share one loaded cloud, so
+model memory is paid once per node instead of once per session.
+
+The ``launch-bound`` backend stands in for a GPU rasterizer, whose cost
+is dominated by a fixed per-call launch latency, so the sessions-per-node
+gain from batching can be checked on a machine without one.
+
+Usage:
+    python -m benchmarks.sessions [--backend numpy|cuda|launch-bound]
+        [--sessions 1 2 4 8] [--batch-sizes 1 8] [--gaussians 2000]
+        [--scale 0.25] [--seconds 2] [--launch-ms 20] [--frame-ms 1]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from benchmarks.animation import synthetic_speech
+from benchmarks.rasterizer import synthetic_cloud
+from server.render_backends import Camera, GaussianCloud, RasterizerBackend, create_rasterizer
+from server.rendering_service import RenderingService
+
+class LaunchBoundRasterizer(RasterizerBackend):
+    """Stand-in backend taking a fixed time per call plus a little per frame.
+
+    Sleeps instead of computing, releasing the GIL as a device wait would,
+    and returns black frames.
+    """
+
+    name = "launch-bound"
+
+    def __init__(self, launch: float = 0.02, per_frame: float = 0.001):
+        self.launch = launch
+        self.per_frame = per_frame
+
+    def render(self,
+               cloud: GaussianCloud,
+               camera: Camera,
+               weights: Optional[np.ndarray] = None,
+               background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        return self.render_batch(cloud, camera, np.zeros((1, 52), dtype=np.float32),
+                                 background)[0]
+
+    def render_batch(self,
+                     cloud: GaussianCloud,
+                     camera: Camera,
+                     weights: np.ndarray,
+                     background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        time.sleep(self.launch + self.per_frame * len(weights))
+        frames = np.empty((len(weights), camera.height, camera.width, 3), dtype=np.float32)
+        frames[...] = background
+        return frames
+
+def make_backend(args: argparse.Namespace) -> RasterizerBackend:
+    if args.backend == LaunchBoundRasterizer.name:
+        return LaunchBoundRasterizer(args.launch_ms / 1000, args.frame_ms / 1000)
+    return create_rasterizer(args.backend)
+
+def write_checkpoint(directory: Path, count: int) -> Path:
+    """Save a synthetic cloud in the training checkpoint layout."""
+    cloud = synthetic_cloud(count)
+    w, x, y, z = cloud.rotations.T
+    gaussians = np.concatenate((cloud.means, np.log(cloud.scales),
+                                np.stack((w, x, y, z), axis=1)), axis=1)
+    path = directory / "model.pth"
+    torch.save({"gaussians": torch.from_numpy(gaussians),
+                "colors": torch.from_numpy(cloud.colors),
+                "opacities": torch.from_numpy(cloud.opacities),
+                "blendshape_deltas": torch.from_numpy(cloud.blendshape_deltas)}, path)
+    (directory / "config.yaml").write_text("{}\n")
+    return path
+
+async def run_sessions(service: RenderingService, audio: bytes, sessions: int) -> Dict[str, float]:
+    async def session(session_id: str) -> None:
+        async for _ in service.render_frames(audio, sample_rate=16000, session_id=session_id):
+            pass
+
+    ids = [f"bench-{i}" for i in range(sessions)]
+    started = time.perf_counter()
+    await asyncio.gather(*(session(session_id) for session_id in ids))
+    elapsed = time.perf_counter() - started
+
+    stats = [service.get_session_stats(session_id) for session_id in ids]
+    for session_id in ids:
+        service.end_session(session_id)
+    emitted = sum(s["frames_emitted"] for s in stats)
+    fresh = emitted - sum(s["frames_duplicated"] for s in stats)
+    return {
+        "fresh_ratio": fresh / max(emitted, 1),
+        "rendered_fps": sum(s["frames_rendered"] for s in stats) / elapsed,
+        "late_frames": sum(s["frames_late"] for s in stats),
+    }
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default=None,
+                        help="numpy, cuda or launch-bound (default: best available)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--gaussians", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=0.25, help="Resolution relative to 640x480")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Utterance length")
+    parser.add_argument("--launch-ms", type=float, default=20.0,
+                        help="Per-call latency of the launch-bound backend")
+    parser.add_argument("--frame-ms", type=float, default=1.0,
+                        help="Per-frame cost of the launch-bound backend")
+    args = parser.parse_args(argv)
+    logging.getLogger("server").setLevel(logging.WARNING)
+
+    return asyncio.run(run_all(args))
+
+async def run_all(args: argparse.Namespace) -> List[Dict[str, float]]:
+    audio = synthetic_speech(args.seconds).tobytes()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = write_checkpoint(Path(directory), args.gaussians)
+        print(f"{'sessions':>9}{'batch':>7}{'fresh %':>9}{'render fps':>12}{'late':>6}"
+              f"{'mean batch':>12}")
+        for batch_size in args.batch_sizes:
+            service = RenderingService(str(model_path), str(Path(directory) / "config.yaml"),
+                                       backend=make_backend(args),
+                                       render_scale=args.scale, max_batch_size=batch_size)
+            for sessions in args.sessions:
+                batcher = service.batcher
+                if batcher is not None:
+                    batcher.batches_dispatched = batcher.requests_dispatched = 0
+                result = await run_sessions(service, audio, sessions)
+                result.update(sessions=sessions, batch_size=batch_size,
+                              mean_batch=batcher.mean_batch_size if batcher is not None else 1.0)
+                results.append(result)
+                print(f"{sessions:>9}{batch_size:>7}{result['fresh_ratio'] * 100:>9.1f}"
+                      f"{result['rendered_fps']:>12.1f}{result['late_frames']:>6}"
+                      f"{result['mean_batch']:>12.2f}")
+            await service.cleanup()
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cold start of the rendering service, with and without warm-up.
+
+Starts a ``RenderingService`` in fresh worker processes and reports the
+time to import the service module, the load and warm-up stages, and how
+long the first and second requests take to produce their first frame.
+Without warm-up the first request pays for imports, cache fills and the
+first rasterizer pass; with it both requests should take about as long.
+On the NumPy backend these costs are small; on CUDA the first pass also
+uploads the cloud and initializes the kernels.
+
+Usage:
+    python -m benchmarks.startup [--gaussians 2000] [--scale 0.25] [--codec jpeg]
+        [--repeats 3]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+async def first_frame_ms(service, audio) -> float:
+    """Time from a request to its first encoded frame."""
+    started = time.perf_counter()
+    frames = service.render_frames(audio, sample_rate=16000)
+    try:
+        await frames.__anext__()
+    finally:
+        await frames.aclose()
+    return (time.perf_counter() - started) * 1000
+
+def start_worker(model_path: str, options: Dict, warm: bool, results) -> None:
+    """Import, start and query a rendering service in this process."""
+    started = time.perf_counter()
+    from server.rendering_service import RenderingService
+    imported = time.perf_counter()
+    torch_on_import = "torch" in sys.modules
+
+    from server.render_backends import create_rasterizer
+    service = RenderingService(model_path, str(Path(model_path).with_name("config.yaml")),
+                               backend=create_rasterizer("numpy"), defer_start=True, **options)
+    service.lifecycle.run(service._load, service._warm_up if warm else lambda: None)
+    from benchmarks.animation import synthetic_speech
+    audio = synthetic_speech(1.0, 16000)
+
+    async def requests():
+        first = await first_frame_ms(service, audio)
+        second = await first_frame_ms(service, audio)
+        await service.cleanup()
+        return first, second
+
+    first, second = asyncio.run(requests())
+    timings = service.lifecycle.timings
+    results.put({
+        "import_ms": (imported - started) * 1000,
+        "torch_on_import": torch_on_import,
+        "load_ms": timings["loading"] * 1000,
+        "warm_up_ms": timings["warming_up"] * 1000,
+        "first_ms": first,
+        "second_ms": second,
+    })
+
+def run(model_path: Path, options: Dict, warm: bool, repeats: int) -> Dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeats + 1):  # The first run warms the page cache
+        results = context.Queue()
+        worker = context.Process(target=start_worker,
+                                 args=(str(model_path), options, warm, results))
+        worker.start()
+        runs.append(results.get())
+        worker.join()
+    return min(runs[1:], key=lambda result: result["first_ms"])
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gaussians", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=0.25)
+    parser.add_argument("--codec", default="jpeg", choices=("raw", "jpeg", "delta"))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+    # Imports torch, so it must stay out of the worker's module imports
+    from benchmarks.sessions import write_checkpoint
+
+    options = {"render_scale": args.scale, "codec": args.codec}
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = write_checkpoint(Path(directory), args.gaussians)
+        print(f"{'start':<8}{'import ms':>11}{'load ms':>9}{'warm-up ms':>12}"
+              f"{'1st request':>13}{'2nd request':>13}")
+        for name, warm in (("cold", False), ("warm", True)):
+            result = run(model_path, options, warm, args.repeats)
+            results[name] = result
+            print(f"{name:<8}{result['import_ms']:>11.1f}{result['load_ms']:>9.1f}"
+                  f"{result['warm_up_ms']:>12.1f}{result['first_ms']:>13.1f}"
+                  f"{result['second_ms']:>13.1f}")
+    if results["warm"]["torch_on_import"]:
+        raise AssertionError("Importing the rendering service imported torch")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Micro- and macro-benchmarks of the server package against a stored baseline.
+
+Micro-benchmarks time one call of each hot path on fixed synthetic input:
+audio feature extraction and normalization, ``Transform3D`` matrix
+building, ``FacialAnimationDriver.process_audio``, the chunking of
+``STTService.process_audio``, ``TTSService.synthesize`` and the
+``render_frames`` pacing loop. The macro-benchmark speaks one utterance
+into ``ConversationOrchestrator`` and times the turn up to its first frame.
+
+Everything runs on the CPU with fixed seeds and one torch thread. STT uses
+a stand-in recognizer, so only the service's own chunking, pooling and
+executor hand-off are timed. LLM and TTS use their placeholder backends
+and the avatar renders on the NumPy rasterizer. The pacing loop is timed
+in CPU time per frame, because its wall time is set by the frame clock.
+
+Results are written as JSON and compared with ``benchmarks/baseline.json``.
+A benchmark regresses when its metric exceeds the baseline value times its
+threshold, which is the file's default threshold unless the entry sets its
+own. The baseline was recorded on a single-core Linux VM; record one on the
+machine that runs the comparison with ``--update-baseline``.
+
+Usage:
+    python -m benchmarks.suite [--only audio_features turn] [--repeats 7]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+        [--update-baseline]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from benchmarks.animation import synthetic_speech
+from benchmarks.pipeline import ScriptedSTT, converse, make_tts, utterance
+from benchmarks.sessions import write_checkpoint
+from server.animation.real_time_drivers import FacialAnimationDriver
+from server.llm_service import LLMService
+from server.orchestrator import ConversationOrchestrator, PipelineEventType
+from server.render_backends import create_rasterizer
+from server.rendering_service import RenderingService
+from server.stt_service import RecognizerPool, STTService
+from server.utils.audio import AudioProcessor
+from server.utils.transforms import Transform3D
+
+BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 1.5
+SAMPLE_RATE = 16000
+
+class StandInRecognizer:
+    """CPU stand-in for ``KaldiRecognizer`` closing an utterance every second."""
+
+    def __init__(self, sample_rate: int):
+        self.utterance_bytes = sample_rate * 2
+        self.pending = 0
+
+    def SetWords(self, words: bool) -> None:
+        pass
+
+    def AcceptWaveform(self, data: bytes) -> bool:
+        self.pending += len(data)
+        if self.pending < self.utterance_bytes:
+            return False
+        self.pending = 0
+        return True
+
+    def Result(self) -> str:
+        return '{"text": "hello there"}'
+
+    def PartialResult(self) -> str:
+        return '{"partial": "hello"}'
+
+    def FinalResult(self) -> str:
+        self.pending = 0
+        return '{"text": ""}'
+
+    def Reset(self) -> None:
+        self.pending = 0
+
+class StandInPool(RecognizerPool):
+    """Recognizer pool handing out ``StandInRecognizer`` instances."""
+
+    def _create_recognizer(self) -> StandInRecognizer:
+        return StandInRecognizer(self.sample_rate)
+
+def summarize(samples: List[float], **extra: Any) -> Dict[str, Any]:
+    """Median and spread of per-call times in milliseconds."""
+    samples_ms = [sample * 1000 for sample in samples]
+    result = {"metric": "median_ms",
+              "median_ms": statistics.median(samples_ms),
+              "min_ms": min(samples_ms),
+              "max_ms": max(samples_ms),
+              "repeats": len(samples_ms)}
+    result.update(extra)
+    return result
+
+def time_calls(function: Callable[[], Any], repeats: int, warm_up: int = 1) -> List[float]:
+    """Seconds taken by each of ``repeats`` calls after ``warm_up`` untimed ones."""
+    for _ in range(warm_up):
+        function()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+async def time_awaits(function: Callable[[], Any], repeats: int, warm_up: int = 1) -> List[float]:
+    """Seconds taken by each of ``repeats`` awaited calls after ``warm_up`` untimed ones."""
+    for _ in range(warm_up):
+        await function()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def bench_audio_features(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Log-mel features of one second of speech."""
+    processor = AudioProcessor(SAMPLE_RATE)
+    audio = synthetic_speech(1.0, SAMPLE_RATE)
+    return summarize(time_calls(lambda: processor.extract_features(audio), repeats * 10))
+
+def bench_audio_normalize(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Peak normalization of ten seconds of float speech."""
+    audio = synthetic_speech(10.0, SAMPLE_RATE).astype(np.float32)
+    return summarize(time_calls(lambda: AudioProcessor.normalize_audio(audio), repeats * 10))
+
+def bench_transform_matrices(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Model, view and projection matrices of 1000 head poses."""
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-0.3, 0.3, (1000, 3))
+    positions = rng.uniform(-0.05, 0.05, (1000, 3))
+    eyes = positions + np.array([0.0, 0.0, 2.0])
+    up = np.array([0.0, 1.0, 0.0])
+    fovs = np.full(1000, 0.8)
+
+    def build():
+        models = Transform3D.model_matrices(angles, positions)
+        views = Transform3D.view_matrices(eyes, positions, up)
+        return Transform3D.perspective_matrices(fovs, 4 / 3, 0.01, 100.0) @ views @ models
+
+    return summarize(time_calls(build, repeats * 10))
+
+def bench_animation(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Expression coefficients for one second of speech."""
+    driver = FacialAnimationDriver(device="cpu")
+    audio = synthetic_speech(1.0, SAMPLE_RATE)
+    return summarize(time_calls(lambda: driver.process_audio(audio), repeats * 5))
+
+def bench_stt_chunking(repeats: int, directory: Path) -> Dict[str, Any]:
+    """``process_audio`` on five seconds of speech with a stand-in recognizer."""
+    service = STTService(str(directory), SAMPLE_RATE, defer_start=True, max_workers=1)
+
+    def load():
+        service.pool = StandInPool(None, service.sample_rate)
+
+    service.lifecycle.run(load, service._warm_up)
+    audio = synthetic_speech(5.0, SAMPLE_RATE).tobytes()
+
+    async def run():
+        samples = await time_awaits(lambda: service.process_audio(audio), repeats * 10)
+        await service.cleanup()
+        return samples
+
+    return summarize(asyncio.run(run()))
+
+def bench_tts_synthesize(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Uncached synthesis of a sentence with the placeholder model."""
+    tts = make_tts(directory)
+    text = "I understand your message."
+
+    async def run():
+        samples = await time_awaits(lambda: tts.synthesize(text, use_cache=False), repeats * 10)
+        await tts.cleanup()
+        return samples
+
+    return summarize(asyncio.run(run()))
+
+def bench_render_pacing(repeats: int, directory: Path) -> Dict[str, Any]:
+    """CPU time per emitted frame of ``render_frames`` on a small cloud."""
+    model_path = write_checkpoint(directory, 500)
+    service = RenderingService(str(model_path), str(directory / "config.yaml"),
+                               backend=create_rasterizer("numpy"), render_scale=0.1,
+                               codec="raw")
+    audio = synthetic_speech(1.0, SAMPLE_RATE).tobytes()
+    samples = []
+    late = 0
+
+    async def run():
+        nonlocal late
+        for index in range(repeats + 1):
+            session_id = f"pacing-{index}"
+            started = time.process_time()
+            frames = 0
+            async for _ in service.render_frames(audio, SAMPLE_RATE, session_id=session_id):
+                frames += 1
+            if index:  # The first pass is warm-up
+                samples.append((time.process_time() - started) / frames)
+                late += service.get_session_stats(session_id)["frames_late"]
+            service.end_session(session_id)
+        await service.cleanup()
+
+    asyncio.run(run())
+    return summarize(samples, frames_late=late)
+
+def bench_turn(repeats: int, directory: Path) -> Dict[str, Any]:
+    """Spoken turn from the final transcript to its first video frame."""
+    model_path = write_checkpoint(directory, 2000)
+    renderer = RenderingService(str(model_path), str(directory / "config.yaml"),
+                                backend=create_rasterizer("numpy"), render_scale=0.25,
+                                codec="raw")
+    audio = utterance(1.0, 1.0)
+    first_frame = []
+    first_audio = []
+
+    async def run():
+        # A fresh LLM and TTS per turn, so no turn is served from their caches
+        for index in range(max(repeats // 2, 2)):
+            llm = LLMService()
+            tts = make_tts(directory)
+            orchestrator = ConversationOrchestrator(ScriptedSTT(["Hello there."]), llm, tts,
+                                                    renderer)
+            events = await converse(orchestrator, audio, f"turn-{index}")
+            timings = [event.data for _, event in events
+                       if event.type == PipelineEventType.TURN_END]
+            if len(timings) != 1 or timings[0].first_frame is None:
+                raise AssertionError("The benchmark turn did not render a frame")
+            first_frame.append(timings[0].first_frame)
+            first_audio.append(timings[0].first_audio)
+            await llm.cleanup()
+            await tts.cleanup()
+        await renderer.cleanup()
+
+    asyncio.run(run())
+    return summarize(first_frame, first_audio_ms=statistics.median(first_audio) * 1000)
+
+MICRO = {
+    "audio_features": bench_audio_features,
+    "audio_normalize": bench_audio_normalize,
+    "transform_matrices": bench_transform_matrices,
+    "animation_process_audio": bench_animation,
+    "stt_process_audio": bench_stt_chunking,
+    "tts_synthesize": bench_tts_synthesize,
+    "render_pacing": bench_render_pacing,
+}
+
+MACRO = {
+    "turn": bench_turn,
+}
+
+def environment() -> Dict[str, Any]:
+    """Machine and library versions the results were measured with."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+    }
+
+def run(names: List[str], repeats: int) -> Dict[str, Any]:
+    """Run the named benchmarks and collect their results."""
+    torch.manual_seed(0)
+    torch.set_num_threads(1)
+    benchmarks = {**MICRO, **MACRO}
+    results = {}
+    for name in names:
+        with tempfile.TemporaryDirectory() as directory:
+            results[name] = benchmarks[name](repeats, Path(directory))
+        results[name]["kind"] = "macro" if name in MACRO else "micro"
+    return {"environment": environment(), "benchmarks": results}
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Describe every benchmark slower than its baseline allows.
+
+    Args:
+        results (Dict[str, Any]): Output of ``run``
+        baseline (Dict[str, Any]): Stored results with optional thresholds
+
+    Returns:
+        List[str]: One line per regression, empty when there is none
+    """
+    default = baseline.get("threshold", DEFAULT_THRESHOLD)
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None:
+            continue
+        metric = result["metric"]
+        threshold = reference.get("threshold", default)
+        ratio = result[metric] / reference[metric]
+        result["baseline_ratio"] = ratio
+        if ratio > threshold:
+            regressions.append(f"{name}: {metric} {result[metric]:.3f} is {ratio:.2f}x the "
+                               f"baseline {reference[metric]:.3f} (threshold {threshold:.2f}x)")
+    return regressions
+
+def update_baseline(results: Dict[str, Any], path: Path) -> None:
+    """Store results as the baseline, keeping the thresholds already set."""
+    baseline = json.loads(path.read_text()) if path.exists() else {}
+    stored = {"environment": results["environment"],
+              "threshold": baseline.get("threshold", DEFAULT_THRESHOLD),
+              "benchmarks": dict(baseline.get("benchmarks", {}))}
+    for name, result in results["benchmarks"].items():
+        entry = {"metric": result["metric"], result["metric"]: round(result[result["metric"]], 4)}
+        threshold = stored["benchmarks"].get(name, {}).get("threshold")
+        if threshold is not None:
+            entry["threshold"] = threshold
+        stored["benchmarks"][name] = entry
+    path.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    names = list(MICRO) + list(MACRO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=names, default=names)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+    logging.getLogger("server").setLevel(logging.WARNING)
+
+    results = run(args.only, args.repeats)
+    regressions = []
+    if args.update_baseline:
+        update_baseline(results, args.baseline)
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()))
+
+    print(f"{'benchmark':<26}{'kind':>6}{'median ms':>11}{'min ms':>10}{'vs baseline':>13}")
+    for name, result in results["benchmarks"].items():
+        ratio = result.get("baseline_ratio")
+        print(f"{name:<26}{result['kind']:>6}{result['median_ms']:>11.3f}"
+              f"{result['min_ms']:>10.3f}{f'{ratio:.2f}x' if ratio else '-':>13}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if regressions:
+        print("\n".join(regressions), file=sys.stderr)
+        raise AssertionError(f"{len(regressions)} benchmark(s) regressed")
+    return results
+
+if __name__ == "__main__":
+    main()
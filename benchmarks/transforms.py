@@ -0,0 +1,53 @@
+"""Batched Transform3D stacks against the scalar constructors.
+
+Times building head-pose stacks one matrix at a time and batched, and
+applying them to a point cloud. Correctness is covered by
+tests/test_transforms.py.
+
+Usage:
+    python -m benchmarks.transforms [--poses 1000] [--points 50000]
+"""
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server.utils.transforms import Transform3D
+
+def best_of(function, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--poses", type=int, default=1000)
+    parser.add_argument("--points", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    angles = rng.uniform(-0.3, 0.3, (args.poses, 3))
+    positions = rng.uniform(-0.05, 0.05, (args.poses, 3))
+    points = rng.uniform(-0.1, 0.1, (args.points, 3)).astype(np.float32)
+    models = Transform3D.model_matrices(angles[:8], positions[:8])
+    out = np.empty((8, args.points, 3), dtype=np.float32)
+
+    results = {
+        "scalar_rotations_ms": best_of(
+            lambda: [Transform3D.create_rotation_matrix(a) for a in angles]) * 1000,
+        "batched_models_ms": best_of(
+            lambda: Transform3D.model_matrices(angles, positions)) * 1000,
+        "transform_8_poses_ms": best_of(
+            lambda: Transform3D.transform_points(models, points, out=out)) * 1000,
+    }
+    print(f"{args.poses} poses, scalar rotations:  {results['scalar_rotations_ms']:8.3f} ms")
+    print(f"{args.poses} poses, batched models:    {results['batched_models_ms']:8.3f} ms")
+    print(f"8 poses x {args.points} points:       {results['transform_8_poses_ms']:8.3f} ms")
+    return results
+
+if __name__ == "__main__":
+    main()
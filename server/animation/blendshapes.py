@@ -0,0 +1,188 @@
+import numpy as np
+from typing import Dict, Optional, Tuple, Union
+
+# ARKit blendshape channels, in ExpressionNet output order
+BLENDSHAPE_NAMES: Tuple[str, ...] = (
+    "browDownLeft", "browDownRight", "browInnerUp", "browOuterUpLeft", "browOuterUpRight",
+    "cheekPuff", "cheekSquintLeft", "cheekSquintRight",
+    "eyeBlinkLeft", "eyeBlinkRight", "eyeLookDownLeft", "eyeLookDownRight",
+    "eyeLookInLeft", "eyeLookInRight", "eyeLookOutLeft", "eyeLookOutRight",
+    "eyeLookUpLeft", "eyeLookUpRight", "eyeSquintLeft", "eyeSquintRight",
+    "eyeWideLeft", "eyeWideRight",
+    "jawForward", "jawLeft", "jawOpen", "jawRight",
+    "mouthClose", "mouthDimpleLeft", "mouthDimpleRight", "mouthFrownLeft", "mouthFrownRight",
+    "mouthFunnel", "mouthLeft", "mouthLowerDownLeft", "mouthLowerDownRight",
+    "mouthPressLeft", "mouthPressRight", "mouthPucker", "mouthRight",
+    "mouthRollLower", "mouthRollUpper", "mouthShrugLower", "mouthShrugUpper",
+    "mouthSmileLeft", "mouthSmileRight", "mouthStretchLeft", "mouthStretchRight",
+    "mouthUpperUpLeft", "mouthUpperUpRight",
+    "noseSneerLeft", "noseSneerRight",
+    "tongueOut",
+)
+
+BLENDSHAPE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(BLENDSHAPE_NAMES)}
+
+class BlendshapeTimeline:
+    """Blendshape weights sampled at a fixed frame rate.
+
+    Weights are stored as one ``(N, 52)`` float32 array with channels in
+    ``BLENDSHAPE_NAMES`` order. Frame ``i`` is at
+    ``start_time + i / frame_rate`` seconds. Slicing returns views of the
+    same buffer, and the raw bytes can be shipped between processes or
+    cached next to the audio they were derived from.
+    """
+
+    def __init__(self, weights: np.ndarray, frame_rate: float, start_time: float = 0.0):
+        """Initialize the timeline.
+
+        Args:
+            weights (np.ndarray): ``(N, 52)`` blendshape weights
+            frame_rate (float): Frames per second
+            start_time (float): Time of the first frame in seconds
+        """
+        weights = np.asarray(weights, dtype=np.float32)
+        if weights.ndim != 2 or weights.shape[1] != len(BLENDSHAPE_NAMES):
+            raise ValueError(f"Expected (N, {len(BLENDSHAPE_NAMES)}) weights, "
+                             f"got {weights.shape}")
+        self.weights = weights
+        self.frame_rate = float(frame_rate)
+        self.start_time = float(start_time)
+
+    @classmethod
+    def empty(cls, frame_rate: float, start_time: float = 0.0) -> "BlendshapeTimeline":
+        return cls(np.zeros((0, len(BLENDSHAPE_NAMES)), dtype=np.float32), frame_rate, start_time)
+
+    def __len__(self) -> int:
+        return self.weights.shape[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[np.ndarray, "BlendshapeTimeline"]:
+        """Frame weights as a ``(52,)`` view, or a sub-timeline for a slice."""
+        if isinstance(index, slice):
+            start, _, step = index.indices(len(self))
+            return BlendshapeTimeline(self.weights[index], self.frame_rate / step,
+                                      self.start_time + start / self.frame_rate)
+        return self.weights[index]
+
+    @property
+    def duration(self) -> float:
+        return len(self) / self.frame_rate
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.duration
+
+    def times(self) -> np.ndarray:
+        """Timestamp of every frame in seconds."""
+        return self.start_time + np.arange(len(self)) / self.frame_rate
+
+    def channel(self, name: str) -> np.ndarray:
+        """Weights of one blendshape over time, as a view."""
+        return self.weights[:, BLENDSHAPE_INDEX[name]]
+
+    def to_dict(self, index: int) -> Dict[str, float]:
+        """Named weights of one frame."""
+        return dict(zip(BLENDSHAPE_NAMES, self.weights[index].tolist()))
+
+    def slice_time(self, start: float, end: float) -> "BlendshapeTimeline":
+        """Frames with timestamps in ``[start, end)``, as a view.
+
+        Args:
+            start (float): Start time in seconds
+            end (float): End time in seconds
+
+        Returns:
+            BlendshapeTimeline: Timeline sharing this timeline's buffer
+        """
+        first = int(np.ceil((start - self.start_time) * self.frame_rate - 1e-9))
+        last = int(np.ceil((end - self.start_time) * self.frame_rate - 1e-9))
+        first, last = min(max(first, 0), len(self)), min(max(last, 0), len(self))
+        return self[first:max(first, last)]
+
+    def sample(self, times: np.ndarray) -> np.ndarray:
+        """Linearly interpolate weights at arbitrary times.
+
+        Times outside the timeline hold the first or last frame.
+
+        Args:
+            times (np.ndarray): Timestamps in seconds
+
+        Returns:
+            np.ndarray: ``(len(times), 52)`` float32 weights
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(self) == 0:
+            return np.zeros((times.size, len(BLENDSHAPE_NAMES)), dtype=np.float32)
+        position = np.clip((times - self.start_time) * self.frame_rate, 0, len(self) - 1)
+        lower = np.floor(position).astype(np.intp)
+        upper = np.minimum(lower + 1, len(self) - 1)
+        fraction = (position - lower).astype(np.float32)[:, None]
+        below = self.weights[lower]
+        below += fraction * (self.weights[upper] - below)
+        return below
+
+    def resample(self,
+                 frame_rate: float,
+                 num_frames: Optional[int] = None) -> "BlendshapeTimeline":
+        """Resample to another frame rate, e.g. from the audio hop rate to the render rate.
+
+        Args:
+            frame_rate (float): Target frames per second
+            num_frames (Optional[int]): Output length, the same duration by default
+
+        Returns:
+            BlendshapeTimeline: New timeline starting at the same time
+        """
+        if num_frames is None:
+            num_frames = int(round(self.duration * frame_rate))
+        times = self.start_time + np.arange(num_frames) / frame_rate
+        return BlendshapeTimeline(self.sample(times), frame_rate, self.start_time)
+
+    def smooth(self, window_ms: float = 50.0) -> "BlendshapeTimeline":
+        """Centered moving average to suppress frame-to-frame jitter.
+
+        Args:
+            window_ms (float): Averaging window in milliseconds
+
+        Returns:
+            BlendshapeTimeline: Smoothed copy; edges average over the frames available
+        """
+        half = int(round(window_ms / 1000 * self.frame_rate / 2))
+        if half < 1 or len(self) < 2:
+            return BlendshapeTimeline(self.weights.copy(), self.frame_rate, self.start_time)
+
+        totals = np.zeros((len(self) + 1, self.weights.shape[1]), dtype=np.float64)
+        np.cumsum(self.weights, axis=0, out=totals[1:])
+        index = np.arange(len(self))
+        lower = np.maximum(index - half, 0)
+        upper = np.minimum(index + half + 1, len(self))
+        smoothed = (totals[upper] - totals[lower]) / (upper - lower)[:, None]
+        return BlendshapeTimeline(smoothed.astype(np.float32), self.frame_rate, self.start_time)
+
+    def concatenate(self, other: "BlendshapeTimeline") -> "BlendshapeTimeline":
+        """Append a following timeline at the same frame rate."""
+        if other.frame_rate != self.frame_rate:
+            raise ValueError("Cannot concatenate timelines with different frame rates")
+        return BlendshapeTimeline(np.concatenate((self.weights, other.weights)),
+                                  self.frame_rate, self.start_time)
+
+    def tobytes(self) -> bytes:
+        """Raw float32 weights, row-major."""
+        return np.ascontiguousarray(self.weights).tobytes()
+
+    @classmethod
+    def frombuffer(cls,
+                   buffer: Union[bytes, memoryview],
+                   frame_rate: float,
+                   start_time: float = 0.0) -> "BlendshapeTimeline":
+        """Wrap raw float32 weights without copying.
+
+        Args:
+            buffer (Union[bytes, memoryview]): Bytes from ``tobytes``
+            frame_rate (float): Frames per second
+            start_time (float): Time of the first frame in seconds
+
+        Returns:
+            BlendshapeTimeline: Timeline backed by ``buffer``
+        """
+        weights = np.frombuffer(buffer, dtype=np.float32).reshape(-1, len(BLENDSHAPE_NAMES))
+        return cls(weights, frame_rate, start_time)
@@ -1,55 +1,297 @@
+import copy
+import logging
+import time
 import numpy as np
-import torch
-import torch.nn as nn
-from typing import Dict, List, Optional, Tensor
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Any, Optional
+
+from ..utils.checkpoint import FlatCheckpoint, load_checkpoint
+from ..utils.features import MelSpectrogram
+from ..utils.lazy import lazy_import
+from ..utils.lifecycle import ServiceLifecycle
+from ..utils.metrics import histogram
+from .blendshapes import BlendshapeTimeline
+
+torch = lazy_import("torch")
+
+logger = logging.getLogger(__name__)
+
+# Log-mel features in, ARKit blendshape weights out
+FEATURE_DIM = 128
+EXPRESSION_DIM = 52
+
+ANIMATION_INFERENCE = histogram("animation_inference_seconds",
+                                "Expression network time per batch of feature frames")
 
 class AudioFeatureExtractor:
     def __init__(self, sample_rate: int = 16000):
         self.sample_rate = sample_rate
         self.window_size = 512
         self.hop_length = 256
+        self.mel = MelSpectrogram(sample_rate, self.window_size, self.hop_length)
 
     def extract_features(self, audio: np.ndarray) -> np.ndarray:
-        # Feature extraction implementation
-        return np.zeros((128, len(audio) // self.hop_length))
-
-class ExpressionNet(nn.Module):
-    def __init__(self):
-        super().__init__()
-        self.network = nn.Sequential(
-            nn.Linear(128, 256),
-            nn.ReLU(),
-            nn.Linear(256, 256),
-            nn.ReLU(),
-            nn.Linear(256, 52),
-            nn.Tanh()
-        )
-
-    def forward(self, x: Tensor) -> Tensor:
-        return self.network(x)
+        """Log-mel spectrogram of a clip, ``(128, n_frames)``."""
+        return self.mel.transform(audio).T
+
+    def process_chunk(self, audio: np.ndarray) -> np.ndarray:
+        """Log-mel frames completed by the next chunk of a stream.
+
+        Returns a ``(n_frames, 128)`` view that is overwritten by the next call.
+        """
+        return self.mel.process(audio)
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        self.mel.reset()
+
+@lru_cache(maxsize=None)
+def _expression_net_class() -> type:
+    """Define ``ExpressionNet`` on first use, so importing this module does not import torch."""
+    nn = torch.nn
+
+    class ExpressionNet(nn.Module):
+        INPUT_DIM = FEATURE_DIM
+        OUTPUT_DIM = EXPRESSION_DIM
+
+        def __init__(self):
+            super().__init__()
+            self.network = nn.Sequential(
+                nn.Linear(self.INPUT_DIM, 256),
+                nn.ReLU(),
+                nn.Linear(256, 256),
+                nn.ReLU(),
+                nn.Linear(256, self.OUTPUT_DIM),
+                nn.Tanh()
+            )
+
+        def forward(self, x: "torch.Tensor") -> "torch.Tensor":
+            return self.network(x)
+
+    ExpressionNet.__qualname__ = "ExpressionNet"
+    ExpressionNet.__module__ = __name__
+    return ExpressionNet
+
+def __getattr__(name: str) -> Any:
+    if name == "ExpressionNet":
+        return _expression_net_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class ExpressionStream:
+    """Streaming expression inference for one audio stream.
+
+    Each chunk of audio yields the expressions of the feature frames it
+    completes. The feature extractor carries the window overlap between
+    chunks, so streamed expressions match those of the whole clip.
+    """
+
+    def __init__(self, driver: "FacialAnimationDriver"):
+        self.driver = driver
+        self.feature_extractor = AudioFeatureExtractor(driver.feature_extractor.sample_rate)
+        self.frames = 0
+
+    def process(self, audio: np.ndarray) -> BlendshapeTimeline:
+        """Infer expressions for the next chunk of audio.
+
+        Args:
+            audio (np.ndarray): int16 or float samples at the extractor rate
+
+        Returns:
+            BlendshapeTimeline: Blendshapes for the frames completed by this
+            chunk, timed from the start of the stream
+        """
+        expressions = self.driver.infer(self.feature_extractor.process_chunk(audio))
+        start_time = self.frames / self.driver.frame_rate
+        self.frames += expressions.shape[0]
+        return self.driver._convert_to_blendshapes(expressions, start_time)
+
+    def reset(self) -> None:
+        """Start a new utterance."""
+        self.feature_extractor.reset()
+        self.frames = 0
 
 class FacialAnimationDriver:
-    def __init__(self, model_path: Optional[str] = None):
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.expression_net = ExpressionNet().to(self.device)
+    """Maps speech audio to facial expression coefficients.
+
+    For CPU deployment the network can be dynamically quantized to int8
+    and compiled with TorchScript or ``torch.compile``. Both are applied on
+    top of the float weights, which stay available as ``base_net``.
+
+    Like the services, the driver starts in two stages: the load stage
+    imports torch and reads the weights, the warm-up stage builds the
+    deployed network and runs its first batch.
+    """
+
+    OPTIMIZE_MODES = (None, "script", "compile")
+
+    def __init__(self,
+                 model_path: Optional[str] = None,
+                 device: Optional[str] = None,
+                 optimize: Optional[str] = None,
+                 quantize: bool = False,
+                 defer_start: bool = False):
+        """Initialize the driver.
+
+        The network is loaded and warmed up here unless ``defer_start`` is
+        set, in which case ``start`` does it off the event loop.
+
+        Args:
+            model_path (Optional[str]): ExpressionNet checkpoint
+            device (Optional[str]): Torch device, CUDA when available by default
+            optimize (Optional[str]): ``"script"`` for TorchScript, ``"compile"``
+                for ``torch.compile``, None for eager execution
+            quantize (bool): Apply dynamic int8 quantization (CPU only)
+            defer_start (bool): Leave loading and warm-up to ``start``
+        """
+        if optimize not in self.OPTIMIZE_MODES:
+            raise ValueError(f"optimize must be one of {self.OPTIMIZE_MODES}")
+        if quantize and device is not None and not device.startswith('cpu'):
+            raise ValueError("Dynamic quantization is only supported on CPU")
+        self.model_path = model_path
+        self.requested_device = device
+        self.device = None
+        self.optimize = optimize
+        self.quantize = quantize
+        self.base_net = None
+        self.expression_net = None
         self.feature_extractor = AudioFeatureExtractor()
-        
-        if model_path:
-            self.load_model(model_path)
-    
+        self._stream: Optional[ExpressionStream] = None
+        self._input = None
+        self.lifecycle = ServiceLifecycle("animation")
+        if not defer_start:
+            self.lifecycle.run(self._load, self._warm_up)
+
+    async def start(self, executor: Optional[Executor] = None) -> None:
+        """Load and warm up the network in an executor.
+
+        Args:
+            executor (Optional[Executor]): Executor running the stages, the
+                loop's default executor when None
+        """
+        await self.lifecycle.start(self._load, self._warm_up, executor)
+
+    def _load(self) -> None:
+        """Import torch, place the network on its device and read the weights."""
+        device = self.requested_device
+        if device is None:
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.device = torch.device(device)
+        if self.quantize and self.device.type != 'cpu':
+            raise ValueError("Dynamic quantization is only supported on CPU")
+        self.base_net = _expression_net_class()().to(self.device).eval()
+        self._input = torch.empty((0, FEATURE_DIM), device=self.device)
+        if self.model_path:
+            self._load_weights(self.model_path)
+
+    def _warm_up(self) -> None:
+        """Build the deployed network and run its first batch."""
+        self._prepare()
+        # Compile and run the first batch outside the real-time path
+        self._infer(np.zeros((4, FEATURE_DIM), dtype=np.float32))
+
+    @property
+    def frame_rate(self) -> float:
+        """Expression frames per second of audio."""
+        return self.feature_extractor.sample_rate / self.feature_extractor.hop_length
+
     def load_model(self, path: str):
-        self.expression_net.load_state_dict(torch.load(path))
-        self.expression_net.eval()
+        """Swap in ExpressionNet weights from a ``.pth`` or flat checkpoint."""
+        self.lifecycle.check_ready()
+        self._load_weights(path)
+        self._warm_up()
+
+    def _load_weights(self, path: str) -> None:
+        started = time.perf_counter()
+        checkpoint = load_checkpoint(path, map_location=self.device)
+        if isinstance(checkpoint, FlatCheckpoint):
+            checkpoint = checkpoint.state_dict()
+        self.base_net.load_state_dict(checkpoint)
+        logger.info(f"Loaded expression net from {path} in "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def _prepare(self) -> None:
+        """Build the deployed network from the float weights."""
+        net = self.base_net.eval()
+        if self.quantize:
+            net = torch.quantization.quantize_dynamic(copy.deepcopy(net), {torch.nn.Linear},
+                                                      dtype=torch.qint8)
+        if self.optimize == "script":
+            net = torch.jit.freeze(torch.jit.script(net))
+        elif self.optimize == "compile":
+            if hasattr(torch, "compile"):
+                net = torch.compile(net, dynamic=True)
+            else:
+                logger.warning("torch.compile is unavailable, running the expression net eagerly")
+        self.expression_net = net
+
+    def infer(self, features: np.ndarray) -> np.ndarray:
+        """Run the expression network on a batch of feature frames.
+
+        Args:
+            features (np.ndarray): ``(n_frames, 128)`` float32 log-mel features
+
+        Returns:
+            np.ndarray: ``(n_frames, 52)`` float32 expression coefficients
+
+        Raises:
+            ServiceNotReadyError: If the driver is not ready
+        """
+        self.lifecycle.check_ready()
+        return self._infer(features)
+
+    def _infer(self, features: np.ndarray) -> np.ndarray:
+        count = features.shape[0]
+        if count == 0:
+            return np.zeros((0, EXPRESSION_DIM), dtype=np.float32)
+
+        with torch.inference_mode(), ANIMATION_INFERENCE.time():
+            inputs = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32))
+            if self.device.type != 'cpu':
+                # Reuse the device staging buffer across chunks
+                if self._input.shape[0] < count:
+                    self._input = torch.empty((max(count, 2 * self._input.shape[0]),
+                                               FEATURE_DIM), device=self.device)
+                inputs = self._input[:count].copy_(inputs)
+            expressions = self.expression_net(inputs)
+            return expressions.float().cpu().numpy()
+
+    def create_stream(self) -> ExpressionStream:
+        """Create an independent streaming session sharing this network.
+
+        Raises:
+            ServiceNotReadyError: If the driver is not ready
+        """
+        self.lifecycle.check_ready()
+        return ExpressionStream(self)
+
+    def process_chunk(self, audio: np.ndarray) -> BlendshapeTimeline:
+        """Infer expressions for the next chunk of the driver's default stream.
+
+        Args:
+            audio (np.ndarray): int16 or float samples at the extractor rate
+
+        Returns:
+            BlendshapeTimeline: Blendshapes for the frames completed by this chunk
+        """
+        if self._stream is None:
+            self._stream = self.create_stream()
+        return self._stream.process(audio)
+
+    def reset(self) -> None:
+        """Reset the default stream."""
+        if self._stream is not None:
+            self._stream.reset()
 
-    def process_audio(self, audio: np.ndarray) -> List[Dict[str, float]]:
+    def process_audio(self, audio: np.ndarray) -> BlendshapeTimeline:
         features = self.feature_extractor.extract_features(audio)
-        features_tensor = torch.from_numpy(features).float().to(self.device)
-        
-        with torch.no_grad():
-            expressions = self.expression_net(features_tensor)
-        
+        # Features are (128, n_frames); the network maps one frame per row
+        expressions = self.infer(features.T)
         return self._convert_to_blendshapes(expressions)
 
-    def _convert_to_blendshapes(self, expressions: Tensor) -> List[Dict[str, float]]:
-        # Convert network output to blendshape values
-        return [{}] * len(expressions)
\ No newline at end of file
+    def _convert_to_blendshapes(self,
+                                expressions: np.ndarray,
+                                start_time: float = 0.0) -> BlendshapeTimeline:
+        # Blendshape weights are defined on [0, 1]
+        np.clip(expressions, 0.0, 1.0, out=expressions)
+        return BlendshapeTimeline(expressions, self.frame_rate, start_time)
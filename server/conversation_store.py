@@ -0,0 +1,427 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Rough per-message bookkeeping cost used for memory accounting
+MESSAGE_OVERHEAD_BYTES = 200
+# Tokens added by chat formatting around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+class MessageRole(Enum):
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
+
+class Message:
+    """Single conversation message."""
+    __slots__ = ("role", "content", "timestamp", "metadata", "tokens")
+
+    def __init__(self,
+                 role: MessageRole,
+                 content: str,
+                 timestamp: datetime,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 tokens: int = 0):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.metadata = metadata
+        self.tokens = tokens
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role}, content={self.content!r}, timestamp={self.timestamp!r})"
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the message."""
+        return len(self.content) + MESSAGE_OVERHEAD_BYTES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the message for persistence."""
+        return {
+            "role": self.role.value,
+            "content": self.content,
+            "timestamp": self.timestamp.isoformat(),
+            "metadata": self.metadata,
+            "tokens": self.tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """Deserialize a message produced by ``to_dict``."""
+        return cls(
+            role=MessageRole(data["role"]),
+            content=data["content"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            metadata=data.get("metadata"),
+            tokens=data.get("tokens", 0),
+        )
+
+class Conversation:
+    """Messages of one conversation plus bookkeeping for eviction."""
+    __slots__ = ("messages", "last_access", "nbytes", "tokens")
+
+    def __init__(self):
+        self.messages: List[Message] = []
+        self.last_access = time.monotonic()
+        self.nbytes = 0
+        self.tokens = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self.messages)
+
+    def __getitem__(self, index):
+        return self.messages[index]
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token)."""
+    return max(1, (len(text) + 3) // 4)
+
+class RedisConversationPersistence:
+    """Redis tier for conversations evicted from memory.
+
+    Conversations are stored as JSON under ``{prefix}{conversation_id}`` with
+    an expiry, so sessions evicted from a node can be restored on any node.
+    """
+
+    def __init__(self,
+                 url: Optional[str] = None,
+                 client: Optional[Any] = None,
+                 ttl: int = 24 * 3600,
+                 prefix: str = "conversation:"):
+        """Initialize the persistence tier.
+
+        Args:
+            url (Optional[str]): Redis URL, e.g. ``redis://redis:6379``
+            client (Optional[Any]): Existing asyncio Redis client. Any object with
+                async ``get``, ``set(key, value, ex=...)`` and ``delete`` works.
+            ttl (int): Expiry of stored conversations in seconds
+            prefix (str): Key prefix
+        """
+        if client is None:
+            if url is None:
+                raise ValueError("Either url or client is required")
+            import redis.asyncio as redis
+            client = redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def save(self, conversation_id: str, messages: List[Message]) -> None:
+        """Store a conversation."""
+        payload = json.dumps([message.to_dict() for message in messages])
+        await self.client.set(self.prefix + conversation_id, payload, ex=self.ttl)
+
+    async def load(self, conversation_id: str) -> Optional[List[Message]]:
+        """Load a stored conversation, if any."""
+        payload = await self.client.get(self.prefix + conversation_id)
+        if payload is None:
+            return None
+        return [Message.from_dict(item) for item in json.loads(payload)]
+
+    async def delete(self, conversation_id: str) -> None:
+        """Delete a stored conversation."""
+        await self.client.delete(self.prefix + conversation_id)
+
+class ConversationStore:
+    """Bounded in-memory conversation store.
+
+    Conversations are evicted after ``idle_ttl`` seconds without access and,
+    when ``max_conversations`` or ``max_bytes`` is exceeded, in least recently
+    used order. Conversations in the middle of a turn are pinned and never
+    evicted, so the reply is not lost. Each conversation keeps at most
+    ``max_stored_tokens`` of history; older messages are dropped while the
+    system prompt stays pinned. With a persistence tier, conversations are
+    written through and reloaded after eviction.
+    """
+
+    def __init__(self,
+                 max_conversations: int = 1000,
+                 idle_ttl: float = 1800.0,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 max_stored_tokens: int = 8192,
+                 token_counter: Optional[Callable[[str], int]] = None,
+                 persistence: Optional[RedisConversationPersistence] = None):
+        """Initialize the conversation store.
+
+        Args:
+            max_conversations (int): Maximum conversations held in memory
+            idle_ttl (float): Seconds without access before a conversation is evicted
+            max_bytes (int): Approximate memory cap across all conversations
+            max_stored_tokens (int): History kept per conversation, in tokens
+            token_counter (Optional[Callable[[str], int]]): Token counting function.
+                Defaults to a character based estimate.
+            persistence (Optional[RedisConversationPersistence]): Persistence tier
+        """
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.max_stored_tokens = max_stored_tokens
+        self.token_counter = token_counter or estimate_tokens
+        self.persistence = persistence
+        self.nbytes = 0
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        # Turns in progress per conversation
+        self._pins: Dict[str, int] = {}
+        # Conversations whose persisted copy is stale until deleted or overwritten
+        self._discarded: Set[str] = set()
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._conversations
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def __getitem__(self, conversation_id: str) -> Conversation:
+        conversation = self._conversations[conversation_id]
+        self._touch(conversation_id, conversation)
+        return conversation
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        """Get a conversation held in memory."""
+        conversation = self._conversations.get(conversation_id)
+        if conversation is not None:
+            self._touch(conversation_id, conversation)
+        return conversation
+
+    async def load(self, conversation_id: str) -> Optional[Conversation]:
+        """Get a conversation, restoring it from the persistence tier if needed."""
+        conversation = self.get(conversation_id)
+        if (conversation is not None or self.persistence is None
+                or conversation_id in self._discarded):
+            return conversation
+
+        try:
+            messages = await self.persistence.load(conversation_id)
+        except Exception as e:
+            logger.error(f"Failed to load conversation {conversation_id}: {e}")
+            return None
+        if not messages:
+            return None
+
+        conversation = self._insert(conversation_id)
+        for message in messages:
+            self._append(conversation, message)
+        self._trim(conversation)
+        self._enforce_limits()
+        return conversation
+
+    def create(self, conversation_id: str, system_prompt: str) -> Conversation:
+        """Create a conversation starting with a system prompt."""
+        self._remove(conversation_id)
+        # The next save replaces any stale persisted copy
+        self._discarded.discard(conversation_id)
+        conversation = self._insert(conversation_id)
+        self._append(conversation, Message(
+            role=MessageRole.SYSTEM,
+            content=system_prompt,
+            timestamp=datetime.now()
+        ))
+        self._enforce_limits()
+        return conversation
+
+    def append(self, conversation_id: str, message: Message) -> None:
+        """Append a message to a conversation held in memory."""
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return
+        self._touch(conversation_id, conversation)
+        self._append(conversation, message)
+        self._trim(conversation)
+        self._enforce_limits()
+
+    async def save(self, conversation_id: str) -> None:
+        """Write a conversation through to the persistence tier."""
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None or self.persistence is None:
+            return
+        try:
+            await self.persistence.save(conversation_id, conversation.messages)
+        except Exception as e:
+            logger.error(f"Failed to persist conversation {conversation_id}: {e}")
+
+    async def delete(self, conversation_id: str) -> None:
+        """Remove a conversation from memory and from the persistence tier."""
+        self._remove(conversation_id)
+        self._discarded.discard(conversation_id)
+        if self.persistence is None:
+            return
+        try:
+            await self.persistence.delete(conversation_id)
+        except Exception as e:
+            logger.error(f"Failed to delete persisted conversation {conversation_id}: {e}")
+
+    def discard(self, conversation_id: str) -> Optional["asyncio.Task"]:
+        """Remove a conversation without waiting for the persistence tier.
+
+        The conversation is dropped from memory at once and its persisted
+        copy is no longer loaded. The copy is deleted in the background when
+        an event loop is running.
+
+        Args:
+            conversation_id (str): Conversation to remove
+
+        Returns:
+            Optional[asyncio.Task]: Deletion of the persisted copy, None when
+            there is nothing to wait for
+        """
+        self._remove(conversation_id)
+        if self.persistence is None:
+            return None
+        self._discarded.add(conversation_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(f"No event loop to delete persisted conversation {conversation_id}")
+            return None
+        return loop.create_task(self._delete_discarded(conversation_id))
+
+    @contextmanager
+    def pinned(self, conversation_id: str) -> Iterator[None]:
+        """Keep a conversation in memory for the length of a block, e.g. a turn."""
+        self._pins[conversation_id] = self._pins.get(conversation_id, 0) + 1
+        try:
+            yield
+        finally:
+            self._pins[conversation_id] -= 1
+            if not self._pins[conversation_id]:
+                del self._pins[conversation_id]
+                self._enforce_limits()
+
+    def window(self,
+               conversation_id: str,
+               max_tokens: int,
+               max_messages: Optional[int] = None) -> List[Message]:
+        """Select the history to send to the model.
+
+        The system prompt is always included. The most recent messages are
+        added newest first until the token budget or message count is reached;
+        the latest message is kept even if it alone exceeds the budget.
+
+        Args:
+            conversation_id (str): Conversation identifier
+            max_tokens (int): Token budget including the system prompt
+            max_messages (Optional[int]): Maximum messages including the system prompt
+
+        Returns:
+            List[Message]: Messages in chronological order
+        """
+        conversation = self.get(conversation_id)
+        if conversation is None or not conversation.messages:
+            return []
+
+        messages = conversation.messages
+        pinned = messages[:1] if messages[0].role == MessageRole.SYSTEM else []
+        history = messages[len(pinned):]
+        budget = max_tokens - sum(message.tokens for message in pinned)
+        limit = len(history) if max_messages is None else max(max_messages - len(pinned), 1)
+
+        selected = 0
+        for message in reversed(history[-limit:]):
+            if selected and message.tokens > budget:
+                break
+            budget -= message.tokens
+            selected += 1
+
+        return pinned + (history[-selected:] if selected else [])
+
+    def evict_expired(self) -> int:
+        """Evict conversations idle for longer than the TTL.
+
+        Returns:
+            int: Number of evicted conversations
+        """
+        deadline = time.monotonic() - self.idle_ttl
+        expired = []
+        for conversation_id, conversation in self._conversations.items():
+            # Entries are in access order, so the first fresh one ends the scan
+            if conversation.last_access > deadline:
+                break
+            if conversation_id not in self._pins:
+                expired.append(conversation_id)
+        for conversation_id in expired:
+            self._remove(conversation_id)
+        if expired:
+            logger.debug(f"Evicted {len(expired)} idle conversations")
+        return len(expired)
+
+    async def _delete_discarded(self, conversation_id: str) -> None:
+        """Delete the persisted copy of a discarded conversation, unless recreated."""
+        if conversation_id not in self._discarded:
+            return
+        try:
+            await self.persistence.delete(conversation_id)
+        except Exception as e:
+            logger.error(f"Failed to delete persisted conversation {conversation_id}: {e}")
+            return
+        self._discarded.discard(conversation_id)
+
+    def _insert(self, conversation_id: str) -> Conversation:
+        """Add an empty conversation as the most recently used entry."""
+        conversation = Conversation()
+        self._conversations[conversation_id] = conversation
+        return conversation
+
+    def _remove(self, conversation_id: str) -> None:
+        """Drop a conversation from memory, leaving any persisted copy."""
+        conversation = self._conversations.pop(conversation_id, None)
+        if conversation is not None:
+            self.nbytes -= conversation.nbytes
+
+    def _touch(self, conversation_id: str, conversation: Conversation) -> None:
+        """Mark a conversation as most recently used."""
+        conversation.last_access = time.monotonic()
+        self._conversations.move_to_end(conversation_id)
+
+    def _append(self, conversation: Conversation, message: Message) -> None:
+        """Append a message and update accounting."""
+        if not message.tokens:
+            message.tokens = self.token_counter(message.content) + MESSAGE_OVERHEAD_TOKENS
+        conversation.messages.append(message)
+        conversation.tokens += message.tokens
+        conversation.nbytes += message.nbytes
+        self.nbytes += message.nbytes
+
+    def _trim(self, conversation: Conversation) -> None:
+        """Drop the oldest non-system messages beyond the stored token limit."""
+        messages = conversation.messages
+        first = 1 if messages and messages[0].role == MessageRole.SYSTEM else 0
+        drop = 0
+        tokens = conversation.tokens
+        # Never drop the latest message
+        while tokens > self.max_stored_tokens and first + drop < len(messages) - 1:
+            tokens -= messages[first + drop].tokens
+            drop += 1
+        if drop:
+            removed = messages[first:first + drop]
+            del messages[first:first + drop]
+            freed = sum(message.nbytes for message in removed)
+            conversation.tokens = tokens
+            conversation.nbytes -= freed
+            self.nbytes -= freed
+
+    def _enforce_limits(self) -> None:
+        """Evict expired and least recently used conversations over the caps."""
+        self.evict_expired()
+        while self._conversations and (len(self._conversations) > self.max_conversations
+                                       or self.nbytes > self.max_bytes):
+            if len(self._conversations) == 1:
+                break
+            conversation_id = next((key for key in self._conversations
+                                    if key not in self._pins), None)
+            if conversation_id is None:
+                # Every conversation is mid-turn; limits are enforced again on unpin
+                break
+            logger.debug(f"Evicting least recently used conversation {conversation_id}")
+            self._remove(conversation_id)
@@ -0,0 +1,57 @@
+class ServiceError(Exception):
+    """Base class for all service errors."""
+    pass
+
+class ModelError(ServiceError):
+    """Base class for model related errors."""
+    pass
+
+class ModelNotFoundError(ModelError):
+    """Raised when model files cannot be found."""
+    pass
+
+class ModelLoadError(ModelError):
+    """Raised when a model fails to initialize."""
+    pass
+
+class GPUError(ServiceError):
+    """Base class for GPU related errors."""
+    pass
+
+class GPUNotFoundError(GPUError):
+    """Raised when no CUDA GPU is available."""
+    pass
+
+class GPUMemoryError(GPUError):
+    """Raised when GPU memory is insufficient or exceeded."""
+    pass
+
+class ProcessingError(ServiceError):
+    """Raised when processing of a request fails."""
+    pass
+
+class ServiceNotReadyError(ServiceError):
+    """Raised when a request reaches a service that has not finished starting."""
+    pass
+
+class DeadlineExceededError(ServiceError):
+    """Raised when a request runs out of its time budget."""
+    pass
+
+class CircuitOpenError(ServiceError):
+    """Raised when a service is failing and its circuit breaker rejects calls."""
+    pass
+
+__all__ = [
+    'ServiceError',
+    'ModelError',
+    'ModelNotFoundError',
+    'ModelLoadError',
+    'GPUError',
+    'GPUNotFoundError',
+    'GPUMemoryError',
+    'ProcessingError',
+    'ServiceNotReadyError',
+    'DeadlineExceededError',
+    'CircuitOpenError',
+]
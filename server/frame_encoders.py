@@ -0,0 +1,331 @@
+import logging
+import struct
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from .exceptions import *
+from .utils.buffers import BufferPool
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class EncodedFrame:
+    """One encoded frame.
+
+    Attributes:
+        data: Encoded bytes. When the frame came from a pool, ``data`` is a
+            view of a pooled buffer and is only valid until ``release``.
+        codec: Name of the encoder that produced the frame
+        keyframe: Whether the frame decodes without the previous frames
+        buffer: Pooled buffer backing ``data``, if any
+        pool: Pool that ``buffer`` is returned to
+    """
+    data: memoryview
+    codec: str
+    keyframe: bool = True
+    buffer: Optional[bytearray] = None
+    pool: Optional[BufferPool] = None
+
+    def __len__(self) -> int:
+        return self.data.nbytes
+
+    def release(self) -> None:
+        """Return the backing buffer to its pool."""
+        if self.buffer is not None and self.pool is not None:
+            self.pool.release(self.buffer)
+        self.buffer = None
+
+class FrameEncoder:
+    """Encodes rendered RGB frames for transport.
+
+    Encoders may keep state between the frames of one stream, so every
+    stream needs its own instance. An instance encodes one frame at a time,
+    but may do so from any thread.
+    """
+
+    name = "base"
+
+    def __init__(self, pool_size: int = 8):
+        """Initialize the encoder.
+
+        Args:
+            pool_size (int): Output buffers kept for reuse
+        """
+        self.pool_size = pool_size
+        self.pool: Optional[BufferPool] = None
+
+    def encode(self, frame: np.ndarray) -> EncodedFrame:
+        """Encode one frame.
+
+        Args:
+            frame (np.ndarray): ``(height, width, 3)`` uint8 RGB frame
+
+        Returns:
+            EncodedFrame: Encoded frame; call ``release`` once it has been sent
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget stream state, so the next frame is a keyframe."""
+        pass
+
+    def _acquire(self, size: int) -> bytearray:
+        """Take a pooled output buffer of ``size`` bytes."""
+        if self.pool is None or self.pool.buffer_size != size:
+            self.pool = BufferPool(size, self.pool_size)
+        return self.pool.acquire()
+
+class RawEncoder(FrameEncoder):
+    """Uncompressed RGB pixels, row-major, without a header."""
+
+    name = "raw"
+
+    def encode(self, frame: np.ndarray) -> EncodedFrame:
+        buffer = self._acquire(frame.nbytes)
+        np.frombuffer(buffer, dtype=np.uint8).reshape(frame.shape)[...] = frame
+        return EncodedFrame(memoryview(buffer), self.name, True, buffer, self.pool)
+
+class JPEGEncoder(FrameEncoder):
+    """Baseline JPEG through OpenCV.
+
+    ``cv2.imencode`` allocates its own output, so JPEG frames are not
+    pooled. It releases the GIL while encoding, so frames of different
+    streams encode in parallel on a thread pool.
+    """
+
+    name = "jpeg"
+
+    def __init__(self, quality: int = 85, pool_size: int = 8):
+        """Initialize the encoder.
+
+        Args:
+            quality (int): JPEG quality from 0 to 100
+            pool_size (int): Unused, for a uniform constructor
+
+        Raises:
+            ImportError: If OpenCV is not installed
+        """
+        super().__init__(pool_size)
+        try:
+            import cv2
+        except ImportError as e:
+            raise ImportError("JPEG frame encoding requires opencv-python") from e
+        self.cv2 = cv2
+        self.quality = quality
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        self._bgr: Optional[np.ndarray] = None
+
+    def encode(self, frame: np.ndarray) -> EncodedFrame:
+        if self._bgr is None or self._bgr.shape != frame.shape:
+            self._bgr = np.empty_like(frame)
+        self.cv2.cvtColor(frame, self.cv2.COLOR_RGB2BGR, dst=self._bgr)
+        ok, encoded = self.cv2.imencode(".jpg", self._bgr, self.params)
+        if not ok:
+            raise ProcessingError("JPEG encoding failed")
+        return EncodedFrame(memoryview(encoded.reshape(-1)), self.name)
+
+class DeltaEncoder(FrameEncoder):
+    """Keyframes plus changed blocks.
+
+    A keyframe carries the whole frame. A delta frame carries only the
+    square blocks that differ from what the receiver already shows, with
+    their absolute pixels, so applying a delta twice is harmless. Talking
+    head video changes little outside the face, which makes deltas a small
+    fraction of a keyframe.
+
+    Every frame starts with ``HEADER``: magic, flags (bit 0 set for
+    keyframes), channels, block size, width, height and the number of
+    blocks. A keyframe is followed by the raw rows of the frame. A delta is
+    followed by the uint32 indices of the changed blocks, row-major over
+    the block grid, and then their pixels, one block after another. Frames
+    are padded with black to a whole number of blocks.
+    """
+
+    name = "delta"
+
+    MAGIC = b"PXDF"
+    HEADER = struct.Struct("<4sBBBxHHI")
+    KEYFRAME = 0x01
+
+    def __init__(self,
+                 keyframe_interval: int = 60,
+                 block_size: int = 16,
+                 threshold: int = 0,
+                 pool_size: int = 8):
+        """Initialize the encoder.
+
+        Args:
+            keyframe_interval (int): Frames between keyframes, so receivers
+                that join late or lose a frame recover
+            block_size (int): Block edge in pixels
+            threshold (int): Largest per-channel difference treated as
+                unchanged. 0 is lossless; higher values trade exactness for
+                smaller deltas, without drift, since blocks are compared with
+                what the receiver has.
+            pool_size (int): Output buffers kept for reuse
+        """
+        super().__init__(pool_size)
+        if not 1 <= block_size <= 255:
+            raise ValueError("block_size must be between 1 and 255")
+        self.keyframe_interval = keyframe_interval
+        self.block_size = block_size
+        self.threshold = threshold
+        self._reference: Optional[np.ndarray] = None
+        self._canvas: Optional[np.ndarray] = None
+        self._frame_shape: Optional[Tuple[int, int, int]] = None
+        self._frames_since_keyframe = 0
+
+    def reset(self) -> None:
+        self._reference = None
+        self._frames_since_keyframe = 0
+
+    def encode(self, frame: np.ndarray) -> EncodedFrame:
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if (self._reference is None
+                or self._frames_since_keyframe + 1 >= self.keyframe_interval
+                or self._frame_shape != frame.shape):
+            return self._encode_keyframe(frame)
+
+        height, width, channels = frame.shape
+        size = self.block_size
+        current = self._padded(frame)
+        changed = self._changed_blocks(current, self._reference)
+        rows, cols = np.nonzero(changed)
+        count = rows.size
+        block_bytes = size * size * channels
+        if count * (block_bytes + 4) >= frame.nbytes:
+            return self._encode_keyframe(frame)
+
+        buffer = self._acquire(self.HEADER.size + frame.nbytes)
+        self.HEADER.pack_into(buffer, 0, self.MAGIC, 0, channels, size, width, height, count)
+        offset = self.HEADER.size
+        indices = np.frombuffer(buffer, dtype=np.uint32, count=count, offset=offset)
+        np.add(rows * changed.shape[1], cols, out=indices, casting="unsafe")
+        offset += indices.nbytes
+        blocks = np.frombuffer(buffer, dtype=np.uint8, count=count * block_bytes, offset=offset)
+        blocks = blocks.reshape(count, size, size, channels)
+        blocks[...] = self._blocks(current)[rows, cols]
+        # The receiver now shows these blocks
+        self._blocks(self._reference)[rows, cols] = blocks
+
+        self._frames_since_keyframe += 1
+        end = offset + blocks.nbytes
+        return EncodedFrame(memoryview(buffer)[:end], self.name, False, buffer, self.pool)
+
+    def _encode_keyframe(self, frame: np.ndarray) -> EncodedFrame:
+        height, width, channels = frame.shape
+        buffer = self._acquire(self.HEADER.size + frame.nbytes)
+        self.HEADER.pack_into(buffer, 0, self.MAGIC, self.KEYFRAME, channels, self.block_size,
+                              width, height, 0)
+        pixels = np.frombuffer(buffer, dtype=np.uint8, count=frame.nbytes, offset=self.HEADER.size)
+        pixels.reshape(frame.shape)[...] = frame
+
+        padded = (-(-height // self.block_size) * self.block_size,
+                  -(-width // self.block_size) * self.block_size, channels)
+        if self._reference is None or self._reference.shape != padded:
+            self._reference = np.zeros(padded, dtype=np.uint8)
+            self._canvas = np.zeros(padded, dtype=np.uint8)
+        self._reference[:height, :width] = frame
+        self._frame_shape = frame.shape
+        self._frames_since_keyframe = 0
+        return EncodedFrame(memoryview(buffer), self.name, True, buffer, self.pool)
+
+    def _padded(self, frame: np.ndarray) -> np.ndarray:
+        """The frame on the block grid; a copy only when it needs padding."""
+        if frame.shape == self._canvas.shape:
+            return frame
+        self._canvas[:frame.shape[0], :frame.shape[1]] = frame
+        return self._canvas
+
+    def _blocks(self, image: np.ndarray) -> np.ndarray:
+        """``(rows, cols, size, size, channels)`` view of a padded image."""
+        size = self.block_size
+        height, width, channels = image.shape
+        return image.reshape(height // size, size, width // size, size, channels).swapaxes(1, 2)
+
+    def _changed_blocks(self, current: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """``(rows, cols)`` mask of blocks that differ from the reference."""
+        size = self.block_size
+        height, width, channels = current.shape
+        grid = (height // size, size, width // size, -1)
+        if self.threshold > 0:
+            difference = np.maximum(current, reference)
+            difference -= np.minimum(current, reference)
+            return difference.reshape(grid).max(axis=(1, 3)) > self.threshold
+        if (size * channels) % 8 == 0:
+            # Compare eight bytes at a time
+            current = current.reshape(height, -1).view(np.uint64)
+            reference = reference.reshape(height, -1).view(np.uint64)
+        return np.not_equal(current.reshape(grid), reference.reshape(grid)).any(axis=(1, 3))
+
+class DeltaDecoder:
+    """Reconstructs frames from a ``DeltaEncoder`` stream."""
+
+    def __init__(self):
+        self._canvas: Optional[np.ndarray] = None
+        self._shape: Optional[Tuple[int, int, int]] = None
+
+    def decode(self, data: Any) -> np.ndarray:
+        """Apply the next encoded frame.
+
+        Args:
+            data (Any): Bytes-like encoded frame
+
+        Returns:
+            np.ndarray: ``(height, width, channels)`` uint8 view of the current
+            picture, updated in place by later frames
+
+        Raises:
+            ValueError: If the data is not a delta stream frame, or a delta
+                arrives before the first keyframe
+        """
+        header = DeltaEncoder.HEADER
+        magic, flags, channels, size, width, height, count = header.unpack_from(data)
+        if magic != DeltaEncoder.MAGIC:
+            raise ValueError("Not a delta encoded frame")
+        shape = (height, width, channels)
+        if flags & DeltaEncoder.KEYFRAME:
+            padded = (-(-height // size) * size, -(-width // size) * size, channels)
+            if self._canvas is None or self._canvas.shape != padded:
+                self._canvas = np.zeros(padded, dtype=np.uint8)
+            pixels = np.frombuffer(data, dtype=np.uint8, count=height * width * channels,
+                                   offset=header.size)
+            self._canvas[:height, :width] = pixels.reshape(shape)
+            self._shape = shape
+        else:
+            if self._canvas is None or self._shape != shape:
+                raise ValueError("Delta frame received before its keyframe")
+            indices = np.frombuffer(data, dtype=np.uint32, count=count, offset=header.size)
+            blocks = np.frombuffer(data, dtype=np.uint8, count=count * size * size * channels,
+                                   offset=header.size + indices.nbytes)
+            columns = self._canvas.shape[1] // size
+            grid = self._canvas.reshape(self._canvas.shape[0] // size, size, columns, size,
+                                        channels).swapaxes(1, 2)
+            grid[indices // columns, indices % columns] = blocks.reshape(count, size, size,
+                                                                         channels)
+        return self._canvas[:height, :width]
+
+ENCODERS = {
+    "raw": RawEncoder,
+    "jpeg": JPEGEncoder,
+    "delta": DeltaEncoder,
+}
+
+def create_encoder(name: str = "raw", **options: Any) -> FrameEncoder:
+    """Create a frame encoder by name.
+
+    Args:
+        name (str): ``"raw"``, ``"jpeg"`` or ``"delta"``
+        **options: Encoder constructor arguments, e.g. ``quality`` for JPEG
+
+    Returns:
+        FrameEncoder: New encoder with its own stream state
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the encoder's library is not installed
+    """
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown frame encoder: {name}")
+    return ENCODERS[name](**options)
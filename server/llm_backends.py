@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import urllib.request
+from typing import AsyncGenerator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]
+
+class LLMBackend:
+    """Adapter between LLMService and a model server.
+
+    Subclasses implement ``generate_batch``. Single requests and streaming
+    fall back to it unless overridden.
+    """
+
+    async def generate_batch(self,
+                             batch: List[Messages],
+                             max_tokens: int,
+                             temperature: float) -> List[str]:
+        """Generate responses for several conversations in one call.
+
+        Args:
+            batch (List[Messages]): Prompt messages per request
+            max_tokens (int): Maximum tokens per response
+            temperature (float): Sampling temperature
+
+        Returns:
+            List[str]: Responses in request order. An ``Exception`` instance in
+            place of a response fails only that request.
+        """
+        raise NotImplementedError
+
+    async def generate(self, messages: Messages, max_tokens: int, temperature: float) -> str:
+        """Generate a response for a single conversation."""
+        result = (await self.generate_batch([messages], max_tokens, temperature))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def stream(self,
+                     messages: Messages,
+                     max_tokens: int,
+                     temperature: float) -> AsyncGenerator[str, None]:
+        """Stream response tokens for a single conversation."""
+        yield await self.generate(messages, max_tokens, temperature)
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+class PlaceholderBackend(LLMBackend):
+    """Stand-in backend returning a fixed response with simulated latency."""
+
+    RESPONSE = "I understand your message. Here's a placeholder response."
+
+    def __init__(self, latency: float = 0.1, token_latency: float = 0.02):
+        """Initialize the placeholder backend.
+
+        Args:
+            latency (float): Seconds per (batched) request
+            token_latency (float): Seconds per streamed token
+        """
+        self.latency = latency
+        self.token_latency = token_latency
+
+    async def generate_batch(self,
+                             batch: List[Messages],
+                             max_tokens: int,
+                             temperature: float) -> List[str]:
+        # TODO: Replace with actual LLM API call
+        await asyncio.sleep(self.latency)  # Simulate API latency
+        return [self.RESPONSE] * len(batch)
+
+    async def stream(self,
+                     messages: Messages,
+                     max_tokens: int,
+                     temperature: float) -> AsyncGenerator[str, None]:
+        # TODO: Replace with actual streaming LLM API call
+        for i, word in enumerate(self.RESPONSE.split(" ")):
+            await asyncio.sleep(self.token_latency)  # Simulate per-token latency
+            yield word if i == 0 else " " + word
+
+class HTTPBatchBackend(LLMBackend):
+    """Backend for a self-hosted model server with a JSON batch endpoint.
+
+    Each batch is sent as one ``POST`` of
+    ``{"model", "max_tokens", "temperature", "requests": [{"messages": [...]}, ...]}``
+    and the server answers ``{"responses": ["...", ...]}`` in request order.
+    A response may instead be ``{"error": "..."}`` to fail a single request.
+    """
+
+    def __init__(self,
+                 url: str,
+                 model_name: str,
+                 timeout: float = 30.0,
+                 headers: Optional[Dict[str, str]] = None):
+        """Initialize the HTTP backend.
+
+        Args:
+            url (str): Batch endpoint URL
+            model_name (str): Model name sent to the server
+            timeout (float): Request timeout in seconds
+            headers (Optional[Dict[str, str]]): Extra request headers
+        """
+        self.url = url
+        self.model_name = model_name
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    async def generate_batch(self,
+                             batch: List[Messages],
+                             max_tokens: int,
+                             temperature: float) -> List[str]:
+        payload = json.dumps({
+            "model": self.model_name,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "requests": [{"messages": messages} for messages in batch],
+        }).encode()
+        loop = asyncio.get_running_loop()
+        body = await loop.run_in_executor(None, self._post, payload)
+
+        results = []
+        for item in json.loads(body)["responses"]:
+            if isinstance(item, dict) and "error" in item:
+                results.append(RuntimeError(item["error"]))
+            else:
+                results.append(item)
+        return results
+
+    def _post(self, payload: bytes) -> bytes:
+        """Send a blocking request. Runs in the default executor."""
+        request = urllib.request.Request(self.url, data=payload, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
@@ -1,44 +1,72 @@
 import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import AsyncGenerator, Dict, List, Optional, Any
 from datetime import datetime
-from dataclasses import dataclass
-from enum import Enum
+from .conversation_store import ConversationStore, Message, MessageRole
+from .llm_backends import LLMBackend, PlaceholderBackend
+from .utils.batching import MicroBatcher
+from .utils.cache import LRUCache
+from .utils.metrics import histogram
+from .utils.text import SentenceChunker, normalize_text
 
 logger = logging.getLogger(__name__)
 
-class MessageRole(Enum):
-    SYSTEM = "system"
-    USER = "user"
-    ASSISTANT = "assistant"
-
-@dataclass
-class Message:
-    role: MessageRole
-    content: str
-    timestamp: datetime
-    metadata: Optional[Dict[str, Any]] = None
+FIRST_TOKEN = histogram("llm_first_token_seconds", "Time to the first streamed token")
+RESPONSE = histogram("llm_response_seconds", "Time to a complete response")
 
 class LLMService:
     def __init__(self,
                  model_name: str = "gpt-3.5-turbo",
                  max_history: int = 10,
                  max_tokens: int = 150,
-                 temperature: float = 0.7):
+                 temperature: float = 0.7,
+                 max_context_tokens: int = 2048,
+                 conversation_store: Optional[ConversationStore] = None,
+                 response_cache: Optional[LRUCache] = None,
+                 cache_window: int = 2,
+                 backend: Optional[LLMBackend] = None,
+                 max_batch_size: int = 8,
+                 max_batch_wait: float = 0.01):
         """Initialize the Language Model service.
 
         Args:
             model_name (str): Name of the LLM model to use
-            max_history (int): Maximum conversation turns to keep
+            max_history (int): Maximum conversation messages sent to the model
             max_tokens (int): Maximum tokens in response
             temperature (float): Response randomness (0-1)
+            max_context_tokens (int): Token budget for the history sent to the
+                model, system prompt included
+            conversation_store (Optional[ConversationStore]): Store holding
+                conversation histories. Defaults to a bounded in-memory store.
+            response_cache (Optional[LRUCache]): Cache of generated responses.
+                Defaults to 1024 entries with a 10 minute TTL.
+            cache_window (int): Number of most recent messages that form the
+                cache key together with context, model and temperature
+            backend (Optional[LLMBackend]): Model server adapter. Defaults to
+                the placeholder backend.
+            max_batch_size (int): Maximum requests batched into one backend
+                call; 1 disables batching
+            max_batch_wait (float): Maximum seconds a request waits for its
+                batch to fill
         """
         self.model_name = model_name
         self.max_history = max_history
         self.max_tokens = max_tokens
         self.temperature = temperature
-        self.conversations: Dict[str, List[Message]] = {}
+        self.max_context_tokens = max_context_tokens
+        self.conversations = (conversation_store if conversation_store is not None
+                              else ConversationStore())
+        self.response_cache = (response_cache if response_cache is not None
+                               else LRUCache(max_entries=1024, ttl=600.0))
+        self.cache_window = cache_window
+        self.backend = backend if backend is not None else PlaceholderBackend()
+        self.batcher = (MicroBatcher(self._generate_batch,
+                                     max_batch_size=max_batch_size,
+                                     max_wait=max_batch_wait)
+                        if max_batch_size > 1 else None)
         
         # Initialize system prompts for different contexts
         self.system_prompts = {
@@ -57,60 +85,112 @@ class LLMService:
             conversation_id (str): Unique conversation identifier
             context (str): Context key for system prompt
         """
-        self.conversations[conversation_id] = [
+        self.conversations.create(
+            conversation_id,
+            self.system_prompts.get(context, self.system_prompts['default'])
+        )
+
+    async def _prepare_messages(self,
+                                text: str,
+                                conversation_id: str,
+                                context: str) -> List[Dict[str, str]]:
+        """Record the user's message and build the prompt messages.
+
+        Args:
+            text (str): User's input text
+            conversation_id (str): Unique conversation identifier
+            context (str): Conversation context
+
+        Returns:
+            List[Dict[str, str]]: Messages to send to the model
+        """
+        # Initialize conversation if needed
+        if await self.conversations.load(conversation_id) is None:
+            self._create_conversation(conversation_id, context)
+
+        # Add user message
+        self.conversations.append(
+            conversation_id,
             Message(
-                role=MessageRole.SYSTEM,
-                content=self.system_prompts.get(context, self.system_prompts['default']),
+                role=MessageRole.USER,
+                content=text,
                 timestamp=datetime.now()
             )
+        )
+
+        # Prepare conversation history within the token budget
+        return [
+            {"role": msg.role.value, "content": msg.content}
+            for msg in self.conversations.window(conversation_id,
+                                                 self.max_context_tokens,
+                                                 self.max_history)
         ]
 
+    def _cache_key(self, messages: List[Dict[str, str]], context: str) -> str:
+        """Build the response cache key for a prompt.
+
+        Args:
+            messages (List[Dict[str, str]]): Messages sent to the model
+            context (str): Conversation context
+
+        Returns:
+            str: Digest of the normalized recent messages and generation settings
+        """
+        recent = [msg for msg in messages if msg["role"] != MessageRole.SYSTEM.value]
+        window = [
+            [msg["role"], normalize_text(msg["content"])]
+            for msg in recent[-self.cache_window:]
+        ]
+        payload = json.dumps([context, self.model_name, self.temperature, window])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _add_assistant_message(self,
+                                     conversation_id: str,
+                                     content: str,
+                                     metadata: Optional[Dict[str, Any]] = None):
+        """Commit an assistant message to the conversation history."""
+        self.conversations.append(
+            conversation_id,
+            Message(
+                role=MessageRole.ASSISTANT,
+                content=content,
+                timestamp=datetime.now(),
+                metadata=metadata
+            )
+        )
+        await self.conversations.save(conversation_id)
+
     async def get_response(self, 
-                          text: str, 
-                          conversation_id: str,
-                          context: str = 'default') -> str:
+                           text: str, 
+                           conversation_id: str,
+                           context: str = 'default',
+                           use_cache: bool = True) -> str:
         """Generate response based on input and conversation history.
 
         Args:
             text (str): User's input text
             conversation_id (str): Unique conversation identifier
             context (str): Conversation context
+            use_cache (bool): Serve and store the response through the response cache
 
         Returns:
             str: Generated response
         """
         try:
-            # Initialize conversation if needed
-            if conversation_id not in self.conversations:
-                self._create_conversation(conversation_id, context)
-
-            # Add user message
-            self.conversations[conversation_id].append(
-                Message(
-                    role=MessageRole.USER,
-                    content=text,
-                    timestamp=datetime.now()
-                )
-            )
+            # Keep the conversation in memory until the reply is committed
+            with self.conversations.pinned(conversation_id):
+                messages = await self._prepare_messages(text, conversation_id, context)
 
-            # Prepare conversation history
-            messages = [
-                {"role": msg.role.value, "content": msg.content}
-                for msg in self.conversations[conversation_id][-self.max_history:]
-            ]
-
-            # TODO: Implement actual LLM API call
-            # Placeholder implementation
-            response = await self._generate_response(messages)
-
-            # Add assistant message
-            self.conversations[conversation_id].append(
-                Message(
-                    role=MessageRole.ASSISTANT,
-                    content=response,
-                    timestamp=datetime.now()
-                )
-            )
+                if use_cache:
+                    # Concurrent identical prompts share one backend call
+                    response = await self.response_cache.get_or_set(
+                        self._cache_key(messages, context),
+                        lambda: self._generate_response(messages))
+                else:
+                    response = await self._generate_response(messages)
+
+                # Add assistant message
+                await self._add_assistant_message(conversation_id, response)
 
             return response
 
@@ -118,6 +198,96 @@ class LLMService:
             logger.error(f"Error in LLM processing: {e}")
             return "I apologize, but I'm having trouble processing your request."
 
+    async def stream_response(self,
+                              text: str,
+                              conversation_id: str,
+                              context: str = 'default',
+                              use_cache: bool = True) -> AsyncGenerator[str, None]:
+        """Stream the response token by token as the backend produces it.
+
+        The text generated so far is committed to the conversation history
+        when the stream ends, fails or is cancelled, so an interrupted answer
+        is still part of the context of the next turn. A cached response is
+        yielded as a single token.
+
+        Args:
+            text (str): User's input text
+            conversation_id (str): Unique conversation identifier
+            context (str): Conversation context
+            use_cache (bool): Serve and store the response through the response cache
+
+        Yields:
+            str: Response tokens
+        """
+        tokens: List[str] = []
+        metadata = None
+        # Keep the conversation in memory until the reply is committed
+        with self.conversations.pinned(conversation_id):
+            try:
+                messages = await self._prepare_messages(text, conversation_id, context)
+                cache_key = self._cache_key(messages, context) if use_cache else None
+                cached = self.response_cache.get(cache_key) if use_cache else None
+                if cached is not None:
+                    tokens.append(cached)
+                    yield cached
+                    return
+
+                async for token in self._generate_stream(messages):
+                    tokens.append(token)
+                    yield token
+
+                if use_cache and tokens:
+                    self.response_cache.put(cache_key, "".join(tokens))
+
+            except (asyncio.CancelledError, GeneratorExit):
+                metadata = {"interrupted": True}
+                raise
+
+            except Exception as e:
+                logger.error(f"Error in LLM streaming: {e}")
+                if not tokens:
+                    fallback = "I apologize, but I'm having trouble processing your request."
+                    tokens.append(fallback)
+                    yield fallback
+                else:
+                    metadata = {"interrupted": True}
+
+            finally:
+                if tokens:
+                    await self._add_assistant_message(conversation_id, "".join(tokens), metadata)
+
+    async def stream_segments(self,
+                              text: str,
+                              conversation_id: str,
+                              context: str = 'default',
+                              use_cache: bool = True) -> AsyncGenerator[str, None]:
+        """Stream the response as speakable sentence or clause segments.
+
+        Each segment is yielded as soon as it closes, so speech synthesis can
+        start on the first sentence while the rest is still being generated.
+
+        Args:
+            text (str): User's input text
+            conversation_id (str): Unique conversation identifier
+            context (str): Conversation context
+            use_cache (bool): Serve and store the response through the response cache
+
+        Yields:
+            str: Speakable text segments
+        """
+        chunker = SentenceChunker()
+        tokens = self.stream_response(text, conversation_id, context, use_cache)
+        try:
+            async for token in tokens:
+                for segment in chunker.push(token):
+                    yield segment
+
+            remaining = chunker.flush()
+            if remaining:
+                yield remaining
+        finally:
+            await tokens.aclose()
+
     async def _generate_response(self, messages: List[Dict[str, str]]) -> str:
         """Generate response using LLM.
 
@@ -127,16 +297,65 @@ class LLMService:
         Returns:
             str: Generated response
         """
-        # TODO: Replace with actual LLM API call
-        await asyncio.sleep(0.1)  # Simulate API latency
-        return f"I understand your message. Here's a placeholder response."
+        with RESPONSE.time():
+            if self.batcher is not None:
+                # Concurrent requests from other conversations share a backend call
+                return await self.batcher.submit(messages)
+            return await self.backend.generate(messages, self.max_tokens, self.temperature)
+
+    async def _generate_batch(self, batch: List[List[Dict[str, str]]]) -> List[str]:
+        """Generate responses for a batch of conversations.
+
+        Args:
+            batch (List[List[Dict[str, str]]]): Conversation messages per request
+
+        Returns:
+            List[str]: Generated responses in request order
+        """
+        return await self.backend.generate_batch(batch, self.max_tokens, self.temperature)
 
-    def reset_conversation(self, conversation_id: str):
-        """Reset a specific conversation.
+    async def _generate_stream(self,
+                               messages: List[Dict[str, str]]) -> AsyncGenerator[str, None]:
+        """Stream response tokens from the LLM.
+
+        Args:
+            messages (List[Dict[str, str]]): Conversation messages
+
+        Yields:
+            str: Response tokens
+        """
+        started = time.perf_counter()
+        first = True
+        async for token in self.backend.stream(messages, self.max_tokens, self.temperature):
+            if first:
+                FIRST_TOKEN.observe(time.perf_counter() - started)
+                first = False
+            yield token
+        # Interrupted streams are left out of the full response latency
+        RESPONSE.observe(time.perf_counter() - started)
+
+    def reset_conversation(self, conversation_id: str) -> Optional[asyncio.Task]:
+        """Reset a specific conversation, including its persisted copy.
+
+        The conversation is forgotten at once, evicted or not; the persisted
+        copy is deleted in the background.
 
         Args:
             conversation_id (str): Conversation to reset
+
+        Returns:
+            Optional[asyncio.Task]: Deletion of the persisted copy, to await
+            when it must be gone from the persistence tier too
         """
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
-            logger.info(f"Reset conversation {conversation_id}")
+        deletion = self.conversations.discard(conversation_id)
+        logger.info(f"Reset conversation {conversation_id}")
+        return deletion
+
+    async def cleanup(self) -> None:
+        """Clean up resources."""
+        try:
+            if self.batcher is not None:
+                await self.batcher.close()
+            await self.backend.close()
+        except Exception as e:
+            logger.error(f"Error during cleanup: {str(e)}")
@@ -0,0 +1,363 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional, Set
+from .llm_service import LLMService
+from .rendering_service import RenderingService
+from .stt_service import STTService
+from .tts_service import AudioChunk, TTSService
+from .utils.audio import VADEvent, VADEventType, VoiceActivityDetector
+from .utils.lifecycle import readiness
+from .utils.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+# Turn milestones, counted from the final transcript
+TURN_LATENCY = {milestone: histogram("turn_latency_seconds", "Turn latency by milestone",
+                                     milestone=milestone)
+                for milestone in ("first_text", "first_audio", "first_frame", "finished")}
+TURNS_INTERRUPTED = counter("turns_interrupted_total", "Turns cancelled by barge-in")
+
+class PipelineEventType(Enum):
+    TRANSCRIPT = "transcript"
+    RESPONSE_TEXT = "response_text"
+    AUDIO = "audio"
+    VIDEO_FRAME = "video_frame"
+    TURN_END = "turn_end"
+    INTERRUPTED = "interrupted"
+    ERROR = "error"
+
+@dataclass
+class PipelineEvent:
+    """Output of a conversation session.
+
+    Attributes:
+        type: Event type
+        turn: Turn the event belongs to; transcripts belong to the turn they start
+        data: ``TranscriptEvent`` for transcripts, the text segment for
+            response text, an ``AudioChunk`` holding one segment's speech for
+            audio, encoded ``bytes`` for video frames, ``TurnTimings`` when a
+            turn ends or is interrupted, and the message for errors
+    """
+    type: PipelineEventType
+    turn: int
+    data: Any = None
+
+@dataclass
+class TurnTimings:
+    """Latencies of a turn in seconds, counted from its final transcript.
+
+    Attributes:
+        started: Loop time at which the final transcript arrived
+        first_text: First response segment generated
+        first_audio: First segment synthesized
+        first_frame: First video frame emitted
+        finished: Last frame emitted, or the turn interrupted
+    """
+    started: float
+    first_text: Optional[float] = None
+    first_audio: Optional[float] = None
+    first_frame: Optional[float] = None
+    finished: Optional[float] = None
+
+    def mark(self, name: str) -> None:
+        """Record the first occurrence of a milestone."""
+        if getattr(self, name) is None:
+            setattr(self, name, asyncio.get_running_loop().time() - self.started)
+
+    def observe(self) -> None:
+        """Record the milestones reached in the turn latency histograms."""
+        for milestone, metric in TURN_LATENCY.items():
+            value = getattr(self, milestone)
+            if value is not None:
+                metric.observe(value)
+
+class _Session:
+    """Per-conversation pipeline state."""
+
+    def __init__(self, session_id: str, output: asyncio.Queue):
+        self.id = session_id
+        self.output = output
+        self.turn = 0
+        self.task: Optional[asyncio.Task] = None
+        self.timings: Optional[TurnTimings] = None
+        self.cancelled: Set[int] = set()
+
+    async def emit(self, type: PipelineEventType, turn: int, data: Any = None) -> None:
+        await self.output.put(PipelineEvent(type, turn, data))
+
+class ConversationOrchestrator:
+    """Streams a conversation through STT, LLM, TTS and rendering.
+
+    Every final transcript starts a turn of three overlapped stages joined
+    by bounded queues: the LLM streams sentence segments, TTS synthesizes
+    each segment as soon as it closes, and the renderer animates each
+    segment's audio while the next ones are generated and synthesized.
+    Full queues hold the earlier stage back, so neither the LLM nor TTS
+    runs more than ``queue_size`` segments ahead of playback.
+
+    When the user starts speaking again (barge-in), the LLM, TTS and
+    render work of the turn in flight is cancelled, and its queued text,
+    audio and frames are dropped instead of delivered.
+    """
+
+    # Turn output that is dropped once its turn is interrupted
+    _TURN_OUTPUT = (PipelineEventType.RESPONSE_TEXT,
+                    PipelineEventType.AUDIO,
+                    PipelineEventType.VIDEO_FRAME)
+
+    def __init__(self,
+                 stt: STTService,
+                 llm: LLMService,
+                 tts: TTSService,
+                 renderer: RenderingService,
+                 queue_size: int = 2,
+                 output_queue_size: int = 8,
+                 voice_id: Optional[str] = None,
+                 emotion: Optional[str] = None,
+                 barge_in: bool = True):
+        """Initialize the orchestrator.
+
+        Args:
+            stt (STTService): Speech recognition
+            llm (LLMService): Response generation
+            tts (TTSService): Speech synthesis
+            renderer (RenderingService): Avatar rendering
+            queue_size (int): Segments queued between the LLM, TTS and render stages
+            output_queue_size (int): Events queued for the client before the
+                pipeline waits for it
+            voice_id (Optional[str]): Voice the avatar speaks with
+            emotion (Optional[str]): Emotion applied to the avatar's speech
+            barge_in (bool): Interrupt the avatar as soon as the user starts
+                speaking, rather than once their next utterance is transcribed
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.stt = stt
+        self.llm = llm
+        self.tts = tts
+        self.renderer = renderer
+        self.queue_size = queue_size
+        self.output_queue_size = output_queue_size
+        self.voice_id = voice_id
+        self.emotion = emotion
+        self.barge_in = barge_in
+
+    async def start(self) -> None:
+        """Load and warm up the model services concurrently."""
+        await asyncio.gather(self.stt.start(), self.tts.start(), self.renderer.start())
+
+    def readiness(self) -> Dict[str, Any]:
+        """Combined readiness probe of the model services."""
+        return readiness(self.stt.lifecycle, self.tts.lifecycle, self.renderer.lifecycle)
+
+    async def run(self,
+                  frames: AsyncIterable[bytes],
+                  session_id: str = "default",
+                  sample_rate: Optional[int] = None,
+                  vad: Optional[VoiceActivityDetector] = None
+                  ) -> AsyncGenerator[PipelineEvent, None]:
+        """Hold a spoken conversation over a stream of microphone audio.
+
+        Args:
+            frames (AsyncIterable[bytes]): Raw 16-bit PCM frames from the client
+            session_id (str): Session and conversation identifier
+            sample_rate (Optional[int]): Rate of ``frames`` if it differs from
+                the STT rate
+            vad (Optional[VoiceActivityDetector]): Detector segmenting the
+                user's speech. Without one, partial transcripts mark the user
+                speaking for barge-in.
+
+        Yields:
+            PipelineEvent: Transcripts, response text, audio, video frames and
+            turn boundaries, in the order they are produced. Ends after the
+            audio stream ends and the last turn finishes.
+
+        Raises:
+            ProcessingError: If speech recognition fails
+        """
+        session = _Session(session_id, asyncio.Queue(maxsize=self.output_queue_size))
+        listener = asyncio.ensure_future(self._listen(frames, session, sample_rate, vad))
+        try:
+            async for event in self._drain(session, listener):
+                yield event
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            await self._interrupt(session, notify=False)
+            # The client is gone; its encoder state is of no further use
+            self.renderer.end_session(session_id)
+
+    async def respond(self,
+                      text: str,
+                      session_id: str = "default") -> AsyncGenerator[PipelineEvent, None]:
+        """Answer a typed message with speech and video.
+
+        Args:
+            text (str): User's message
+            session_id (str): Session and conversation identifier
+
+        Yields:
+            PipelineEvent: Response text, audio, video frames and the turn end
+        """
+        session = _Session(session_id, asyncio.Queue(maxsize=self.output_queue_size))
+        self._start_turn(session, text)
+        try:
+            async for event in self._drain(session, session.task):
+                yield event
+        finally:
+            await self._interrupt(session, notify=False)
+
+    async def _drain(self,
+                     session: _Session,
+                     producer: asyncio.Future) -> AsyncGenerator[PipelineEvent, None]:
+        """Yield a session's events until its producer finishes."""
+        def finished(_):
+            # Wakes a waiting consumer; a full queue is drained before the check
+            if not session.output.full():
+                session.output.put_nowait(None)
+
+        producer.add_done_callback(finished)
+        while True:
+            if producer.done() and session.output.empty():
+                break
+            event = await session.output.get()
+            if event is None:
+                continue
+            if event.turn in session.cancelled and event.type in self._TURN_OUTPUT:
+                continue
+            yield event
+        if not producer.cancelled() and producer.exception() is not None:
+            raise producer.exception()
+
+    async def _listen(self,
+                      frames: AsyncIterable[bytes],
+                      session: _Session,
+                      sample_rate: Optional[int],
+                      vad: Optional[VoiceActivityDetector]) -> None:
+        """Transcribe the user and start a turn for every final transcript."""
+        events = self.stt.transcribe_stream(frames, session_id=session.id, vad=vad,
+                                            sample_rate=sample_rate)
+        async for event in events:
+            if isinstance(event, VADEvent):
+                if event.type == VADEventType.SPEECH_START and self.barge_in:
+                    await self._interrupt(session)
+                continue
+
+            await session.emit(PipelineEventType.TRANSCRIPT, session.turn + 1, event)
+            if not event.is_final:
+                if vad is None and self.barge_in:
+                    await self._interrupt(session)
+                continue
+            # A newer utterance supersedes the answer to the previous one
+            await self._interrupt(session)
+            self._start_turn(session, event.text)
+
+        if session.task is not None:
+            await asyncio.gather(session.task, return_exceptions=True)
+
+    def _start_turn(self, session: _Session, text: str) -> None:
+        session.turn += 1
+        session.timings = TurnTimings(asyncio.get_running_loop().time())
+        session.task = asyncio.ensure_future(
+            self._run_turn(session, session.turn, session.timings, text))
+
+    async def _interrupt(self, session: _Session, notify: bool = True) -> None:
+        """Cancel the turn in flight, if any, and drop its queued output.
+
+        Args:
+            session (_Session): Session to interrupt
+            notify (bool): Emit an ``INTERRUPTED`` event, which waits for the client
+        """
+        task = session.task
+        if task is None or task.done():
+            return
+        session.cancelled.add(session.turn)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        session.timings.mark("finished")
+        TURNS_INTERRUPTED.inc()
+        logger.info(f"Session {session.id} interrupted turn {session.turn}")
+        if notify:
+            await session.emit(PipelineEventType.INTERRUPTED, session.turn, session.timings)
+
+    async def _run_turn(self,
+                        session: _Session,
+                        turn: int,
+                        timings: TurnTimings,
+                        text: str) -> None:
+        """Run the LLM, TTS and render stages of a turn concurrently."""
+        segments: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        speech: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stages: List[asyncio.Future] = [
+            asyncio.ensure_future(self._generate(session, turn, timings, text, segments)),
+            asyncio.ensure_future(self._synthesize(timings, segments, speech)),
+            asyncio.ensure_future(self._render(session, turn, timings, speech)),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Session {session.id} turn {turn} failed: {str(e)}")
+            await session.emit(PipelineEventType.ERROR, turn, str(e))
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        timings.mark("finished")
+        timings.observe()
+        await session.emit(PipelineEventType.TURN_END, turn, timings)
+
+    async def _generate(self,
+                        session: _Session,
+                        turn: int,
+                        timings: TurnTimings,
+                        text: str,
+                        segments: asyncio.Queue) -> None:
+        """Stream response segments to TTS."""
+        async for segment in self.llm.stream_segments(text, session.id):
+            timings.mark("first_text")
+            await session.emit(PipelineEventType.RESPONSE_TEXT, turn, segment)
+            await segments.put(segment)
+        await segments.put(None)
+
+    async def _synthesize(self,
+                          timings: TurnTimings,
+                          segments: asyncio.Queue,
+                          speech: asyncio.Queue) -> None:
+        """Synthesize each segment as soon as it is generated."""
+        offset = 0
+        index = 0
+        while True:
+            segment = await segments.get()
+            if segment is None:
+                break
+            audio = await self.tts.synthesize(segment, self.voice_id, self.emotion)
+            if not audio:
+                continue
+            timings.mark("first_audio")
+            chunk = AudioChunk(audio, offset, self.tts.sample_rate, index)
+            await speech.put(chunk)
+            offset += chunk.num_samples
+            index += 1
+        await speech.put(None)
+
+    async def _render(self,
+                      session: _Session,
+                      turn: int,
+                      timings: TurnTimings,
+                      speech: asyncio.Queue) -> None:
+        """Send each segment's audio and render its frames in real time."""
+        while True:
+            chunk = await speech.get()
+            if chunk is None:
+                break
+            await session.emit(PipelineEventType.AUDIO, turn, chunk)
+            async for frame in self.renderer.render_frames(chunk.audio, chunk.sample_rate,
+                                                           session_id=session.id):
+                timings.mark("first_frame")
+                # Frames share pooled buffers that are reused once the next
+                # frame is requested, so queued frames need their own copy
+                await session.emit(PipelineEventType.VIDEO_FRAME, turn, bytes(frame))
@@ -0,0 +1,617 @@
+import logging
+import numpy as np
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+from .exceptions import *
+from .utils.transforms import Transform3D
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Camera:
+    """Pinhole camera in OpenGL conventions (x right, y up, looking down -z).
+
+    Attributes:
+        view: ``(4, 4)`` world-to-camera matrix
+        fov_y: Vertical field of view in radians
+        width: Image width in pixels
+        height: Image height in pixels
+        near: Near clipping distance
+        far: Far clipping distance
+    """
+    view: np.ndarray
+    fov_y: float
+    width: int
+    height: int
+    near: float = 0.01
+    far: float = 100.0
+
+    @classmethod
+    def look_at(cls,
+                eye: Tuple[float, float, float],
+                target: Tuple[float, float, float],
+                resolution: Tuple[int, int],
+                fov_y: float = np.pi / 4,
+                up: Tuple[float, float, float] = (0.0, 1.0, 0.0)) -> "Camera":
+        view = Transform3D.create_view_matrix(np.asarray(eye, dtype=np.float64),
+                                              np.asarray(target, dtype=np.float64),
+                                              np.asarray(up, dtype=np.float64))
+        return cls(view, fov_y, resolution[0], resolution[1])
+
+    @property
+    def projection(self) -> np.ndarray:
+        return Transform3D.create_perspective_matrix(self.fov_y, self.width / self.height,
+                                                     self.near, self.far)
+
+    @property
+    def focal(self) -> Tuple[float, float]:
+        """Focal lengths in pixels."""
+        projection = self.projection
+        return projection[0, 0] * self.width / 2, projection[1, 1] * self.height / 2
+
+    def scaled(self, scale: float) -> "Camera":
+        """Same view at a reduced (or increased) resolution."""
+        return replace(self,
+                       width=max(1, int(round(self.width * scale))),
+                       height=max(1, int(round(self.height * scale))))
+
+@dataclass
+class GaussianCloud:
+    """3D Gaussians of a scene.
+
+    Attributes:
+        means: ``(N, 3)`` centers
+        scales: ``(N, 3)`` standard deviations along the local axes
+        rotations: ``(N, 4)`` unit quaternions (w, x, y, z)
+        colors: ``(N, 3)`` RGB in [0, 1]
+        opacities: ``(N,)`` opacities in [0, 1]
+        blendshape_deltas: Optional ``(52, N, 3)`` center offsets per blendshape
+    """
+    means: np.ndarray
+    scales: np.ndarray
+    rotations: np.ndarray
+    colors: np.ndarray
+    opacities: np.ndarray
+    blendshape_deltas: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.means.shape[0]
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any]) -> "GaussianCloud":
+        """Build a cloud from a checkpoint dict of tensors or arrays.
+
+        ``gaussians`` holds either ``(N, 3)`` centers, which get a small
+        isotropic scale, or ``(N, 10)`` rows of center, log-scale and
+        rotation quaternion as in 3D Gaussian Splatting training output.
+
+        Args:
+            checkpoint (Dict[str, Any]): ``gaussians``, ``colors``, ``opacities``
+                and optionally ``blendshape_deltas``
+
+        Returns:
+            GaussianCloud: float32 cloud
+        """
+        def array(value: Any) -> np.ndarray:
+            if hasattr(value, "detach"):
+                value = value.detach().cpu().numpy()
+            return np.ascontiguousarray(value, dtype=np.float32)
+
+        gaussians = array(checkpoint["gaussians"])
+        count = gaussians.shape[0]
+        if gaussians.shape[1] >= 10:
+            scales = np.exp(gaussians[:, 3:6])
+            rotations = gaussians[:, 6:10]
+            rotations = rotations / np.linalg.norm(rotations, axis=1, keepdims=True)
+        else:
+            scales = np.full((count, 3), 0.005, dtype=np.float32)
+            rotations = np.tile(np.array([1, 0, 0, 0], dtype=np.float32), (count, 1))
+        deltas = checkpoint.get("blendshape_deltas")
+        return cls(means=np.ascontiguousarray(gaussians[:, :3]),
+                   scales=array(scales),
+                   rotations=array(rotations),
+                   colors=array(checkpoint["colors"]).reshape(count, -1)[:, :3],
+                   opacities=array(checkpoint["opacities"]).reshape(count),
+                   blendshape_deltas=array(deltas) if deltas is not None else None)
+
+    def covariances(self) -> np.ndarray:
+        """``(N, 3, 3)`` world-space covariance matrices."""
+        w, x, y, z = self.rotations.T
+        rotation = np.stack([
+            1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y),
+            2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x),
+            2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y),
+        ], axis=1).reshape(-1, 3, 3)
+        m = rotation * self.scales[:, None, :]
+        return m @ m.transpose(0, 2, 1)
+
+class RasterizerBackend:
+    """Renders a Gaussian cloud from a camera.
+
+    Backends receive the cloud in host memory and may cache device copies
+    of its static attributes between frames.
+    """
+
+    name = "base"
+
+    def render(self,
+               cloud: GaussianCloud,
+               camera: Camera,
+               weights: Optional[np.ndarray] = None,
+               background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        """Render one frame.
+
+        Args:
+            cloud (GaussianCloud): Scene
+            camera (Camera): Camera, including the output resolution
+            weights (Optional[np.ndarray]): ``(52,)`` blendshape weights applied
+                through ``cloud.blendshape_deltas``
+            background (Tuple[float, float, float]): RGB background
+
+        Returns:
+            np.ndarray: ``(height, width, 3)`` float32 RGB image in [0, 1]
+        """
+        raise NotImplementedError
+
+    def render_batch(self,
+                     cloud: GaussianCloud,
+                     camera: Camera,
+                     weights: np.ndarray,
+                     background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        """Render one frame per row of blendshape weights.
+
+        Used to serve many sessions from one loaded cloud. The default
+        renders the frames one by one.
+
+        Args:
+            cloud (GaussianCloud): Scene
+            camera (Camera): Camera, including the output resolution
+            weights (np.ndarray): ``(B, 52)`` blendshape weights
+            background (Tuple[float, float, float]): RGB background
+
+        Returns:
+            np.ndarray: ``(B, height, width, 3)`` float32 RGB images in [0, 1]
+        """
+        return np.stack([self.render(cloud, camera, w, background) for w in weights])
+
+    def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+class NumpyRasterizer(RasterizerBackend):
+    """Vectorized CPU reference rasterizer.
+
+    Follows the tile-based 3D Gaussian Splatting pipeline: EWA projection
+    of each Gaussian to a screen-space conic, binning into square tiles,
+    per-tile front-to-back depth order, and alpha compositing. Batches of
+    tiles are composited together a few Gaussians deep at a time, carrying
+    transmittance between steps, and tiles drop out of the batch once all
+    their pixels are opaque.
+    """
+
+    name = "numpy"
+
+    ALPHA_MIN = 1.0 / 255.0
+    ALPHA_MAX = 0.99
+    TRANSMITTANCE_MIN = 1e-4
+    DEPTH_STEP = 32  # Gaussians per tile composited per step
+
+    def __init__(self, tile_size: int = 16, max_batch_elements: int = 1 << 21):
+        """Initialize the rasterizer.
+
+        Args:
+            tile_size (int): Tile edge in pixels
+            max_batch_elements (int): Gaussian-pixel pairs evaluated per step,
+                which bounds scratch memory
+        """
+        self.tile_size = tile_size
+        self.max_batch_elements = max_batch_elements
+        self._covariances: Optional[np.ndarray] = None
+        self._covariance_source: Optional[GaussianCloud] = None
+
+    def render(self,
+               cloud: GaussianCloud,
+               camera: Camera,
+               weights: Optional[np.ndarray] = None,
+               background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        means = cloud.means
+        if weights is not None and cloud.blendshape_deltas is not None:
+            means = means + np.tensordot(np.asarray(weights, dtype=np.float32),
+                                         cloud.blendshape_deltas, axes=1)
+        return self._rasterize(cloud, means, camera, background)
+
+    def render_batch(self,
+                     cloud: GaussianCloud,
+                     camera: Camera,
+                     weights: np.ndarray,
+                     background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        """Deform the whole batch with one matrix product, then rasterize each frame.
+
+        Projection and compositing stay per frame: each frame already fills
+        the vectorized kernels, and stacking frames into one scene only adds
+        cache pressure.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float32))
+        means = np.broadcast_to(cloud.means, (weights.shape[0],) + cloud.means.shape)
+        if cloud.blendshape_deltas is not None:
+            deltas = cloud.blendshape_deltas
+            means = means + (weights @ deltas.reshape(deltas.shape[0], -1)).reshape(means.shape)
+        images = np.empty((weights.shape[0], camera.height, camera.width, 3), dtype=np.float32)
+        for frame, frame_means in enumerate(means):
+            images[frame] = self._rasterize(cloud, frame_means, camera, background)
+        return images
+
+    def _rasterize(self,
+                   cloud: GaussianCloud,
+                   means: np.ndarray,
+                   camera: Camera,
+                   background: Tuple[float, float, float]) -> np.ndarray:
+        projected = self.project(cloud, means, camera)
+        tiles_x = -(-camera.width // self.tile_size)
+        tiles_y = -(-camera.height // self.tile_size)
+        entries, tile_ids = self.bin_tiles(projected, tiles_x, tiles_y)
+        return self.composite(projected, cloud, entries, tile_ids, camera,
+                              tiles_x, tiles_y, np.asarray(background, dtype=np.float32))
+
+    def _world_covariances(self, cloud: GaussianCloud) -> np.ndarray:
+        """Covariances depend only on scales and rotations, so they are cached per cloud."""
+        if self._covariance_source is not cloud:
+            self._covariances = cloud.covariances()
+            self._covariance_source = cloud
+        return self._covariances
+
+    def project(self,
+                cloud: GaussianCloud,
+                means: np.ndarray,
+                camera: Camera) -> Dict[str, np.ndarray]:
+        """Project Gaussians to screen-space conics.
+
+        Args:
+            cloud (GaussianCloud): Scene
+            means (np.ndarray): ``(N, 3)`` possibly deformed centers
+            camera (Camera): Camera
+
+        Returns:
+            Dict[str, np.ndarray]: For the visible Gaussians: ``index`` into the
+            cloud, pixel ``center``, ``conic`` (a, b, c of the inverse 2D
+            covariance), ``radius`` in pixels and camera ``depth``
+        """
+        view = camera.view.astype(np.float32)
+        rotation = view[:3, :3]
+        cam = means @ rotation.T + view[:3, 3]
+        depth = -cam[:, 2]
+        visible = np.flatnonzero((depth > camera.near) & (depth < camera.far))
+        cam, depth = cam[visible], depth[visible]
+
+        fx, fy = camera.focal
+        clip = np.concatenate((cam, np.ones((cam.shape[0], 1), np.float32)), axis=1)
+        clip = clip @ camera.projection.astype(np.float32).T
+        ndc = clip[:, :2] / clip[:, 3:4]
+        center = np.empty_like(ndc)
+        center[:, 0] = (ndc[:, 0] + 1) * 0.5 * camera.width
+        center[:, 1] = (1 - ndc[:, 1]) * 0.5 * camera.height
+
+        # Jacobian of the perspective projection, with the view direction
+        # clamped slightly outside the frustum for stability
+        limit_x = 1.3 * camera.width / (2 * fx)
+        limit_y = 1.3 * camera.height / (2 * fy)
+        tx = np.clip(cam[:, 0] / depth, -limit_x, limit_x) * depth
+        ty = np.clip(cam[:, 1] / depth, -limit_y, limit_y) * depth
+        jacobian = np.zeros((visible.size, 2, 3), dtype=np.float32)
+        jacobian[:, 0, 0] = fx / depth
+        jacobian[:, 0, 2] = fx * tx / depth ** 2
+        jacobian[:, 1, 1] = -fy / depth
+        jacobian[:, 1, 2] = -fy * ty / depth ** 2
+
+        transform = jacobian @ rotation
+        sigma = self._world_covariances(cloud)[visible]
+        cov2d = transform @ sigma @ transform.transpose(0, 2, 1)
+        a = cov2d[:, 0, 0] + 0.3  # Low-pass filter of one pixel
+        b = cov2d[:, 0, 1]
+        c = cov2d[:, 1, 1] + 0.3
+        det = a * c - b * b
+
+        mid = 0.5 * (a + c)
+        largest = mid + np.sqrt(np.maximum(mid * mid - det, 0.1))
+        radius = np.ceil(3.0 * np.sqrt(largest))
+        on_screen = ((det > 0)
+                     & (center[:, 0] + radius > 0) & (center[:, 0] - radius < camera.width)
+                     & (center[:, 1] + radius > 0) & (center[:, 1] - radius < camera.height))
+
+        keep = np.flatnonzero(on_screen)
+        inv_det = 1.0 / det[keep]
+        conic = np.stack((c[keep] * inv_det, -b[keep] * inv_det, a[keep] * inv_det), axis=1)
+        return {
+            "index": visible[keep],
+            "center": center[keep],
+            "conic": conic.astype(np.float32),
+            "radius": radius[keep],
+            "depth": depth[keep],
+        }
+
+    def bin_tiles(self,
+                  projected: Dict[str, np.ndarray],
+                  tiles_x: int,
+                  tiles_y: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign Gaussians to every tile their 3-sigma box touches.
+
+        Args:
+            projected (Dict[str, np.ndarray]): Output of ``project``
+            tiles_x (int): Tile columns
+            tiles_y (int): Tile rows
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Positions into ``projected`` and tile
+            ids of all Gaussian-tile pairs, sorted by tile and then front to back
+        """
+        center, radius = projected["center"], projected["radius"]
+        size = self.tile_size
+        x0 = np.clip(((center[:, 0] - radius) // size).astype(np.int64), 0, tiles_x)
+        x1 = np.clip(((center[:, 0] + radius) // size).astype(np.int64) + 1, 0, tiles_x)
+        y0 = np.clip(((center[:, 1] - radius) // size).astype(np.int64), 0, tiles_y)
+        y1 = np.clip(((center[:, 1] + radius) // size).astype(np.int64) + 1, 0, tiles_y)
+        width = x1 - x0
+        counts = width * (y1 - y0)
+
+        gaussians = np.repeat(np.arange(counts.size), counts)
+        local = np.arange(gaussians.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        tile_ids = ((y0[gaussians] + local // width[gaussians]) * tiles_x
+                    + x0[gaussians] + local % width[gaussians])
+
+        # Depth rank breaks ties within a tile, giving one integer sort key
+        rank = np.empty(counts.size, dtype=np.int64)
+        rank[np.argsort(projected["depth"], kind="stable")] = np.arange(counts.size)
+        order = np.argsort(tile_ids * max(counts.size, 1) + rank[gaussians], kind="stable")
+        return gaussians[order], tile_ids[order]
+
+    def composite(self,
+                  projected: Dict[str, np.ndarray],
+                  cloud: GaussianCloud,
+                  entries: np.ndarray,
+                  tile_ids: np.ndarray,
+                  camera: Camera,
+                  tiles_x: int,
+                  tiles_y: int,
+                  background: np.ndarray) -> np.ndarray:
+        """Alpha-composite the sorted Gaussians of every tile, front to back.
+
+        Returns:
+            np.ndarray: ``(height, width, 3)`` float32 image
+        """
+        size = self.tile_size
+        pixels = size * size
+        num_tiles = tiles_x * tiles_y
+        tiles = np.empty((num_tiles, pixels, 3), dtype=np.float32)
+        tiles[:] = background
+
+        counts = np.bincount(tile_ids, minlength=num_tiles)
+        starts = np.cumsum(counts) - counts
+        occupied = np.flatnonzero(counts)
+        # Tiles of similar load share batches, so few depth steps are wasted
+        occupied = occupied[np.argsort(counts[occupied], kind="stable")]
+
+        offsets = np.stack(np.meshgrid(np.arange(size), np.arange(size)), axis=-1)
+        offsets = offsets.reshape(pixels, 2).astype(np.float32) + 0.5
+
+        center = projected["center"]
+        conic = projected["conic"]
+        colors = cloud.colors[projected["index"]]
+        opacity = cloud.opacities[projected["index"]]
+
+        step = self.DEPTH_STEP
+        batch_size = max(1, self.max_batch_elements // (step * pixels))
+        slot = np.arange(step)
+        for first in range(0, occupied.size, batch_size):
+            batch = occupied[first:first + batch_size]
+            origin = np.stack((batch % tiles_x, batch // tiles_x), axis=1) * size
+            pixel_x = (origin[:, None, 0] + offsets[:, 0]).astype(np.float32)
+            pixel_y = (origin[:, None, 1] + offsets[:, 1]).astype(np.float32)
+            transmittance = np.ones((batch.size, pixels), dtype=np.float32)
+            color = np.zeros((batch.size, pixels, 3), dtype=np.float32)
+
+            active = np.arange(batch.size)
+            for depth in range(0, int(counts[batch[-1]]), step):
+                tile_count = counts[batch[active]]
+                valid = depth + slot < tile_count[:, None]
+                gather = entries[np.where(valid, starts[batch[active]][:, None] + depth + slot, 0)]
+
+                # Gaussian falloff as dx * (a dx + 2 b dy) + c dy^2, built in place
+                dx = pixel_x[active][:, None, :] - center[gather, 0][..., None]
+                dy = pixel_y[active][:, None, :] - center[gather, 1][..., None]
+                k = conic[gather][..., None]
+                power = k[:, :, 0] * dx
+                power += 2 * k[:, :, 1] * dy
+                power *= dx
+                dy *= dy
+                dy *= k[:, :, 2]
+                power += dy
+                power *= -0.5
+                alpha = np.exp(power, out=power)
+                alpha *= opacity[gather][..., None]
+                np.minimum(alpha, self.ALPHA_MAX, out=alpha)
+                alpha[(alpha < self.ALPHA_MIN) | ~valid[..., None]] = 0.0
+
+                # Pixels that are already opaque stop accumulating
+                before = transmittance[active]
+                before[before < self.TRANSMITTANCE_MIN] = 0.0
+                after = np.cumprod(1.0 - alpha, axis=1) * before[:, None, :]
+                weight = alpha
+                weight[:, 0] *= before
+                weight[:, 1:] *= after[:, :-1]
+                color[active] += weight.transpose(0, 2, 1) @ colors[gather]
+                transmittance[active] = after[:, -1]
+
+                remaining = ((tile_count > depth + step)
+                             & (transmittance[active] >= self.TRANSMITTANCE_MIN).any(axis=1))
+                active = active[remaining]
+                if not active.size:
+                    break
+
+            tiles[batch] = color + transmittance[..., None] * background
+
+        image = tiles.reshape(tiles_y, tiles_x, size, size, 3).transpose(0, 2, 1, 3, 4)
+        image = image.reshape(tiles_y * size, tiles_x * size, 3)
+        return np.ascontiguousarray(image[:camera.height, :camera.width])
+
+class CUDARasterizer(RasterizerBackend):
+    """GPU backend using the ``diff_gaussian_rasterization`` CUDA extension.
+
+    Static Gaussian attributes are uploaded once per cloud; only deformed
+    centers change between frames, and they are computed on the device.
+    """
+
+    name = "cuda"
+
+    # OpenGL camera axes to the extension's (x right, y down, z forward)
+    _FLIP = np.diag([1.0, -1.0, -1.0, 1.0])
+
+    def __init__(self, device: str = "cuda"):
+        """Initialize the backend.
+
+        Args:
+            device (str): CUDA device
+
+        Raises:
+            GPUNotFoundError: If CUDA or the rasterization extension is unavailable
+        """
+        import torch
+        try:
+            import diff_gaussian_rasterization
+        except ImportError as e:
+            raise GPUNotFoundError(
+                "CUDA rasterizer requires the diff_gaussian_rasterization package") from e
+        if not torch.cuda.is_available():
+            raise GPUNotFoundError("CUDA GPU not available")
+        self.torch = torch
+        self.extension = diff_gaussian_rasterization
+        self.device = torch.device(device)
+        self._source: Optional[GaussianCloud] = None
+        self._tensors: Dict[str, Any] = {}
+
+    def _upload(self, cloud: GaussianCloud) -> Dict[str, Any]:
+        if self._source is not cloud:
+            def to_device(array: np.ndarray) -> Any:
+                return self.torch.from_numpy(array).to(self.device)
+
+            self._tensors = {
+                "means": to_device(cloud.means),
+                "scales": to_device(cloud.scales),
+                "rotations": to_device(cloud.rotations),
+                "colors": to_device(cloud.colors),
+                "opacities": to_device(cloud.opacities[:, None]),
+                "deltas": (to_device(cloud.blendshape_deltas)
+                           if cloud.blendshape_deltas is not None else None),
+            }
+            self._source = cloud
+        return self._tensors
+
+    def render(self,
+               cloud: GaussianCloud,
+               camera: Camera,
+               weights: Optional[np.ndarray] = None,
+               background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        torch = self.torch
+        tensors = self._upload(cloud)
+        with torch.no_grad():
+            means = tensors["means"]
+            if weights is not None and tensors["deltas"] is not None:
+                w = torch.as_tensor(np.asarray(weights, dtype=np.float32), device=self.device)
+                means = means + torch.tensordot(w, tensors["deltas"], dims=1)
+            image = self._draw(self._rasterizer(camera, background), tensors, means)
+            return image.permute(1, 2, 0).clamp_(0, 1).cpu().numpy()
+
+    def render_batch(self,
+                     cloud: GaussianCloud,
+                     camera: Camera,
+                     weights: np.ndarray,
+                     background: Tuple[float, float, float] = (0.0, 0.0, 0.0)) -> np.ndarray:
+        """Deform the batch in one device matrix product and rasterize it.
+
+        The extension draws one view per call, so frames are queued back to
+        back on the device and copied to the host together with a single
+        synchronization.
+        """
+        torch = self.torch
+        tensors = self._upload(cloud)
+        with torch.no_grad():
+            w = torch.as_tensor(np.atleast_2d(np.asarray(weights, dtype=np.float32)),
+                                device=self.device)
+            means = tensors["means"].expand(w.shape[0], -1, -1)
+            if tensors["deltas"] is not None:
+                deltas = tensors["deltas"]
+                means = means + (w @ deltas.reshape(deltas.shape[0], -1)).reshape(means.shape)
+            rasterizer = self._rasterizer(camera, background)
+            images = torch.stack([self._draw(rasterizer, tensors, frame_means)
+                                  for frame_means in means])
+            return images.permute(0, 2, 3, 1).clamp_(0, 1).cpu().numpy()
+
+    def _rasterizer(self, camera: Camera, background: Tuple[float, float, float]) -> Any:
+        """Extension rasterizer for a camera."""
+        torch = self.torch
+        view = self._FLIP @ camera.view
+        tan_x = camera.width / (2 * camera.focal[0])
+        tan_y = np.tan(camera.fov_y / 2)
+        near, far = camera.near, camera.far
+        projection = np.zeros((4, 4))
+        projection[0, 0] = 1 / tan_x
+        projection[1, 1] = 1 / tan_y
+        projection[2, 2] = far / (far - near)
+        projection[2, 3] = -far * near / (far - near)
+        projection[3, 2] = 1.0
+        # The extension expects row-vector (transposed) matrices
+        view_t = torch.tensor(view.T, dtype=torch.float32, device=self.device)
+        full_t = torch.tensor((projection @ view).T, dtype=torch.float32, device=self.device)
+        campos = torch.tensor(np.linalg.inv(view)[:3, 3], dtype=torch.float32,
+                              device=self.device)
+
+        settings = self.extension.GaussianRasterizationSettings(
+            image_height=camera.height, image_width=camera.width,
+            tanfovx=tan_x, tanfovy=tan_y,
+            bg=torch.tensor(background, dtype=torch.float32, device=self.device),
+            scale_modifier=1.0, viewmatrix=view_t, projmatrix=full_t,
+            sh_degree=0, campos=campos, prefiltered=False, debug=False)
+        return self.extension.GaussianRasterizer(raster_settings=settings)
+
+    def _draw(self, rasterizer: Any, tensors: Dict[str, Any], means: Any) -> Any:
+        """``(3, height, width)`` device image of the cloud with deformed centers."""
+        output = rasterizer(means3D=means,
+                            means2D=self.torch.zeros_like(means),
+                            shs=None,
+                            colors_precomp=tensors["colors"],
+                            opacities=tensors["opacities"],
+                            scales=tensors["scales"],
+                            rotations=tensors["rotations"],
+                            cov3D_precomp=None)
+        return output[0] if isinstance(output, tuple) else output
+
+    def close(self) -> None:
+        self._tensors = {}
+        self._source = None
+        self.torch.cuda.empty_cache()
+
+def create_rasterizer(name: Optional[str] = None) -> RasterizerBackend:
+    """Create a rasterizer backend by name.
+
+    Args:
+        name (Optional[str]): ``"cuda"`` or ``"numpy"``. By default the CUDA
+            backend is used when available, with the NumPy reference as fallback.
+
+    Returns:
+        RasterizerBackend: Backend instance
+
+    Raises:
+        ValueError: If the name is unknown
+        GPUNotFoundError: If the CUDA backend was requested but is unavailable
+    """
+    if name == "numpy":
+        return NumpyRasterizer()
+    if name == "cuda":
+        return CUDARasterizer()
+    if name is not None:
+        raise ValueError(f"Unknown rasterizer backend: {name}")
+    try:
+        return CUDARasterizer()
+    except GPUNotFoundError as e:
+        logger.info(f"Using NumPy reference rasterizer: {e}")
+        return NumpyRasterizer()
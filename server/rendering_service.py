@@ -1,28 +1,101 @@
 import asyncio
 import logging
+import time
+import uuid
 import numpy as np
-import torch
-from typing import AsyncGenerator, Optional, Dict, Any
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import AsyncGenerator, Optional, Dict, Any, List, Tuple
 from .exceptions import *
+from .frame_encoders import EncodedFrame, FrameEncoder, create_encoder
+from .render_backends import Camera, GaussianCloud, RasterizerBackend, create_rasterizer
+from .utils.audio import AudioProcessor
+from .utils.batching import MicroBatcher
+from .utils.checkpoint import load_checkpoint
 from .utils.error_handler import handle_service_errors, validate_model_path, check_gpu
-from .animation.real_time_drivers import FacialAnimationDriver
+from .utils.lazy import lazy_import
+from .utils.lifecycle import ServiceLifecycle
+from .utils.metrics import histogram
+from .animation.blendshapes import BlendshapeTimeline
+
+torch = lazy_import("torch")
 
 logger = logging.getLogger(__name__)
 
+RENDER_FRAME = histogram("render_frame_seconds",
+                         "Rasterization time per frame, batched calls split evenly")
+ENCODE_FRAME = histogram("frame_encode_seconds", "Encoding time per frame")
+
+@dataclass
+class RenderStats:
+    """Frame pacing counters of a rendering session.
+
+    Attributes:
+        frames_rendered: Frames produced by the renderer
+        frames_emitted: Frames yielded to the client, including repeats
+        frames_dropped: Frames skipped or rendered too late to be shown
+        frames_duplicated: Slots filled by repeating the previous frame
+        frames_late: Frames shown after their slot's deadline
+        queue_depth: Rendered frames currently waiting to be emitted
+        max_queue_depth: Highest queue depth observed
+        bytes_emitted: Encoded bytes yielded to the client
+    """
+    frames_rendered: int = 0
+    frames_emitted: int = 0
+    frames_dropped: int = 0
+    frames_duplicated: int = 0
+    frames_late: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    bytes_emitted: int = 0
+
 class RenderingService:
     def __init__(self,
                  model_path: Optional[str] = None,
                  config_path: Optional[str] = None,
                  frame_rate: int = 30,
-                 resolution: tuple = (640, 480)):
+                 resolution: tuple = (640, 480),
+                 audio_sample_rate: int = 22050,
+                 backend: Optional[RasterizerBackend] = None,
+                 camera: Optional[Camera] = None,
+                 render_scale: float = 1.0,
+                 lookahead_frames: int = 3,
+                 codec: str = "raw",
+                 codec_options: Optional[Dict[str, Any]] = None,
+                 encode_workers: int = 2,
+                 max_batch_size: int = 8,
+                 max_batch_wait: float = 0.004,
+                 session_idle_timeout: float = 300.0,
+                 defer_start: bool = False):
         """Initialize the 3D rendering service.
 
+        Models are loaded and warmed up here unless ``defer_start`` is set,
+        in which case construction only validates the configuration and
+        ``start`` brings the service up off the event loop.
+
         Args:
             model_path: Path to 3D Gaussian Splatting model
             config_path: Path to configuration file
             frame_rate: Target frame rate
             resolution: Output resolution (width, height)
+            audio_sample_rate: Default rate of the speech audio driving lip
+                sync, i.e. the TTS output rate
+            backend: Rasterizer. Defaults to the CUDA rasterizer when a GPU
+                is available and the NumPy reference rasterizer otherwise.
+            camera: Camera at full resolution. Defaults to a frontal view of
+                the origin.
+            render_scale: Rendering resolution relative to ``resolution``,
+                e.g. 0.5 for load tests on CPU
+            lookahead_frames: Frames rendered ahead of emission
+            codec: Frame encoding, ``"raw"``, ``"jpeg"`` or ``"delta"``
+            codec_options: Encoder arguments, e.g. ``{"quality": 80}`` for JPEG
+            encode_workers: Threads encoding frames for all sessions
+            max_batch_size: Maximum frames of concurrent sessions rendered in
+                one backend call; 1 renders every frame on its own
+            max_batch_wait: Maximum seconds a frame waits for its batch to fill
+            session_idle_timeout: Seconds after which the counters and encoder
+                state of a session that is not rendering are dropped
+            defer_start: Leave loading and warm-up to ``start``
 
         Raises:
             ModelNotFoundError: If model files not found
@@ -37,18 +110,46 @@ class RenderingService:
             validate_model_path(self.model_path)
             validate_model_path(self.config_path)
             
-            # Check GPU availability and memory
-            check_gpu()
-            
             # Initialize parameters
             self.frame_rate = frame_rate
             self.resolution = resolution
             self.frame_time = 1.0 / frame_rate
+            self.audio_sample_rate = audio_sample_rate
+            self.lookahead_frames = lookahead_frames
+            self.session_stats: Dict[str, RenderStats] = {}
+            self.codec = codec
+            self.codec_options = dict(codec_options or {})
+            self.codec_options.setdefault("pool_size", lookahead_frames + 2)
+            # Each session keeps its own encoder state, e.g. its delta reference
+            self.session_encoders: Dict[str, FrameEncoder] = {}
+            # Sessions not rendering are dropped once idle for this long, so
+            # clients that never call end_session do not leak their state
+            self.session_idle_timeout = session_idle_timeout
+            self._session_last_used: Dict[str, float] = {}
+            self._session_renders: Dict[str, int] = {}
+            create_encoder(self.codec, **self.codec_options)
+            camera = camera or Camera.look_at((0.0, 0.0, 1.0), (0.0, 0.0, 0.0), resolution)
+            self.camera = camera.scaled(render_scale) if render_scale != 1.0 else camera
             
-            # Initialize components
-            self.device = torch.device('cuda')
-            self.animation_driver = FacialAnimationDriver()
-            self._initialize_renderer()
+            # Components are created in the load stage
+            self.backend = backend
+            self.device = None
+            self.animation_driver = None
+            self.cloud = None
+            # Rasterization runs off the event loop, one frame at a time
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+            self.encode_executor = ThreadPoolExecutor(max_workers=encode_workers,
+                                                      thread_name_prefix="encode")
+            # Sessions share the cloud; frames due at the same time are
+            # gathered into one batch while the previous batch renders
+            self.batcher = (MicroBatcher(self._render_batch,
+                                         max_batch_size=max_batch_size,
+                                         max_wait=max_batch_wait,
+                                         max_inflight_batches=1)
+                            if max_batch_size > 1 else None)
+            self.lifecycle = ServiceLifecycle("rendering")
+            if not defer_start:
+                self.lifecycle.run(self._load, self._warm_up)
             
             logger.info("Rendering Service initialized successfully")
             
@@ -56,6 +157,40 @@ class RenderingService:
             logger.error(f"Failed to initialize rendering service: {str(e)}")
             raise ModelLoadError(f"Rendering service initialization failed: {str(e)}") from e
 
+    async def start(self) -> None:
+        """Load and warm up the service on the render thread.
+
+        Raises:
+            ModelLoadError: If model initialization fails
+            GPUError: If GPU initialization or memory check fails
+        """
+        await self.lifecycle.start(self._load, self._warm_up, self.executor)
+
+    def _load(self) -> None:
+        """Create the backend and animation driver and load the avatar."""
+        from .animation.real_time_drivers import FacialAnimationDriver
+        if self.backend is None:
+            self.backend = create_rasterizer()
+        if self.backend.name == "cuda":
+            # Check GPU availability and memory
+            check_gpu()
+        self.device = torch.device('cuda' if self.backend.name == "cuda" else 'cpu')
+        if self.animation_driver is None:
+            self.animation_driver = FacialAnimationDriver(device=str(self.device))
+        self._initialize_renderer()
+
+    def _warm_up(self) -> None:
+        """Animate, render and encode one frame of silence.
+
+        Uploads the cloud to the device, compiles the rasterizer kernels and
+        imports the codec before the first session needs them.
+        """
+        driver_rate = self.animation_driver.feature_extractor.sample_rate
+        timeline = self.animation_driver.process_audio(np.zeros(driver_rate // 2, dtype=np.int16))
+        expressions = timeline.smooth().resample(self.frame_rate, 1)
+        frames = self._rasterize_frames(expressions[0][None])
+        create_encoder(self.codec, **self.codec_options).encode(frames[0]).release()
+
     def _initialize_renderer(self) -> None:
         """Initialize the Gaussian Splatting renderer.
 
@@ -64,105 +199,256 @@ class RenderingService:
             GPUMemoryError: If insufficient GPU memory
         """
         try:
-            # Load model weights
-            checkpoint = torch.load(self.model_path, map_location=self.device)
+            # Load model weights, memory-mapped when a flat checkpoint is available
+            checkpoint = load_checkpoint(self.model_path)
             
             # Initialize renderer components
-            self.gaussians = checkpoint['gaussians'].to(self.device)
-            self.colors = checkpoint['colors'].to(self.device)
-            self.opacities = checkpoint['opacities'].to(self.device)
+            self.cloud = GaussianCloud.from_checkpoint(checkpoint)
             
             # Verify GPU memory
-            available_memory = torch.cuda.get_device_properties(0).total_memory
-            required_memory = sum(tensor.nelement() * tensor.element_size() 
-                                for tensor in [self.gaussians, self.colors, self.opacities])
+            if self.device.type == 'cuda':
+                available_memory = torch.cuda.get_device_properties(0).total_memory
+                required_memory = sum(array.nbytes for array in vars(self.cloud).values()
+                                      if array is not None)
+                
+                if required_memory > available_memory * 0.9:  # 90% threshold
+                    raise GPUMemoryError("Insufficient GPU memory for model")
             
-            if required_memory > available_memory * 0.9:  # 90% threshold
-                raise GPUMemoryError("Insufficient GPU memory for model")
+            logger.info(f"Loaded {len(self.cloud)} Gaussians for the "
+                        f"{self.backend.name} rasterizer")
                 
         except Exception as e:
             logger.error(f"Failed to initialize renderer: {str(e)}")
             raise ModelLoadError(f"Renderer initialization failed: {str(e)}") from e
 
     @handle_service_errors(retries=2)
-    async def render_frames(self, audio_data: bytes) -> AsyncGenerator[bytes, None]:
+    async def render_frames(self,
+                            audio_data: bytes,
+                            sample_rate: Optional[int] = None,
+                            session_id: Optional[str] = None
+                            ) -> AsyncGenerator[memoryview, None]:
         """Generate video frames based on audio input.
 
+        Frames are rendered ahead into a bounded queue while earlier frames
+        are emitted on the frame clock. When rendering falls behind, frames
+        are skipped or repeated so video stays in sync with the audio.
+        Frames are encoded with the session's encoder once they are chosen
+        for emission, so stateful codecs see exactly the frames sent.
+
         Args:
             audio_data: Raw audio data for lip sync
+            sample_rate: Rate of ``audio_data``, defaults to ``audio_sample_rate``
+            session_id: Session whose ``RenderStats`` and encoder state are
+                used and kept for its next call; render one call at a time per
+                session. Without one, the call gets its own state, dropped
+                when it ends.
 
         Yields:
-            bytes: Rendered frame data
+            memoryview: Encoded frame. It may share a pooled buffer and is
+            only valid until the next frame is requested.
 
         Raises:
             ProcessingError: If frame generation fails
             GPUMemoryError: If GPU memory is exceeded
+            ServiceNotReadyError: If the service has not finished starting
         """
+        self.lifecycle.check_ready()
         try:
             # Convert audio to numpy array
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
-            # Get facial expressions from audio
-            expressions = self.animation_driver.process_audio(audio_array)
+            sample_rate = sample_rate or self.audio_sample_rate
             
             # Calculate timing
-            audio_duration = len(audio_array) / 16000  # Assuming 16kHz audio
+            audio_duration = len(audio_array) / sample_rate
             total_frames = int(audio_duration * self.frame_rate)
             
-            frame_start_time = asyncio.get_event_loop().time()
+            # Get facial expressions from audio at the driver's feature rate,
+            # resampled once to the render frame rate
+            driver_rate = self.animation_driver.feature_extractor.sample_rate
+            timeline = self.animation_driver.process_audio(
+                AudioProcessor.convert_sample_rate(audio_array, sample_rate, driver_rate))
+            expressions = timeline.smooth().resample(self.frame_rate, total_frames)
             
-            for frame_idx in range(total_frames):
-                try:
-                    # Get current expression
-                    current_expression = expressions[min(frame_idx, len(expressions) - 1)]
-                    
-                    # Render frame
-                    frame = await self._render_single_frame(current_expression)
-                    
-                    # Convert to bytes
-                    frame_data = frame.tobytes()
-                    
-                    # Maintain frame rate
-                    target_time = frame_start_time + (frame_idx + 1) * self.frame_time
-                    current_time = asyncio.get_event_loop().time()
-                    if current_time < target_time:
-                        await asyncio.sleep(target_time - current_time)
-                    
+            ephemeral = session_id is None
+            if ephemeral:
+                session_id = f"render-{uuid.uuid4().hex}"
+            stats, encoder = self._open_session(session_id)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.lookahead_frames)
+            frame_start_time = asyncio.get_running_loop().time()
+            
+            # Rendering runs ahead of emission in its own task
+            producer = asyncio.ensure_future(
+                self._produce_frames(expressions, frame_start_time, queue, stats))
+            try:
+                async for frame_data in self._schedule_frames(
+                        queue, total_frames, frame_start_time, stats, encoder):
                     yield frame_data
-                    
-                except Exception as e:
-                    logger.error(f"Error rendering frame {frame_idx}: {str(e)}")
-                    raise ProcessingError(f"Frame generation failed: {str(e)}") from e
+            finally:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                stats.queue_depth = 0
+                self._close_session(session_id, ephemeral)
                     
         except Exception as e:
             logger.error(f"Error in render_frames: {str(e)}")
             raise
 
-    async def _render_single_frame(self, expression_params: Dict[str, float]) -> np.ndarray:
+    async def _produce_frames(self,
+                              expressions: BlendshapeTimeline,
+                              start_time: float,
+                              queue: asyncio.Queue,
+                              stats: RenderStats) -> None:
+        """Render frames into the look-ahead queue.
+
+        Frames whose emission slot has already passed are skipped instead of
+        rendered, so a slow frame does not delay every frame after it.
+        """
+        loop = asyncio.get_running_loop()
+        frame_idx = 0
+        try:
+            while frame_idx < len(expressions):
+                due = int((loop.time() - start_time) / self.frame_time)
+                if due > frame_idx:
+                    stats.frames_dropped += min(due, len(expressions)) - frame_idx
+                    frame_idx = due
+                    continue
+                
+                # Get current expression (a view of the timeline buffer)
+                frame = await self._render_single_frame(expressions[frame_idx])
+                stats.frames_rendered += 1
+                await queue.put((frame_idx, frame))
+                stats.queue_depth = queue.qsize()
+                stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+                frame_idx += 1
+            await queue.put((None, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error rendering frame {frame_idx}: {str(e)}")
+            await queue.put((None, e))
+
+    async def _schedule_frames(self,
+                               queue: asyncio.Queue,
+                               total_frames: int,
+                               start_time: float,
+                               stats: RenderStats,
+                               encoder: FrameEncoder) -> AsyncGenerator[memoryview, None]:
+        """Emit one encoded frame per frame period from the look-ahead queue.
+
+        Each slot takes the newest frame rendered for it by its deadline and
+        older ones are dropped. The frame rendered for exactly that slot
+        cannot be superseded, so it is encoded as soon as it arrives rather
+        than at the deadline. A frame that is not ready is waited for up to
+        half a period (counted late); after that the previous frame is
+        repeated (counted duplicated) to keep the video in step with audio.
+        Each emitted frame's buffer goes back to the pool once the next one
+        is requested.
+        """
+        loop = asyncio.get_running_loop()
+        grace = 0.5 * self.frame_time
+        pending = None
+        finished = False
+        last_frame: Optional[EncodedFrame] = None
+        
+        try:
+            for slot in range(total_frames):
+                deadline = start_time + (slot + 1) * self.frame_time
+                current = None
+                late = False
+                while not finished:
+                    if pending is None:
+                        if not queue.empty():
+                            pending = queue.get_nowait()
+                        else:
+                            now = loop.time()
+                            if now < deadline:
+                                # Wait for this slot's frame until the deadline
+                                timeout = deadline - now
+                            elif current is None:
+                                # Wait briefly for the due frame; block if nothing was shown yet
+                                timeout = (None if last_frame is None
+                                           else max(0.0, deadline + grace - now))
+                            else:
+                                break
+                            try:
+                                pending = await asyncio.wait_for(queue.get(), timeout)
+                            except asyncio.TimeoutError:
+                                if now < deadline:
+                                    continue
+                                break
+                        stats.queue_depth = queue.qsize()
+                    
+                    frame_idx, frame = pending
+                    if frame_idx is None:
+                        if frame is not None:
+                            raise ProcessingError(
+                                f"Frame generation failed: {str(frame)}") from frame
+                        finished = True
+                        break
+                    if frame_idx > slot:
+                        break
+                    if current is not None:
+                        stats.frames_dropped += 1
+                    current = frame
+                    late = loop.time() > deadline
+                    pending = None
+                    if frame_idx == slot:
+                        break
+                
+                if current is None:
+                    if last_frame is None:
+                        if finished:
+                            break
+                        # The first frame is for a later slot; nothing to repeat yet
+                        continue
+                    encoded = last_frame
+                    stats.frames_duplicated += 1
+                else:
+                    encoded = await loop.run_in_executor(
+                        self.encode_executor, self._encode_frame, encoder, current)
+                    if late:
+                        stats.frames_late += 1
+                
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                
+                # The client is done with the previous frame once it asks for this one
+                if last_frame is not None and last_frame is not encoded:
+                    last_frame.release()
+                last_frame = encoded
+                stats.frames_emitted += 1
+                stats.bytes_emitted += len(encoded)
+                yield encoded.data
+        finally:
+            if last_frame is not None:
+                last_frame.release()
+
+    async def _render_single_frame(self, expression_params: np.ndarray) -> np.ndarray:
         """Render a single frame with the given expression parameters.
 
+        With batching enabled the frame is rendered together with the frames
+        other sessions need at the same time.
+
         Args:
-            expression_params: Facial expression parameters
+            expression_params: ``(52,)`` blendshape weights in ``BLENDSHAPE_NAMES`` order
 
         Returns:
-            np.ndarray: Rendered frame
+            np.ndarray: ``(height, width, 3)`` uint8 RGB frame
 
         Raises:
             ProcessingError: If rendering fails
             GPUMemoryError: If GPU memory is exceeded
         """
         try:
-            with torch.cuda.amp.autocast():  # Use automatic mixed precision
-                # Apply expression deformation
-                deformed_gaussians = self._apply_expression(expression_params)
-                
-                # Project gaussians to screen space
-                projected = self._project_gaussians(deformed_gaussians)
-                
-                # Render frame
-                frame = self._render_gaussians(projected)
-                
-                return frame.cpu().numpy()
+            if self.batcher is not None:
+                return await self.batcher.submit(expression_params)
+            
+            # Expression deformation, projection and compositing happen in the backend
+            loop = asyncio.get_running_loop()
+            frames = await loop.run_in_executor(
+                self.executor, self._rasterize_frames, expression_params[None])
+            return frames[0]
                 
         except torch.cuda.OutOfMemoryError:
             torch.cuda.empty_cache()
@@ -172,16 +458,100 @@ class RenderingService:
             logger.error(f"Error in single frame rendering: {str(e)}")
             raise ProcessingError(f"Frame rendering failed: {str(e)}") from e
 
+    async def _render_batch(self, batch: List[np.ndarray]) -> List[np.ndarray]:
+        """Render the frames of several sessions in one backend call.
+
+        Args:
+            batch: ``(52,)`` blendshape weights, one per requested frame
+
+        Returns:
+            List[np.ndarray]: ``(height, width, 3)`` uint8 frames in request order
+        """
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(self.executor, self._rasterize_frames, np.stack(batch))
+        return list(frames)
+
+    def _rasterize_frames(self, weights: np.ndarray) -> np.ndarray:
+        """Render ``(B, 52)`` weights to ``(B, height, width, 3)`` uint8 frames."""
+        started = time.perf_counter()
+        frames = self.backend.render_batch(self.cloud, self.camera, weights)
+        
+        # float RGB in [0, 1] to 8-bit
+        frames *= 255.0
+        frames += 0.5
+        frames = frames.astype(np.uint8)
+        count = len(weights)
+        if count:
+            RENDER_FRAME.observe((time.perf_counter() - started) / count, count)
+        return frames
+
+    @staticmethod
+    def _encode_frame(encoder: FrameEncoder, frame: np.ndarray) -> EncodedFrame:
+        """Encode a frame, recording how long it took."""
+        started = time.perf_counter()
+        encoded = encoder.encode(frame)
+        ENCODE_FRAME.observe(time.perf_counter() - started)
+        return encoded
+
+    def _open_session(self, session_id: str) -> Tuple[RenderStats, FrameEncoder]:
+        """Get a session's counters and encoder, creating them if needed."""
+        self._evict_idle_sessions()
+        stats = self.session_stats.setdefault(session_id, RenderStats())
+        encoder = self.session_encoders.get(session_id)
+        if encoder is None:
+            encoder = create_encoder(self.codec, **self.codec_options)
+            self.session_encoders[session_id] = encoder
+        self._session_renders[session_id] = self._session_renders.get(session_id, 0) + 1
+        return stats, encoder
+
+    def _close_session(self, session_id: str, ephemeral: bool) -> None:
+        """Mark the end of a render call, dropping the state of an unnamed session."""
+        self._session_renders[session_id] -= 1
+        if not self._session_renders[session_id]:
+            del self._session_renders[session_id]
+        if ephemeral:
+            self.end_session(session_id)
+        else:
+            self._session_last_used[session_id] = time.monotonic()
+
+    def _evict_idle_sessions(self) -> None:
+        """Drop the state of sessions that have not rendered for the idle timeout."""
+        deadline = time.monotonic() - self.session_idle_timeout
+        idle = [session_id for session_id, last_used in self._session_last_used.items()
+                if last_used < deadline and session_id not in self._session_renders]
+        for session_id in idle:
+            logger.debug(f"Evicting idle rendering session {session_id}")
+            self.end_session(session_id)
+
+    def get_session_stats(self, session_id: str) -> Dict[str, int]:
+        """Frame pacing counters of a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Dict[str, int]: ``RenderStats`` fields, all zero for unknown sessions
+        """
+        return asdict(self.session_stats.get(session_id, RenderStats()))
+
+    def end_session(self, session_id: str) -> None:
+        """Forget a session's counters and encoder state."""
+        self.session_stats.pop(session_id, None)
+        self.session_encoders.pop(session_id, None)
+        self._session_last_used.pop(session_id, None)
+
     async def cleanup(self) -> None:
         """Clean up GPU resources."""
         try:
-            # Clear CUDA cache
-            torch.cuda.empty_cache()
+            self.lifecycle.stop()
+            # Finish batches in flight, then release backend device memory
+            if self.batcher is not None:
+                await self.batcher.close()
+            if self.backend is not None:
+                self.backend.close()
             
             # Reset variables
-            self.gaussians = None
-            self.colors = None
-            self.opacities = None
+            self.cloud = None
             
             logger.info("Rendering service cleaned up successfully")
             
@@ -189,10 +559,14 @@ class RenderingService:
             logger.error(f"Error during cleanup: {str(e)}")
 
     async def reset(self) -> None:
-        """Reset the service state."""
+        """Reset the service state.
+
+        The avatar is reloaded and warmed up off the event loop; the
+        animation driver is kept.
+        """
         try:
             await self.cleanup()
-            self._initialize_renderer()
+            await self.start()
             logger.info("Rendering service reset successfully")
             
         except Exception as e:
@@ -1,20 +1,327 @@
 import asyncio
+import json
 import logging
+import os
+import threading
+import time
+import uuid
 import numpy as np
-from typing import Optional
-from vosk import Model, KaldiRecognizer, SetLogLevel
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (TYPE_CHECKING, Any, AsyncGenerator, AsyncIterable, Callable, Dict, List,
+                    Optional, Tuple, Union)
 from .exceptions import *
+from .utils.audio import AudioProcessor, VADEvent, VADEventType, VoiceActivityDetector
+from .utils.resample import Resampler
 from .utils.error_handler import handle_service_errors, validate_model_path
+from .utils.lazy import lazy_import
+from .utils.lifecycle import ServiceLifecycle
+from .utils.metrics import histogram
+
+if TYPE_CHECKING:
+    from vosk import KaldiRecognizer, Model
+
+vosk = lazy_import("vosk")
 
 logger = logging.getLogger(__name__)
 
+STT_DECODE = histogram("stt_decode_seconds", "Recognizer time per decoding call")
+
+@dataclass
+class TranscriptEvent:
+    """Incremental transcription result emitted while audio is streaming.
+
+    Attributes:
+        text: Recognized text so far (partial) or for the finished segment (final)
+        is_final: True for Vosk ``Result``/``FinalResult``, False for ``PartialResult``
+        result: Decoded Vosk JSON payload
+    """
+    text: str
+    is_final: bool
+    result: Dict[str, Any] = field(default_factory=dict)
+
+class _PoolEntry:
+    """Recognizer leased to a session."""
+    __slots__ = ("recognizer", "lock", "last_used", "in_use")
+
+    def __init__(self, recognizer: "KaldiRecognizer"):
+        self.recognizer = recognizer
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+class RecognizerPool:
+    """Bounded pool of Kaldi recognizers keyed by session.
+
+    All recognizers share one loaded ``Model``. Sessions are evicted when idle
+    for longer than ``idle_timeout`` or, when the pool is full, in LRU order.
+    Released recognizers are ``Reset`` and kept for reuse instead of being
+    reconstructed.
+    """
+
+    def __init__(self,
+                 model: "Model",
+                 sample_rate: int,
+                 max_size: int = 32,
+                 idle_timeout: float = 300.0):
+        """Initialize the recognizer pool.
+
+        Args:
+            model (Model): Shared Vosk model
+            sample_rate (int): Audio sample rate in Hz
+            max_size (int): Maximum number of recognizers alive at once
+            idle_timeout (float): Seconds after which an unused session is evicted
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.model = model
+        self.sample_rate = sample_rate
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._free: List["KaldiRecognizer"] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def acquire(self, session_id: str) -> _PoolEntry:
+        """Lease the recognizer for a session, creating or reusing one if needed.
+
+        The caller must pair every ``acquire`` with ``done``.
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            _PoolEntry: Pool entry holding the session's recognizer
+
+        Raises:
+            ProcessingError: If every recognizer is busy and the pool is full
+            ModelLoadError: If a new recognizer cannot be created
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                if len(self._sessions) >= self.max_size and not self._evict_lru():
+                    raise ProcessingError(
+                        f"Recognizer pool exhausted ({self.max_size} active sessions)")
+                recognizer = self._free.pop() if self._free else self._create_recognizer()
+                entry = _PoolEntry(recognizer)
+                self._sessions[session_id] = entry
+            else:
+                self._sessions.move_to_end(session_id)
+
+            entry.in_use += 1
+            entry.last_used = now
+            return entry
+
+    def done(self, entry: _PoolEntry) -> None:
+        """Return a lease obtained from ``acquire``."""
+        with self._lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+
+    def release(self, session_id: str) -> None:
+        """End a session and keep its recognizer for reuse.
+
+        Args:
+            session_id (str): Session identifier
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._recycle(entry)
+
+    def clear(self) -> None:
+        """Drop all sessions and pooled recognizers."""
+        with self._lock:
+            self._sessions.clear()
+            self._free.clear()
+
+    def _create_recognizer(self) -> "KaldiRecognizer":
+        """Create a recognizer on the shared model."""
+        try:
+            recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
+            recognizer.SetWords(True)
+            return recognizer
+        except Exception as e:
+            raise ModelLoadError(f"Failed to initialize recognizer: {str(e)}") from e
+
+    def _recycle(self, entry: _PoolEntry) -> None:
+        """Reset a recognizer and keep it on the free list. Caller holds the lock."""
+        if entry.in_use:
+            # Still decoding; let it be garbage collected once the lease ends
+            return
+        if len(self._sessions) + len(self._free) >= self.max_size:
+            return
+        # A caller cancelled mid-decode has returned its lease while the
+        # executor still runs the call; recognizers are not thread-safe, so
+        # that one is left to be garbage collected instead of reset
+        if not entry.lock.acquire(blocking=False):
+            return
+        try:
+            entry.recognizer.Reset()
+            self._free.append(entry.recognizer)
+        finally:
+            entry.lock.release()
+
+    def _evict_idle(self, now: float) -> None:
+        """Evict sessions idle for longer than the timeout. Caller holds the lock."""
+        expired = [
+            session_id for session_id, entry in self._sessions.items()
+            if not entry.in_use and now - entry.last_used > self.idle_timeout
+        ]
+        for session_id in expired:
+            logger.debug(f"Evicting idle STT session {session_id}")
+            self._recycle(self._sessions.pop(session_id))
+
+    def _evict_lru(self) -> bool:
+        """Evict the least recently used idle session. Caller holds the lock."""
+        for session_id, entry in self._sessions.items():
+            if not entry.in_use:
+                logger.debug(f"Evicting least recently used STT session {session_id}")
+                self._recycle(self._sessions.pop(session_id))
+                return True
+        return False
+
+class STTStream:
+    """Push-style transcription session for a single audio stream.
+
+    Frames are fed as they arrive from the socket and every call returns the
+    events produced by that frame, so callers can act on partial text while
+    the user is still speaking.
+    """
+
+    def __init__(self,
+                 recognizer: "KaldiRecognizer",
+                 on_close: Optional[Callable[[], None]] = None,
+                 resampler: Optional[Resampler] = None):
+        self.recognizer = recognizer
+        self.closed = False
+        self._on_close = on_close
+        self._resampler = resampler
+        self._last_partial = ""
+        self._remainder = b""
+
+    def feed(self, frame: bytes) -> List[TranscriptEvent]:
+        """Feed a frame of 16-bit PCM audio.
+
+        Args:
+            frame (bytes): Raw audio frame of any length
+
+        Returns:
+            List[TranscriptEvent]: Events triggered by this frame
+
+        Raises:
+            ProcessingError: If the stream is closed or decoding fails
+        """
+        if self.closed:
+            raise ProcessingError("Cannot feed a closed STT stream")
+
+        # Keep sample alignment when the transport splits a sample in two
+        data = self._remainder + frame
+        usable = len(data) - (len(data) % 2)
+        self._remainder = data[usable:]
+        if not usable:
+            return []
+
+        try:
+            data = data[:usable]
+            if self._resampler is not None:
+                data = self._resampler.process(np.frombuffer(data, dtype=np.int16)).tobytes()
+            if self.recognizer.AcceptWaveform(data):
+                event = self._final_event(self.recognizer.Result())
+                return [event] if event else []
+
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+            if partial and partial != self._last_partial:
+                self._last_partial = partial
+                return [TranscriptEvent(text=partial, is_final=False,
+                                        result={"partial": partial})]
+            return []
+
+        except Exception as e:
+            logger.error(f"Error in streaming recognition: {str(e)}")
+            raise ProcessingError(f"Failed to process audio frame: {str(e)}") from e
+
+    def flush(self) -> Optional[TranscriptEvent]:
+        """Finalize the current utterance and keep the stream open.
+
+        Used at endpoints so the next utterance starts from a clean decoder.
+
+        Returns:
+            Optional[TranscriptEvent]: Final event for any pending speech
+        """
+        if self.closed:
+            return None
+        try:
+            self._remainder = b""
+            if self._resampler is not None:
+                self.recognizer.AcceptWaveform(self._resampler.flush().tobytes())
+            return self._final_event(self.recognizer.FinalResult())
+        except Exception as e:
+            logger.error(f"Error finishing STT stream: {str(e)}")
+            raise ProcessingError(f"Failed to finish audio stream: {str(e)}") from e
+
+    def finish(self) -> Optional[TranscriptEvent]:
+        """Flush the recognizer and close the stream.
+
+        Returns:
+            Optional[TranscriptEvent]: Final event for any pending speech
+        """
+        try:
+            return self.flush()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the stream without flushing pending speech."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._on_close:
+            self._on_close()
+
+    def _final_event(self, raw_result: str) -> Optional[TranscriptEvent]:
+        """Build a final event from a Vosk JSON result."""
+        self._last_partial = ""
+        result = json.loads(raw_result) if raw_result else {}
+        text = " ".join(result.get("text", "").split())
+        if not text:
+            return None
+        return TranscriptEvent(text=text, is_final=True, result=result)
+
 class STTService:
-    def __init__(self, model_path: str = "models/stt/vosk-model-small-en-us", sample_rate: int = 16000):
+    def __init__(self,
+                 model_path: str = "models/stt/vosk-model-small-en-us",
+                 sample_rate: int = 16000,
+                 max_sessions: int = 32,
+                 idle_timeout: float = 300.0,
+                 executor: Optional[Executor] = None,
+                 max_workers: Optional[int] = None,
+                 defer_start: bool = False):
         """Initialize Speech-to-Text service.
 
+        The model is loaded and warmed up here unless ``defer_start`` is
+        set, in which case ``start`` does it off the event loop.
+
         Args:
             model_path (str): Path to Vosk model directory
             sample_rate (int): Audio sample rate in Hz
+            max_sessions (int): Maximum number of concurrent recognizer sessions
+            idle_timeout (float): Seconds after which an idle session is evicted
+            executor (Optional[Executor]): Executor used for decoding. Defaults to
+                a thread pool owned by the service.
+            max_workers (Optional[int]): Decoding threads for the default executor
+            defer_start (bool): Leave loading and warm-up to ``start``
 
         Raises:
             ModelNotFoundError: If model files not found
@@ -22,40 +329,111 @@ class STTService:
         """
         try:
             validate_model_path(model_path)
-            SetLogLevel(-1)  # Reduce Vosk logging noise
-            
-            self.model = Model(model_path)
+
+            self.model_path = model_path
             self.sample_rate = sample_rate
             self.min_audio_length = int(0.1 * sample_rate)  # 100ms minimum
-            self.recognizer = None
-            self._initialize_recognizer()
-            
+            self.max_sessions = max_sessions
+            self.idle_timeout = idle_timeout
+            # The model and recognizer pool are created in the load stage
+            self.model: Optional["Model"] = None
+            self.pool: Optional[RecognizerPool] = None
+
+            # Vosk releases the GIL while decoding, so threads scale across cores
+            self._owns_executor = executor is None
+            self.executor = executor or ThreadPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                thread_name_prefix="stt-decode")
+            self.lifecycle = ServiceLifecycle("stt")
+            if not defer_start:
+                self.lifecycle.run(self._load, self._warm_up)
+
             logger.info("STT Service initialized successfully")
-            
+
         except Exception as e:
             raise ModelLoadError(f"Failed to initialize STT service: {str(e)}") from e
 
-    def _initialize_recognizer(self) -> None:
-        """Initialize or reinitialize the speech recognizer."""
+    async def start(self) -> None:
+        """Load and warm up the model on the decoding executor.
+
+        Raises:
+            ModelLoadError: If model initialization fails
+        """
+        await self.lifecycle.start(self._load, self._warm_up, self.executor)
+
+    def _load(self) -> None:
+        """Load the Vosk model and create the recognizer pool."""
+        if self.model is None:
+            vosk.SetLogLevel(-1)  # Reduce Vosk logging noise
+            self.model = vosk.Model(self.model_path)
+        self.pool = RecognizerPool(self.model, self.sample_rate,
+                                   max_size=self.max_sessions,
+                                   idle_timeout=self.idle_timeout)
+
+    def _warm_up(self) -> None:
+        """Decode half a second of silence.
+
+        The recognizer built for it stays in the pool's free list, so the
+        first session does not pay for its construction.
+        """
+        entry = self.pool.acquire("warm-up")
         try:
-            self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
-        except Exception as e:
-            raise ModelLoadError(f"Failed to initialize recognizer: {str(e)}") from e
+            self._decode_utterance(entry.recognizer,
+                                   np.zeros(self.sample_rate // 2, dtype=np.int16))
+        finally:
+            self.pool.done(entry)
+            self.pool.release("warm-up")
+
+    async def _run_decode(self, entry: _PoolEntry, func: Callable, *args) -> Any:
+        """Run a decoding call in the executor while holding the session lock."""
+        def locked_call():
+            with entry.lock, STT_DECODE.time():
+                return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, locked_call)
+
+    @staticmethod
+    def _decode_utterance(recognizer: "KaldiRecognizer", audio_array: np.ndarray) -> List[str]:
+        """Decode a complete utterance. Runs in the decoding executor."""
+        chunk_size = 4096
+        text_results = []
+
+        for i in range(0, len(audio_array), chunk_size):
+            chunk = audio_array[i:i + chunk_size].tobytes()
+
+            if recognizer.AcceptWaveform(chunk):
+                result = recognizer.Result()
+                if result and result.strip():
+                    text_results.append(result)
+
+        # Get final result
+        final_result = recognizer.FinalResult()
+        if final_result and final_result.strip():
+            text_results.append(final_result)
+
+        return text_results
 
     @handle_service_errors(retries=3)
-    async def process_audio(self, audio_data: bytes) -> Optional[str]:
+    async def process_audio(self,
+                            audio_data: bytes,
+                            session_id: Optional[str] = None,
+                            sample_rate: Optional[int] = None) -> Optional[str]:
         """Process audio data and return transcribed text.
 
         Args:
             audio_data (bytes): Raw audio data
+            session_id (Optional[str]): Session whose recognizer to use. A
+                temporary session is used when omitted.
+            sample_rate (Optional[int]): Rate of ``audio_data`` if it differs
+                from the service rate
 
         Returns:
             Optional[str]: Transcribed text if successful, None otherwise
 
         Raises:
             ProcessingError: If audio processing fails
+            ServiceNotReadyError: If the service has not finished starting
         """
+        self.lifecycle.check_ready()
         try:
             if not audio_data:
                 logger.warning("Received empty audio data")
@@ -63,52 +441,196 @@ class STTService:
 
             # Convert audio bytes to numpy array
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
+            if sample_rate:
+                audio_array = AudioProcessor.convert_sample_rate(
+                    audio_array, sample_rate, self.sample_rate)
+
             # Validate audio length
             if len(audio_array) < self.min_audio_length:
                 logger.debug("Audio chunk too short")
                 return None
 
-            # Process audio in chunks
-            chunk_size = 4096
-            text_results = []
-            
-            for i in range(0, len(audio_array), chunk_size):
-                chunk = audio_array[i:i + chunk_size].tobytes()
-                
-                if self.recognizer.AcceptWaveform(chunk):
-                    result = self.recognizer.Result()
-                    if result and result.strip():
-                        text_results.append(result)
-
-            # Get final result
-            final_result = self.recognizer.FinalResult()
-            if final_result and final_result.strip():
-                text_results.append(final_result)
+            transient = session_id is None
+            session_id = session_id or f"utterance-{uuid.uuid4().hex}"
+            entry = self.pool.acquire(session_id)
+            try:
+                text_results = await self._run_decode(
+                    entry, self._decode_utterance, entry.recognizer, audio_array)
+            finally:
+                self.pool.done(entry)
+                if transient:
+                    self.pool.release(session_id)
 
             # Combine and clean results
             if text_results:
                 combined_text = ' '.join(text_results)
                 return ' '.join(combined_text.split())  # Clean extra whitespace
-            
+
             return None
 
+        except ProcessingError:
+            raise
         except Exception as e:
             logger.error(f"Error in audio processing: {str(e)}")
             raise ProcessingError(f"Failed to process audio: {str(e)}") from e
 
+    def _open_stream(self,
+                     session_id: Optional[str],
+                     sample_rate: Optional[int] = None) -> Tuple[STTStream, _PoolEntry]:
+        """Lease a recognizer and wrap it in a stream."""
+        self.lifecycle.check_ready()
+        session_id = session_id or f"stream-{uuid.uuid4().hex}"
+        entry = self.pool.acquire(session_id)
+
+        def on_close():
+            self.pool.done(entry)
+            self.pool.release(session_id)
+
+        resampler = None
+        if sample_rate and sample_rate != self.sample_rate:
+            resampler = Resampler(sample_rate, self.sample_rate)
+        return STTStream(entry.recognizer, on_close=on_close, resampler=resampler), entry
+
+    def create_stream(self,
+                      session_id: Optional[str] = None,
+                      sample_rate: Optional[int] = None) -> STTStream:
+        """Create a streaming transcription session.
+
+        The stream leases the session's recognizer from the pool for its whole
+        lifetime and returns it when closed.
+
+        Args:
+            session_id (Optional[str]): Session identifier. A unique one is
+                generated when omitted.
+            sample_rate (Optional[int]): Rate of the fed audio if it differs
+                from the service rate
+
+        Returns:
+            STTStream: Push-style streaming session
+
+        Raises:
+            ProcessingError: If the recognizer pool is exhausted
+            ModelLoadError: If recognizer creation fails
+            ServiceNotReadyError: If the service has not finished starting
+        """
+        return self._open_stream(session_id, sample_rate)[0]
+
+    async def transcribe_stream(self,
+                                frames: AsyncIterable[bytes],
+                                session_id: Optional[str] = None,
+                                vad: Optional[VoiceActivityDetector] = None,
+                                sample_rate: Optional[int] = None
+                                ) -> AsyncGenerator[Union[TranscriptEvent, VADEvent], None]:
+        """Transcribe audio frames as they arrive.
+
+        When a voice activity detector is given, only audio inside speech
+        segments reaches the recognizer. Each segment is finalized as soon as
+        the detector reports its end, and the detector's ``SPEECH_START`` and
+        ``SPEECH_END`` events are yielded alongside the transcripts.
+
+        Args:
+            frames (AsyncIterable[bytes]): Raw 16-bit PCM frames, e.g. from a socket
+            session_id (Optional[str]): Session identifier
+            vad (Optional[VoiceActivityDetector]): Detector gating the recognizer
+            sample_rate (Optional[int]): Rate of ``frames`` if it differs from
+                the service rate. Audio is resampled before voice detection.
+
+        Yields:
+            Union[TranscriptEvent, VADEvent]: Partial and final results as soon as
+            they are available, and speech boundaries when ``vad`` is set
+
+        Raises:
+            ProcessingError: If audio processing fails
+        """
+        if vad is not None and vad.sample_rate != self.sample_rate:
+            raise ProcessingError(
+                f"VAD sample rate {vad.sample_rate} does not match STT rate {self.sample_rate}")
+
+        if vad is None:
+            stream, entry = self._open_stream(session_id, sample_rate)
+            resampler = None
+        else:
+            # The detector runs at the service rate, so resample ahead of it
+            stream, entry = self._open_stream(session_id)
+            resampler = (Resampler(sample_rate, self.sample_rate)
+                         if sample_rate and sample_rate != self.sample_rate else None)
+        remainder = b""
+        try:
+            async for frame in frames:
+                if not frame:
+                    continue
+                if vad is None:
+                    for event in await self._run_decode(entry, stream.feed, frame):
+                        yield event
+                    continue
+
+                data = remainder + frame
+                usable = len(data) - (len(data) % 2)
+                remainder = data[usable:]
+                samples = np.frombuffer(data[:usable], dtype=np.int16)
+                if resampler is not None:
+                    samples = resampler.process(samples)
+                for vad_event in vad.process(samples):
+                    async for event in self._gate_event(stream, entry, vad_event):
+                        yield event
+
+            if vad is not None:
+                if resampler is not None:
+                    for vad_event in vad.process(resampler.flush()):
+                        async for event in self._gate_event(stream, entry, vad_event):
+                            yield event
+                for vad_event in vad.flush():
+                    async for event in self._gate_event(stream, entry, vad_event):
+                        yield event
+
+            final_event = await self._run_decode(entry, stream.finish)
+            if final_event:
+                yield final_event
+        finally:
+            stream.close()
+
+    async def _gate_event(self,
+                          stream: STTStream,
+                          entry: _PoolEntry,
+                          vad_event: VADEvent
+                          ) -> AsyncGenerator[Union[TranscriptEvent, VADEvent], None]:
+        """Route a voice activity event to the recognizer."""
+        if vad_event.type == VADEventType.SPEECH:
+            for event in await self._run_decode(entry, stream.feed, vad_event.audio.tobytes()):
+                yield event
+            return
+
+        if vad_event.type == VADEventType.SPEECH_END:
+            final_event = await self._run_decode(entry, stream.flush)
+            if final_event:
+                yield final_event
+        yield vad_event
+
+    def end_session(self, session_id: str) -> None:
+        """Release the recognizer held by a session.
+
+        Args:
+            session_id (str): Session identifier
+        """
+        if self.pool is not None:
+            self.pool.release(session_id)
+
     async def cleanup(self) -> None:
         """Clean up resources."""
         try:
-            self.recognizer = None  # Release recognizer
-            # Additional cleanup if needed
+            self.lifecycle.stop()
+            if self.pool is not None:
+                self.pool.clear()  # Release recognizers
+            if self._owns_executor:
+                self.executor.shutdown(wait=False)
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
 
     async def reset(self) -> None:
         """Reset the service state."""
         try:
-            self._initialize_recognizer()
+            if self.pool is not None:
+                self.pool.clear()
             logger.info("STT Service reset successfully")
         except Exception as e:
             logger.error(f"Error resetting STT service: {str(e)}")
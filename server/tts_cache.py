@@ -0,0 +1,222 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import unicodedata
+from typing import Dict, Optional, Union
+
+from .utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+AudioBuffer = Union[bytes, memoryview]
+
+def synthesis_key(text: str,
+                  voice_id: Optional[str],
+                  sample_rate: int,
+                  emotion: Optional[str] = None) -> str:
+    """Content address of a synthesis request.
+
+    Whitespace and Unicode composition are normalized; case and punctuation
+    are kept because they change prosody.
+
+    Args:
+        text (str): Text to synthesize
+        voice_id (Optional[str]): Voice identifier
+        sample_rate (int): Output sample rate in Hz
+        emotion (Optional[str]): Emotion preset
+
+    Returns:
+        str: Hex digest identifying the synthesized audio
+    """
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    payload = json.dumps([normalized, voice_id, sample_rate, emotion])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class DiskAudioStore:
+    """Directory of raw PCM files served through read-only memory maps.
+
+    Mapped pages live in the OS page cache, so they are shared between
+    worker processes and survive restarts.
+    """
+
+    SUFFIX = ".pcm"
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024):
+        """Initialize the store.
+
+        Args:
+            path (str): Cache directory, created if missing
+            max_bytes (int): Size limit; oldest entries are pruned beyond it
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        # Index of entry sizes, oldest first
+        entries = []
+        for entry in os.scandir(path):
+            if entry.name.endswith(self.SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        entries.sort()
+        self._sizes: Dict[str, int] = {key: size for _, key, size in entries}
+        self.nbytes = sum(self._sizes.values())
+
+    def __contains__(self, key: str) -> bool:
+        return self._indexed(key)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key + self.SUFFIX)
+
+    def _indexed(self, key: str) -> bool:
+        """Whether an entry exists, indexing files written by other processes."""
+        if key in self._sizes:
+            return True
+        try:
+            size = os.stat(self._file(key)).st_size
+        except OSError:
+            return False
+        if not size:
+            return False
+        with self._lock:
+            if key not in self._sizes:
+                self._sizes[key] = size
+                self.nbytes += size
+                self._prune()
+            return key in self._sizes
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """Map a stored entry.
+
+        Args:
+            key (str): Entry key
+
+        Returns:
+            Optional[memoryview]: Read-only view of the mapped file, None if absent
+        """
+        if not self._indexed(key):
+            return None
+        try:
+            with open(self._file(key), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable TTS cache entry {key}: {e}")
+            self.delete(key)
+            return None
+        return memoryview(mapped)
+
+    def put(self, key: str, data: AudioBuffer) -> None:
+        """Store an entry atomically.
+
+        Args:
+            key (str): Entry key
+            data (AudioBuffer): Audio bytes
+        """
+        if not len(data) or key in self._sizes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._file(key))
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        with self._lock:
+            self._sizes[key] = len(data)
+            self.nbytes += len(data)
+            self._prune()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            size = self._sizes.pop(key, None)
+            if size is not None:
+                self.nbytes -= size
+        try:
+            os.unlink(self._file(key))
+        except OSError:
+            pass
+
+    def _prune(self) -> None:
+        """Remove the oldest entries over the size limit. Caller holds the lock."""
+        while self.nbytes > self.max_bytes and len(self._sizes) > 1:
+            key = next(iter(self._sizes))
+            self.nbytes -= self._sizes.pop(key)
+            try:
+                # Existing mappings stay valid after unlink
+                os.unlink(self._file(key))
+            except OSError:
+                pass
+
+class SynthesisCache:
+    """Two-tier cache of synthesized audio.
+
+    The memory tier is an LRU bounded by bytes; the optional disk tier holds
+    memory-mapped PCM files. Lookups return zero-copy ``memoryview``s.
+    """
+
+    def __init__(self,
+                 max_memory_bytes: int = 64 * 1024 * 1024,
+                 disk_path: Optional[str] = None,
+                 max_disk_bytes: int = 1024 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_memory_bytes (int): Memory tier size limit
+            disk_path (Optional[str]): Disk tier directory, None to disable it
+            max_disk_bytes (int): Disk tier size limit
+        """
+        self.memory = LRUCache(max_entries=1 << 20,
+                               max_bytes=max_memory_bytes,
+                               sizeof=lambda view: view.nbytes)
+        self.disk = DiskAudioStore(disk_path, max_disk_bytes) if disk_path else None
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """Look up audio, promoting disk hits into memory.
+
+        Args:
+            key (str): Key from ``synthesis_key``
+
+        Returns:
+            Optional[memoryview]: Cached audio, None on a miss
+        """
+        view = self.memory.get(key)
+        if view is not None or self.disk is None:
+            return view
+        view = self.disk.get(key)
+        if view is not None:
+            self.memory.put(key, view)
+        return view
+
+    def put(self, key: str, data: AudioBuffer) -> memoryview:
+        """Store audio in both tiers.
+
+        Args:
+            key (str): Key from ``synthesis_key``
+            data (AudioBuffer): Audio bytes
+
+        Returns:
+            memoryview: Read-only view of the stored audio
+        """
+        view = memoryview(data).toreadonly()
+        if not view.nbytes:
+            return view
+        self.memory.put(key, view)
+        if self.disk is not None:
+            self.disk.put(key, view)
+        return view
+
+    def stats(self) -> Dict[str, int]:
+        """Return memory tier counters and disk occupancy."""
+        stats = self.memory.stats()
+        stats["disk_bytes"] = self.disk.nbytes if self.disk is not None else 0
+        return stats
@@ -1,24 +1,72 @@
 import asyncio
 import logging
 import numpy as np
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncGenerator, Iterable, List, Mapping, Optional, Dict, Any
 from pathlib import Path
 from .exceptions import *
+from .tts_cache import AudioBuffer, SynthesisCache, synthesis_key
+from .utils.checkpoint import load_checkpoint
+from .utils.emotion import EMOTION_PRESETS, apply_emotion
 from .utils.error_handler import handle_service_errors, validate_model_path, check_gpu
+from .utils.lifecycle import ServiceLifecycle
+from .utils.metrics import histogram
+from .utils.text import split_sentences
 
 logger = logging.getLogger(__name__)
 
+TTS_SYNTHESIS = histogram("tts_synthesis_seconds", "Synthesis time of uncached text")
+
+@dataclass
+class AudioChunk:
+    """Fixed-size piece of a synthesized audio stream.
+
+    Attributes:
+        audio: Raw 16-bit PCM samples
+        sample_offset: Position of the first sample in the stream
+        sample_rate: Audio sample rate in Hz
+        sentence_index: Index of the sentence the chunk starts in
+    """
+    audio: AudioBuffer
+    sample_offset: int
+    sample_rate: int
+    sentence_index: int
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.audio) // 2
+
+    @property
+    def timestamp(self) -> float:
+        """Start time of the chunk in seconds."""
+        return self.sample_offset / self.sample_rate
+
 class TTSService:
     def __init__(self,
                  model_path: Optional[str] = None,
                  config_path: Optional[str] = None,
-                 sample_rate: int = 22050):
+                 sample_rate: int = 22050,
+                 synthesis_cache: Optional[SynthesisCache] = None,
+                 require_gpu: bool = True,
+                 defer_start: bool = False,
+                 hedge_after: Optional[float] = None):
         """Initialize Text-to-Speech service.
 
+        The model is loaded and warmed up here unless ``defer_start`` is
+        set, in which case ``start`` does it off the event loop.
+
         Args:
             model_path (Optional[str]): Path to TTS model
             config_path (Optional[str]): Path to configuration file
             sample_rate (int): Audio sample rate in Hz
+            synthesis_cache (Optional[SynthesisCache]): Cache of synthesized
+                audio. Defaults to a 64MB in-memory cache.
+            require_gpu (bool): Fail to load without a suitable CUDA GPU
+            defer_start (bool): Leave loading and warm-up to ``start``
+            hedge_after (Optional[float]): Race a second attempt against
+                ``synthesize`` calls slower than this many seconds. Adds a
+                second synthesis thread, so the model must be thread-safe.
 
         Raises:
             ModelNotFoundError: If model files not found
@@ -29,91 +77,291 @@ class TTSService:
             self.model_path = model_path or "models/tts/coqui_model.pth"
             self.config_path = config_path or "models/tts/config.json"
             self.sample_rate = sample_rate
+            self.require_gpu = require_gpu
+            self.synthesis_cache = (synthesis_cache if synthesis_cache is not None
+                                    else SynthesisCache())
+            self.hedge_after = hedge_after
+            # Model calls are serialized on one thread to keep the loop responsive;
+            # a hedged attempt needs a second one or it would queue behind the first
+            self.executor = ThreadPoolExecutor(max_workers=1 if hedge_after is None else 2,
+                                               thread_name_prefix="tts")
             
             # Validate paths
             validate_model_path(self.model_path)
             validate_model_path(self.config_path)
             
-            # Check GPU
-            check_gpu()
-            
-            # Initialize TTS model
-            self._initialize_model()
+            self._checkpoint: Optional[Mapping] = None
+            self.lifecycle = ServiceLifecycle("tts")
+            if not defer_start:
+                self.lifecycle.run(self._load, self._warm_up)
             
             logger.info("TTS Service initialized successfully")
             
         except Exception as e:
             raise ModelLoadError(f"Failed to initialize TTS service: {str(e)}") from e
 
+    async def start(self) -> None:
+        """Load and warm up the model on the TTS thread.
+
+        Raises:
+            ModelLoadError: If model initialization fails
+            GPUError: If GPU initialization fails
+        """
+        await self.lifecycle.start(self._load, self._warm_up, self.executor)
+
+    def _load(self) -> None:
+        """Check the GPU, initialize the model and map its checkpoint."""
+        if self.require_gpu:
+            check_gpu()
+        self._initialize_model()
+        # Read the weights now rather than on the first request
+        self.checkpoint
+
+    def _warm_up(self) -> None:
+        """Synthesize and color one phrase without touching the synthesis cache."""
+        audio = self._synthesize_audio("Hello there.", None)
+        apply_emotion(np.frombuffer(audio, dtype=np.int16), EMOTION_PRESETS["happy"],
+                      self.sample_rate)
+
     def _initialize_model(self) -> None:
         """Initialize the TTS model."""
         try:
+            # Weights are read through ``checkpoint``, memory-mapped when a
+            # flat checkpoint has been converted next to model_path
+            self._checkpoint = None
             # TODO: Implement actual model initialization
             # For now, we'll use a placeholder
-            pass
         except Exception as e:
             raise ModelLoadError(f"Failed to initialize TTS model: {str(e)}") from e
 
-    @handle_service_errors(retries=2)
-    async def synthesize(self, text: str, voice_id: Optional[str] = None) -> bytes:
+    @property
+    def checkpoint(self) -> Mapping:
+        """Model weights, loaded on first access.
+
+        Raises:
+            ModelLoadError: If the checkpoint cannot be read
+        """
+        if self._checkpoint is None:
+            try:
+                self._checkpoint = load_checkpoint(self.model_path)
+            except Exception as e:
+                raise ModelLoadError(f"Failed to load TTS checkpoint: {str(e)}") from e
+        return self._checkpoint
+
+    @handle_service_errors(retries=2, hedge_after=lambda self, *args, **kwargs: self.hedge_after)
+    async def synthesize(self,
+                         text: str,
+                         voice_id: Optional[str] = None,
+                         emotion: Optional[str] = None,
+                         use_cache: bool = True) -> AudioBuffer:
         """Convert text to speech.
 
+        Identical requests are served from the synthesis cache as zero-copy
+        views of the stored audio.
+
         Args:
             text (str): Text to synthesize
             voice_id (Optional[str]): Specific voice to use
+            emotion (Optional[str]): Emotion to apply to the speech
+            use_cache (bool): Serve and store the audio through the synthesis cache
 
         Returns:
-            bytes: Raw audio data
+            AudioBuffer: Raw audio data
 
         Raises:
             ProcessingError: If synthesis fails
+            ServiceNotReadyError: If the service has not finished starting
         """
+        self.lifecycle.check_ready()
         try:
             if not text:
                 logger.warning("Received empty text")
                 return bytes()
 
-            # TODO: Replace with actual TTS synthesis
-            # For now, generate silent audio
-            duration = len(text) * 0.1  # 100ms per character
-            num_samples = int(self.sample_rate * duration)
-            
-            # Generate silent audio with some noise
-            samples = np.zeros(num_samples, dtype=np.int16)
-            noise = np.random.normal(0, 100, num_samples).astype(np.int16)
-            samples += noise
+            key = synthesis_key(text, voice_id, self.sample_rate, emotion)
+            if use_cache:
+                cached = self.synthesis_cache.get(key)
+                if cached is not None:
+                    return cached
+
+            loop = asyncio.get_running_loop()
+            with TTS_SYNTHESIS.time():
+                audio = await loop.run_in_executor(self.executor, self._synthesize_audio,
+                                                   text, voice_id)
+                if emotion:
+                    audio = await self._apply_emotion(audio, emotion)
 
-            return samples.tobytes()
+            if use_cache:
+                return self.synthesis_cache.put(key, audio)
+            return audio
 
         except Exception as e:
             logger.error(f"Error in speech synthesis: {str(e)}")
             raise ProcessingError(f"Failed to synthesize speech: {str(e)}") from e
 
+    def _synthesize_audio(self, text: str, voice_id: Optional[str]) -> bytes:
+        """Run the TTS model on text.
+
+        Args:
+            text (str): Text to synthesize
+            voice_id (Optional[str]): Specific voice to use
+
+        Returns:
+            bytes: Raw 16-bit PCM audio
+        """
+        # TODO: Replace with actual TTS synthesis
+        # For now, generate silent audio
+        duration = len(text) * 0.1  # 100ms per character
+        num_samples = int(self.sample_rate * duration)
+        
+        # Generate silent audio with some noise
+        samples = np.zeros(num_samples, dtype=np.int16)
+        noise = np.random.normal(0, 100, num_samples).astype(np.int16)
+        samples += noise
+
+        return samples.tobytes()
+
+    async def synthesize_stream(self,
+                                text: str,
+                                voice_id: Optional[str] = None,
+                                emotion: Optional[str] = None,
+                                chunk_samples: int = 2048,
+                                lookahead: int = 2) -> AsyncGenerator[AudioChunk, None]:
+        """Synthesize text sentence by sentence and stream fixed-size chunks.
+
+        The first chunk is yielded as soon as the first sentence is
+        synthesized, while up to ``lookahead`` following sentences are
+        synthesized in the background. All chunks hold ``chunk_samples``
+        samples except the last one.
+
+        Args:
+            text (str): Text to synthesize
+            voice_id (Optional[str]): Specific voice to use
+            emotion (Optional[str]): Emotion to apply to the speech
+            chunk_samples (int): Samples per chunk
+            lookahead (int): Sentences synthesized ahead of the one being streamed
+
+        Yields:
+            AudioChunk: Audio chunks tagged with their sample offsets
+
+        Raises:
+            ProcessingError: If synthesis fails
+        """
+        sentences = split_sentences(text) if text else []
+        chunk_bytes = chunk_samples * 2
+        pending: List[asyncio.Future] = []
+        next_sentence = 0
+        offset = 0
+        carry = b""
+        carry_sentence = 0
+
+        def schedule():
+            nonlocal next_sentence
+            while next_sentence < len(sentences) and len(pending) <= lookahead:
+                pending.append(asyncio.ensure_future(
+                    self.synthesize(sentences[next_sentence], voice_id, emotion)))
+                next_sentence += 1
+
+        try:
+            for index in range(len(sentences)):
+                schedule()
+                audio = memoryview(await pending.pop(0)).cast("B")
+                schedule()
+
+                start = 0
+                if carry:
+                    # Complete the chunk left over from the previous sentence
+                    start = chunk_bytes - len(carry)
+                    carry += audio[:start].tobytes()
+                    if len(carry) < chunk_bytes:
+                        continue
+                    yield AudioChunk(carry, offset, self.sample_rate, carry_sentence)
+                    offset += chunk_samples
+                    carry = b""
+
+                while len(audio) - start >= chunk_bytes:
+                    yield AudioChunk(audio[start:start + chunk_bytes], offset,
+                                     self.sample_rate, index)
+                    offset += chunk_samples
+                    start += chunk_bytes
+
+                if start < len(audio):
+                    carry = audio[start:].tobytes()
+                    carry_sentence = index
+
+            if carry:
+                yield AudioChunk(carry, offset, self.sample_rate, carry_sentence)
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def warm_up(self,
+                      phrases: Iterable[str],
+                      voice_id: Optional[str] = None,
+                      emotion: Optional[str] = None) -> int:
+        """Pre-synthesize phrases into the synthesis cache.
+
+        Args:
+            phrases (Iterable[str]): Phrases to synthesize, e.g. greetings and
+                error messages
+            voice_id (Optional[str]): Voice to synthesize them with
+            emotion (Optional[str]): Emotion to synthesize them with
+
+        Returns:
+            int: Number of phrases that were not cached yet
+        """
+        synthesized = 0
+        for phrase in phrases:
+            key = synthesis_key(phrase, voice_id, self.sample_rate, emotion)
+            if self.synthesis_cache.get(key) is not None:
+                continue
+            await self.synthesize(phrase, voice_id, emotion)
+            synthesized += 1
+        logger.info(f"TTS cache warm-up synthesized {synthesized} phrases")
+        return synthesized
+
     @handle_service_errors(retries=1)
-    async def add_emotion(self, audio_data: bytes, emotion: str) -> bytes:
+    async def add_emotion(self, audio_data: AudioBuffer, emotion: str) -> AudioBuffer:
         """Add emotional qualities to synthesized speech.
 
         Args:
-            audio_data (bytes): Raw audio data
+            audio_data (AudioBuffer): Raw audio data
             emotion (str): Emotion to apply
 
         Returns:
-            bytes: Modified audio data
+            AudioBuffer: Modified audio data
 
         Raises:
             ProcessingError: If emotion processing fails
         """
         try:
-            if not audio_data:
-                return bytes()
-
-            # TODO: Implement actual emotion processing
-            return audio_data
-
+            return await self._apply_emotion(audio_data, emotion)
         except Exception as e:
             logger.error(f"Error adding emotion: {str(e)}")
             raise ProcessingError(f"Failed to add emotion: {str(e)}") from e
 
+    async def _apply_emotion(self, audio_data: AudioBuffer, emotion: str) -> AudioBuffer:
+        """Apply an emotion preset, without error handling of its own.
+
+        ``synthesize`` calls this rather than ``add_emotion`` so that its
+        retries and circuit breaker cover the whole request once.
+        """
+        if not audio_data:
+            return bytes()
+        preset = EMOTION_PRESETS.get(emotion.lower())
+        if preset is None:
+            logger.warning(f"Unknown emotion '{emotion}', returning neutral speech")
+            return audio_data
+        if preset.is_neutral and not preset.gain_db:
+            return audio_data
+
+        samples = np.frombuffer(audio_data, dtype=np.int16)
+        loop = asyncio.get_running_loop()
+        processed = await loop.run_in_executor(
+            self.executor, apply_emotion, samples, preset, self.sample_rate)
+        return processed.tobytes()
+
     async def get_available_voices(self) -> Dict[str, Any]:
         """Get list of available voices.
 
@@ -133,8 +381,10 @@ class TTSService:
     async def cleanup(self) -> None:
         """Clean up resources."""
         try:
+            self.lifecycle.stop()
+            # Unmaps a flat checkpoint once no tensors reference it
+            self._checkpoint = None
             # TODO: Implement actual cleanup
-            pass
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
 
@@ -142,7 +392,7 @@ class TTSService:
         """Reset the service state."""
         try:
             await self.cleanup()
-            self._initialize_model()
+            await self.start()
             logger.info("TTS Service reset successfully")
         except Exception as e:
             logger.error(f"Error resetting TTS service: {str(e)}")
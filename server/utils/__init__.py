@@ -1,3 +1,16 @@
-from .audio import AudioProcessor
+from .audio import AudioProcessor, VADEvent, VADEventType, VoiceActivityDetector
 from .video import VideoProcessor
-from .transforms import Transform3D
\ No newline at end of file
+from .transforms import Transform3D
+from .text import SentenceChunker, normalize_text, split_sentences
+from .cache import LRUCache
+from .batching import MicroBatcher
+from .resample import Resampler, resample
+from .features import MelSpectrogram, hann_window, mel_filterbank
+from .emotion import EMOTION_PRESETS, EmotionPreset, EmotionProcessor, apply_emotion
+from .buffers import BufferPool
+from .checkpoint import FlatCheckpoint, convert_checkpoint, load_checkpoint, save_checkpoint
+from .lazy import LazyModule, lazy_import
+from .lifecycle import ServiceLifecycle, ServiceState, readiness
+from .metrics import Counter, Histogram, MetricsRegistry, REGISTRY, counter, histogram
+from .resilience import (CircuitBreaker, CircuitState, backoff_delay, circuit_breaker, deadline,
+                         hedged, time_remaining)
@@ -1,17 +1,28 @@
 import numpy as np
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from .features import MelSpectrogram
+from .resample import resample
 
 class AudioProcessor:
     def __init__(self, sample_rate: int = 16000):
         self.sample_rate = sample_rate
         self.window_size = 512
         self.hop_length = 256
+        self.mel = MelSpectrogram(sample_rate, self.window_size, self.hop_length)
 
     def extract_features(self, audio: np.ndarray) -> np.ndarray:
-        """Extract audio features (e.g., mel spectrogram)."""
-        # TODO: Implement actual feature extraction
-        features = np.zeros((128, len(audio) // self.hop_length))
-        return features
+        """Extract the log-mel spectrogram of a clip.
+
+        Args:
+            audio (np.ndarray): int16 or float samples
+
+        Returns:
+            np.ndarray: ``(128, len(audio) // hop_length)`` float32 features
+        """
+        return self.mel.transform(audio).T
 
     @staticmethod
     def normalize_audio(audio: np.ndarray) -> np.ndarray:
@@ -24,6 +35,212 @@ class AudioProcessor:
     def convert_sample_rate(audio: np.ndarray, 
                            src_rate: int, 
                            target_rate: int) -> np.ndarray:
-        """Convert audio sample rate."""
-        # TODO: Implement actual resampling
-        return audio
\ No newline at end of file
+        """Convert audio sample rate with a polyphase resampler.
+
+        Use ``Resampler`` from ``server.utils.resample`` for streams.
+
+        Args:
+            audio (np.ndarray): int16 or float samples
+            src_rate (int): Input sample rate in Hz
+            target_rate (int): Output sample rate in Hz
+
+        Returns:
+            np.ndarray: Resampled audio in the input dtype
+        """
+        return resample(audio, src_rate, target_rate)
+
+class VADEventType(Enum):
+    SPEECH_START = "speech_start"
+    SPEECH = "speech"
+    SPEECH_END = "speech_end"
+
+@dataclass
+class VADEvent:
+    """Voice activity event.
+
+    Attributes:
+        type: Event type
+        sample_index: Stream position in samples where the event applies
+        audio: Speech samples for ``SPEECH`` events, None otherwise
+    """
+    type: VADEventType
+    sample_index: int
+    audio: Optional[np.ndarray] = None
+
+    def timestamp(self, sample_rate: int) -> float:
+        """Event position in seconds from the start of the stream."""
+        return self.sample_index / sample_rate
+
+class VoiceActivityDetector:
+    """Frame-based voice activity detector and endpointer.
+
+    Frames are classified in bulk from their log energy and zero-crossing
+    rate. Speech starts after ``min_speech_ms`` of consecutive voiced frames
+    and ends after ``trailing_silence_ms`` of consecutive unvoiced frames, so
+    short pauses inside an utterance are bridged. Only audio inside speech
+    segments (plus a short pre-roll) is passed on.
+    """
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_ms: int = 20,
+                 energy_threshold_db: float = -45.0,
+                 snr_margin_db: float = 10.0,
+                 zcr_threshold: float = 0.35,
+                 min_speech_ms: int = 60,
+                 trailing_silence_ms: int = 500,
+                 pre_roll_ms: int = 200):
+        """Initialize the detector.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            frame_ms (int): Analysis frame length in milliseconds
+            energy_threshold_db (float): Minimum frame energy for speech in dBFS
+            snr_margin_db (float): Required margin above the tracked noise floor
+            zcr_threshold (float): Maximum zero-crossing rate for voiced frames
+            min_speech_ms (int): Voiced duration needed to start a segment
+            trailing_silence_ms (int): Silence duration that ends a segment
+            pre_roll_ms (int): Audio kept before the detected speech onset
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold_db = energy_threshold_db
+        self.snr_margin_db = snr_margin_db
+        self.zcr_threshold = zcr_threshold
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.end_silence_frames = max(1, int(round(trailing_silence_ms / frame_ms)))
+        self.pre_roll_frames = int(round(pre_roll_ms / frame_ms))
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        self.in_speech = False
+        self.noise_floor_db = -60.0
+        self._position = 0  # Samples consumed as whole frames
+        self._last_end = 0
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._history = np.zeros(0, dtype=np.int16)
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def classify_frames(self, frames: np.ndarray) -> np.ndarray:
+        """Classify frames as voiced or not.
+
+        Args:
+            frames (np.ndarray): ``(n_frames, frame_length)`` int16 samples
+
+        Returns:
+            np.ndarray: Boolean voiced mask per frame
+        """
+        x = frames.astype(np.float32) * (1.0 / 32768.0)
+        energy_db = 10.0 * np.log10(np.einsum('ij,ij->i', x, x) / x.shape[1] + 1e-10)
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (x.shape[1] - 1)
+
+        threshold = max(self.energy_threshold_db, self.noise_floor_db + self.snr_margin_db)
+        voiced = (energy_db > threshold) & (zcr < self.zcr_threshold)
+
+        # Track the noise floor from frames that look like background
+        background = energy_db[~voiced]
+        if background.size:
+            self.noise_floor_db += 0.1 * (float(np.median(background)) - self.noise_floor_db)
+        return voiced
+
+    @staticmethod
+    def _run_lengths(mask: np.ndarray, carry: int) -> np.ndarray:
+        """Length of the run of True values ending at each position."""
+        idx = np.arange(1, mask.size + 1)
+        last_false = np.maximum.accumulate(np.where(mask, 0, idx))
+        runs = idx - last_false
+        # Runs that started in a previous chunk continue from the carry
+        runs[last_false == 0] += carry
+        return runs
+
+    def process(self, audio: np.ndarray) -> List[VADEvent]:
+        """Process a chunk of 16-bit audio.
+
+        Args:
+            audio (np.ndarray): int16 samples of any length
+
+        Returns:
+            List[VADEvent]: Ordered ``SPEECH_START``, ``SPEECH`` and ``SPEECH_END`` events
+        """
+        samples = np.concatenate((self._remainder, np.asarray(audio, dtype=np.int16)))
+        n_frames = samples.size // self.frame_length
+        used = n_frames * self.frame_length
+        self._remainder = samples[used:]
+        if n_frames == 0:
+            return []
+
+        samples = samples[:used]
+        frames = samples.reshape(n_frames, self.frame_length)
+        voiced = self.classify_frames(frames)
+
+        speech_runs = self._run_lengths(voiced, self._speech_run)
+        silence_runs = self._run_lengths(~voiced, self._silence_run)
+        self._speech_run = int(speech_runs[-1]) if voiced[-1] else 0
+        self._silence_run = int(silence_runs[-1]) if not voiced[-1] else 0
+
+        # Threshold crossings are candidate transitions; repeated candidates of
+        # the same kind are no-ops for the state machine and are dropped
+        starts = np.flatnonzero(speech_runs == self.min_speech_frames)
+        ends = np.flatnonzero(silence_runs == self.end_silence_frames)
+        positions = np.concatenate((starts, ends))
+        kinds = np.concatenate((np.ones(starts.size, bool), np.zeros(ends.size, bool)))
+        order = np.argsort(positions, kind='stable')
+        positions, kinds = positions[order], kinds[order]
+        previous = np.concatenate(([self.in_speech], kinds[:-1]))
+        keep = kinds != previous
+        positions, kinds = positions[keep], kinds[keep]
+
+        events = []
+        segment_start = 0 if self.in_speech else None
+        frame_len = self.frame_length
+
+        for frame_idx, is_start in zip(positions.tolist(), kinds.tolist()):
+            if is_start:
+                onset = self._position + (frame_idx - self.min_speech_frames + 1) * frame_len
+                first = max(onset - self.pre_roll_frames * frame_len,
+                            self._last_end, self._position - self._history.size)
+                events.append(VADEvent(VADEventType.SPEECH_START, onset))
+                if first < self._position:
+                    # Pre-roll reaches back into the previous chunk
+                    events.append(VADEvent(VADEventType.SPEECH, first,
+                                           self._history[first - self._position:]))
+                    first = self._position
+                segment_start = (first - self._position) // frame_len
+            else:
+                stop = frame_idx + 1
+                if stop > segment_start:
+                    events.append(VADEvent(VADEventType.SPEECH,
+                                           self._position + segment_start * frame_len,
+                                           samples[segment_start * frame_len:stop * frame_len]))
+                self._last_end = self._position + stop * frame_len
+                events.append(VADEvent(VADEventType.SPEECH_END, self._last_end))
+                segment_start = None
+            self.in_speech = is_start
+
+        if segment_start is not None and segment_start < n_frames:
+            events.append(VADEvent(VADEventType.SPEECH,
+                                   self._position + segment_start * frame_len,
+                                   samples[segment_start * frame_len:]))
+
+        keep_samples = (self.pre_roll_frames + self.min_speech_frames) * frame_len
+        self._history = np.concatenate((self._history, samples))[-keep_samples:]
+        self._position += used
+        return events
+
+    def flush(self) -> List[VADEvent]:
+        """End the stream, closing any open speech segment.
+
+        Returns:
+            List[VADEvent]: Remaining events
+        """
+        events = []
+        if self.in_speech:
+            if self._remainder.size:
+                events.append(VADEvent(VADEventType.SPEECH, self._position, self._remainder))
+            events.append(VADEvent(VADEventType.SPEECH_END,
+                                   self._position + self._remainder.size))
+        self.reset()
+        return events
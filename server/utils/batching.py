@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for a batch handler.
+
+    A batch is dispatched when it reaches ``max_batch_size`` or when
+    ``max_wait`` seconds have passed since its first request arrived.
+    While ``max_inflight_batches`` batches are running, new requests queue
+    up and are collected once one of them finishes. Results are fanned back
+    out to the waiting callers. Cancelling a caller only drops its own
+    request: if the batch has not been dispatched yet the request is left
+    out, otherwise its result is discarded.
+    """
+
+    def __init__(self,
+                 handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 8,
+                 max_wait: float = 0.01,
+                 max_inflight_batches: int = 2):
+        """Initialize the batcher.
+
+        Args:
+            handler (Callable[[List[Any]], Awaitable[List[Any]]]): Coroutine function
+                mapping a list of requests to a list of results in the same order.
+                A result that is an ``Exception`` instance is raised to its caller.
+            max_batch_size (int): Maximum requests per batch
+            max_wait (float): Maximum seconds a request waits for its batch to fill
+            max_inflight_batches (int): Batches dispatched concurrently
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches_dispatched = 0
+        self.requests_dispatched = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._max_inflight_batches = max_inflight_batches
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of requests per dispatched batch."""
+        if not self.batches_dispatched:
+            return 0.0
+        return self.requests_dispatched / self.batches_dispatched
+
+    async def submit(self, request: Any) -> Any:
+        """Submit a request and wait for its result.
+
+        Args:
+            request (Any): Request passed to the handler as part of a batch
+
+        Returns:
+            Any: Result for this request
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the worker and wait for dispatched batches to finish."""
+        if self._loop is not asyncio.get_running_loop():
+            # Tasks of a previous loop cannot be awaited from this one
+            self._reset()
+            return
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+    def _reset(self) -> None:
+        """Forget the queue, slots and tasks bound to the previous event loop."""
+        self._loop = None
+        self._queue = None
+        self._slots = None
+        self._worker = None
+        self._inflight = set()
+
+    def _ensure_worker(self) -> None:
+        """Start the collector task on first use and after a loop change."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and tasks are bound to the loop they were used on; a
+            # worker left on a closed loop would never run again
+            self._reset()
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_inflight_batches)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._collect(self._queue, self._slots))
+
+    async def _collect(self, queue: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        """Group queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Requests arriving while every slot is busy join the next batch
+            await slots.acquire()
+            batch = []
+            try:
+                batch.append(await queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Requests whose callers gave up are left out of the batch
+                batch = [(request, future) for request, future in batch if not future.done()]
+                if not batch:
+                    slots.release()
+                    continue
+            except asyncio.CancelledError:
+                slots.release()
+                for _, future in batch:
+                    future.cancel()
+                raise
+
+            task = loop.create_task(self._dispatch(batch, slots))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self,
+                        batch: List[Tuple[Any, asyncio.Future]],
+                        slots: asyncio.Semaphore) -> None:
+        """Run the handler on a batch and resolve the waiting futures."""
+        try:
+            self.batches_dispatched += 1
+            self.requests_dispatched += len(batch)
+            try:
+                results = await self.handler([request for request, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch handler returned {len(results)} results for {len(batch)} requests")
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} requests failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            slots.release()
@@ -0,0 +1,49 @@
+import threading
+from typing import List
+
+class BufferPool:
+    """Thread-safe free list of equally sized bytearrays.
+
+    Buffers are handed out by ``acquire`` and come back through
+    ``release``. A pool never blocks: when every buffer is in use a new one
+    is allocated, and at most ``max_buffers`` are kept for reuse.
+    """
+
+    def __init__(self, buffer_size: int, max_buffers: int = 8):
+        """Initialize the pool.
+
+        Args:
+            buffer_size (int): Size of every buffer in bytes
+            max_buffers (int): Free buffers kept for reuse
+        """
+        self.buffer_size = buffer_size
+        self.max_buffers = max_buffers
+        self.allocations = 0
+        self.reuses = 0
+        self._free: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of free buffers."""
+        return len(self._free)
+
+    def acquire(self) -> bytearray:
+        """Take a free buffer, allocating one if none is available.
+
+        Returns:
+            bytearray: Buffer of ``buffer_size`` bytes with undefined contents
+        """
+        with self._lock:
+            if self._free:
+                self.reuses += 1
+                return self._free.pop()
+            self.allocations += 1
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer obtained from ``acquire``."""
+        if len(buffer) != self.buffer_size:
+            raise ValueError(f"Expected a {self.buffer_size} byte buffer, got {len(buffer)}")
+        with self._lock:
+            if len(self._free) < self.max_buffers:
+                self._free.append(buffer)
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL and size bound.
+
+    Entries are evicted in least recently used order once ``max_entries`` or,
+    when a ``sizeof`` function is given, ``max_bytes`` is exceeded. Expired
+    entries are dropped lazily on access.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries
+            ttl (Optional[float]): Entry lifetime in seconds, None for no expiry
+            max_bytes (Optional[int]): Maximum total size reported by ``sizeof``
+            sizeof (Optional[Callable[[Any], int]]): Size of a value in bytes
+            on_evict (Optional[Callable[[Hashable, Any], None]]): Called with the
+                key and value of entries evicted for space
+        """
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes requires a sizeof function")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # key -> (value, expiry, size)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry, time.monotonic())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it as recently used.
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: Cached value or ``default``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, time.monotonic()):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting older entries as needed.
+
+        Values larger than ``max_bytes`` are not stored.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+        """
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expiry = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expiry, size)
+            self.nbytes += size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    async def get_or_set(self,
+                         key: Hashable,
+                         factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Get a value, computing it once on a miss.
+
+        Concurrent callers missing on the same key share a single call to
+        ``factory``; cancelling one waiter does not cancel the computation
+        for the others.
+
+        Args:
+            key (Hashable): Cache key
+            factory (Callable[[], Awaitable[Any]]): Coroutine function producing the value
+
+        Returns:
+            Any: Cached or computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+
+            def done(fut: asyncio.Future):
+                self._inflight.pop(key, None)
+                if not fut.cancelled() and fut.exception() is None:
+                    self.put(key, fut.result())
+            future.add_done_callback(done)
+
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expired(self, entry: tuple, now: float) -> bool:
+        expiry = entry[1]
+        return expiry is not None and now >= expiry
+
+    def _remove(self, key: Hashable) -> tuple:
+        """Remove an entry. Caller holds the lock."""
+        entry = self._entries.pop(key)
+        self.nbytes -= entry[2]
+        return entry
+
+    def _evict(self) -> None:
+        """Evict least recently used entries over the limits. Caller holds the lock."""
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            key = next(iter(self._entries))
+            value = self._remove(key)[0]
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(key, value)
@@ -0,0 +1,244 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import numpy as np
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PXTENSOR"
+ALIGNMENT = 64
+FLAT_SUFFIX = ".tensors"
+
+_PREFIX = struct.Struct("<8sQ")
+# Stored as uint16 and reinterpreted, since NumPy has no bfloat16
+_BFLOAT16 = "bfloat16"
+
+PathLike = Union[str, os.PathLike]
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+class FlatCheckpoint(Mapping):
+    """Memory-mapped flat checkpoint.
+
+    The file is laid out like safetensors, with every tensor aligned for
+    direct mapping: the 8 byte ``MAGIC``, the uint64 little-endian size of
+    a JSON header, the header, and the raw little-endian tensors. The
+    header maps names to ``dtype``, ``shape`` and ``offset`` relative to the
+    data, which starts on an ``ALIGNMENT`` boundary as does every tensor.
+
+    Opening reads only the header and maps the file copy-on-write. Tensor
+    pages are faulted in on first access and shared through the page cache
+    with every process that maps the same file. Indexing returns arrays
+    backed by the mapping; writes to them stay private to the process.
+    """
+
+    def __init__(self, path: PathLike):
+        """Map a checkpoint file.
+
+        Args:
+            path (PathLike): Flat checkpoint path
+
+        Raises:
+            ValueError: If the file is not a flat checkpoint
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            magic, length = _PREFIX.unpack(file.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a flat checkpoint")
+            header = json.loads(file.read(length))
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._data_start = _align(_PREFIX.size + length)
+        self._entries: Dict[str, Dict[str, Any]] = header["tensors"]
+        self.metadata: Dict[str, Any] = header.get("metadata", {})
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            entry = self._entries[name]
+            dtype = np.dtype("<u2" if entry["dtype"] == _BFLOAT16 else entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                                  offset=self._data_start + entry["offset"])
+            array = array.reshape(entry["shape"])
+            self._arrays[name] = array
+        return array
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the mapped file."""
+        return len(self._mmap)
+
+    def dtype(self, name: str) -> str:
+        """Stored dtype name of a tensor, e.g. ``"float32"`` or ``"bfloat16"``."""
+        return self._entries[name]["dtype"]
+
+    def tensor(self, name: str) -> Any:
+        """A tensor as a ``torch.Tensor`` sharing the mapped memory."""
+        import torch
+        tensor = torch.from_numpy(self[name])
+        if self.dtype(name) == _BFLOAT16:
+            tensor = tensor.view(torch.bfloat16)
+        return tensor
+
+    def state_dict(self, prefix: str = "") -> Dict[str, Any]:
+        """Tensors whose names start with ``prefix``, keyed without it.
+
+        Args:
+            prefix (str): Name prefix, e.g. ``"model."`` for a nested state dict
+
+        Returns:
+            Dict[str, Any]: ``torch.Tensor`` values sharing the mapped memory
+        """
+        return {name[len(prefix):]: self.tensor(name)
+                for name in self._entries if name.startswith(prefix)}
+
+def _flatten(values: Mapping,
+             prefix: str,
+             tensors: Dict[str, Any],
+             metadata: Dict[str, Any]) -> None:
+    """Split a nested checkpoint into dotted tensor names and JSON metadata."""
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            _flatten(value, f"{name}.", tensors, metadata)
+        elif isinstance(value, np.ndarray) or hasattr(value, "detach"):
+            tensors[name] = value
+        else:
+            try:
+                json.dumps(value)
+            except TypeError:
+                logger.warning(f"Skipping {name}: {type(value).__name__} is not a tensor "
+                               f"or JSON value")
+                continue
+            metadata[name] = value
+
+def save_checkpoint(tensors: Mapping,
+                    path: PathLike,
+                    metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Write tensors as a flat checkpoint.
+
+    Nested mappings are flattened to dotted names; values that are neither
+    tensors nor arrays are stored in the metadata when JSON serializable.
+
+    Args:
+        tensors (Mapping): Names to ``torch.Tensor`` or ``np.ndarray`` values
+        path (PathLike): Output path
+        metadata (Optional[Dict[str, Any]]): Extra JSON metadata
+    """
+    flat: Dict[str, Any] = {}
+    metadata = dict(metadata or {})
+    _flatten(tensors, "", flat, metadata)
+
+    arrays: Dict[str, np.ndarray] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, value in flat.items():
+        dtype = None
+        if hasattr(value, "detach"):
+            value = value.detach().cpu()
+            if str(value.dtype) == "torch.bfloat16":
+                import torch
+                value, dtype = value.view(torch.int16), _BFLOAT16
+            value = value.numpy()
+        array = np.require(value, requirements="C")
+        array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        arrays[name] = array
+        entries[name] = {"dtype": dtype or array.dtype.name, "shape": list(array.shape),
+                         "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({"tensors": entries, "metadata": metadata}).encode()
+    header += b" " * (_align(_PREFIX.size + len(header)) - _PREFIX.size - len(header))
+    path = Path(path)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, len(header)))
+        file.write(header)
+        start = file.tell()
+        for name, array in arrays.items():
+            file.seek(start + entries[name]["offset"])
+            file.write(array.data)
+        file.truncate(start + offset)
+    # Readers never see a partly written file
+    os.replace(partial, path)
+
+def is_flat_checkpoint(path: PathLike) -> bool:
+    """Whether a file starts with the flat checkpoint magic."""
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def flat_path(path: PathLike) -> Path:
+    """Path of the flat checkpoint converted from ``path``."""
+    return Path(path).with_suffix(FLAT_SUFFIX)
+
+def convert_checkpoint(source: PathLike, destination: Optional[PathLike] = None) -> Path:
+    """Convert a ``torch.save`` checkpoint to a flat checkpoint.
+
+    Args:
+        source (PathLike): ``.pth`` file holding a (possibly nested) dict of tensors
+        destination (Optional[PathLike]): Output path, by default ``source``
+            with the ``.tensors`` suffix
+
+    Returns:
+        Path: Path of the flat checkpoint
+    """
+    import torch
+    destination = Path(destination) if destination is not None else flat_path(source)
+    checkpoint = torch.load(source, map_location="cpu")
+    if not isinstance(checkpoint, Mapping):
+        raise ValueError(f"{source} does not hold a dict of tensors")
+    save_checkpoint(checkpoint, destination, {"source": Path(source).name})
+    logger.info(f"Converted {source} to {destination}")
+    return destination
+
+def load_checkpoint(path: PathLike, map_location: Any = "cpu") -> Mapping:
+    """Load a checkpoint, memory-mapping it when possible.
+
+    A flat checkpoint is mapped lazily. For a ``.pth`` path, a flat
+    checkpoint converted next to it is used when it is at least as new;
+    otherwise the file is read with ``torch.load``.
+
+    Args:
+        path (PathLike): Checkpoint path
+        map_location (Any): Device for ``torch.load`` of ``.pth`` files
+
+    Returns:
+        Mapping: ``FlatCheckpoint`` of arrays, or the ``torch.load`` result
+    """
+    if is_flat_checkpoint(path):
+        return FlatCheckpoint(path)
+    converted = flat_path(path)
+    if (converted.exists() and is_flat_checkpoint(converted)
+            and converted.stat().st_mtime >= Path(path).stat().st_mtime):
+        return FlatCheckpoint(converted)
+    import torch
+    return torch.load(path, map_location=map_location)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Convert ``.pth`` checkpoints given on the command line."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert .pth checkpoints to flat checkpoints")
+    parser.add_argument("sources", nargs="+", help=".pth files")
+    args = parser.parse_args(argv)
+    for source in args.sources:
+        print(convert_checkpoint(source))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+from .features import hann_window
+
+@dataclass(frozen=True)
+class EmotionPreset:
+    """Prosody modifications applied for an emotion.
+
+    Attributes:
+        gain_db: Overall gain in dB
+        pitch_semitones: Pitch shift with duration preserved
+        tempo: Speaking rate factor with pitch preserved (>1 is faster)
+        tilt_db_per_octave: Spectral tilt around 1 kHz (>0 is brighter)
+        tremolo_hz: Rate of the amplitude modulation
+        tremolo_depth: Depth of the amplitude modulation (0-1)
+    """
+    gain_db: float = 0.0
+    pitch_semitones: float = 0.0
+    tempo: float = 1.0
+    tilt_db_per_octave: float = 0.0
+    tremolo_hz: float = 0.0
+    tremolo_depth: float = 0.0
+
+    @property
+    def is_neutral(self) -> bool:
+        return self == EmotionPreset(gain_db=self.gain_db)
+
+EMOTION_PRESETS: Dict[str, EmotionPreset] = {
+    "neutral": EmotionPreset(),
+    "happy": EmotionPreset(gain_db=1.5, pitch_semitones=1.5, tempo=1.06, tilt_db_per_octave=1.5),
+    "excited": EmotionPreset(gain_db=3.0, pitch_semitones=2.5, tempo=1.12, tilt_db_per_octave=2.0),
+    "sad": EmotionPreset(gain_db=-3.0, pitch_semitones=-1.5, tempo=0.9, tilt_db_per_octave=-2.5,
+                         tremolo_hz=5.0, tremolo_depth=0.05),
+    "angry": EmotionPreset(gain_db=4.0, pitch_semitones=0.5, tempo=1.05, tilt_db_per_octave=3.0),
+    "calm": EmotionPreset(gain_db=-1.5, pitch_semitones=-0.5, tempo=0.94, tilt_db_per_octave=-1.5),
+    "fearful": EmotionPreset(pitch_semitones=1.0, tempo=1.08, tilt_db_per_octave=0.5,
+                             tremolo_hz=6.0, tremolo_depth=0.08),
+}
+
+class PhaseVocoder:
+    """Streaming phase vocoder for time stretching and spectral shaping.
+
+    Frames are analysed every ``hop / stretch`` samples and resynthesized
+    every ``hop`` samples, with phases propagated from the instantaneous
+    frequency of every bin. All frames of a chunk are processed at once.
+    """
+
+    def __init__(self,
+                 stretch: float = 1.0,
+                 spectral_gain: Optional[np.ndarray] = None,
+                 frame_size: int = 512,
+                 overlap: int = 4):
+        """Initialize the vocoder.
+
+        Args:
+            stretch (float): Output duration / input duration
+            spectral_gain (Optional[np.ndarray]): Per-bin magnitude gain
+            frame_size (int): FFT frame size
+            overlap (int): Frames overlapping each output sample
+        """
+        self.frame_size = frame_size
+        self.overlap = overlap
+        self.hop = frame_size // overlap
+        self.stretch = stretch
+        self.analysis_hop = self.hop / stretch
+        self.spectral_gain = spectral_gain
+
+        self.window = hann_window(frame_size)
+        # Hann analysis and synthesis windows sum to 3/8 * overlap per sample
+        self.norm = np.float32(1.0 / (0.375 * overlap))
+        bins = np.arange(frame_size // 2 + 1)
+        self.bin_omega = (2 * np.pi * bins / frame_size).astype(np.float32)
+        self._bin_index = np.arange(frame_size // 2 + 1, dtype=np.int16)
+        self._row_offsets = np.zeros((0, 1), dtype=np.int64)
+        self._frames = np.empty((0, frame_size), dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        # Leading padding so the first samples get full overlap
+        self._pad = self.frame_size - self.hop
+        self._buffer = np.zeros(self._pad, dtype=np.float32)
+        self._position = 0.0
+        self._prev_start = None
+        self._prev_phase = None
+        self._synth_phase = None
+        self._tail = np.zeros((self.overlap - 1, self.hop), dtype=np.float32)
+        self._skip = int(round(self._pad * self.stretch))
+
+    def _scratch(self, count: int) -> np.ndarray:
+        """Preallocated frame buffer, grown only when a larger chunk arrives."""
+        if self._frames.shape[0] < count:
+            rows = max(count, 2 * self._frames.shape[0])
+            self._frames = np.empty((rows, self.frame_size), dtype=np.float32)
+            self._row_offsets = np.arange(rows)[:, None] * self._bin_index.size
+        return self._frames[:count]
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Process a chunk of float32 audio.
+
+        Args:
+            x (np.ndarray): Input samples
+
+        Returns:
+            np.ndarray: Output samples completed by this chunk
+        """
+        buffer = np.concatenate((self._buffer, x)) if self._buffer.size else x
+        available = buffer.size - self.frame_size - self._position
+        count = int(available // self.analysis_hop) + 1 if available >= 0 else 0
+        if count == 0:
+            self._buffer = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        starts = (self._position + np.arange(count) * self.analysis_hop).astype(np.int64)
+        frames = self._scratch(count)
+        np.multiply(np.lib.stride_tricks.sliding_window_view(buffer, self.frame_size)[starts],
+                    self.window, out=frames)
+        spectrum = np.fft.rfft(frames, axis=1)
+        magnitude = np.abs(spectrum)
+        phase = np.angle(spectrum)
+
+        # Instantaneous frequency from the phase advance between analysis frames
+        hops = np.empty(count, dtype=np.float32)
+        hops[1:] = starts[1:] - starts[:-1]
+        if self._prev_phase is None:
+            previous = np.concatenate((phase[:1], phase[:-1]))
+            hops[0] = self.analysis_hop
+        else:
+            previous = np.concatenate((self._prev_phase[None], phase[:-1]))
+            hops[0] = starts[0] - self._prev_start
+        expected = self.bin_omega[None] * hops[:, None]
+        deviation = phase - previous - expected
+        deviation -= np.float32(2 * np.pi) * np.round(deviation * np.float32(1 / (2 * np.pi)))
+        advance = (self.bin_omega[None] + deviation / hops[:, None]) * self.hop
+
+        if self._synth_phase is None:
+            advance[0] = phase[0]
+            synth_phase = np.cumsum(advance, axis=0)
+        else:
+            synth_phase = self._synth_phase + np.cumsum(advance, axis=0)
+
+        # Identity phase locking: bins follow the phase of their nearest peak,
+        # which keeps partials coherent and avoids the usual phasiness
+        output_phase = self._lock_phases(magnitude, phase, synth_phase)
+
+        if self.spectral_gain is not None:
+            magnitude *= self.spectral_gain
+        # Rebuild the spectrum in place; complex exp is several times slower
+        spectrum.real = magnitude * np.cos(output_phase)
+        spectrum.imag = magnitude * np.sin(output_phase)
+        output_frames = np.fft.irfft(spectrum, n=self.frame_size, axis=1).astype(np.float32)
+        output_frames *= self.window * self.norm
+
+        # Overlap-add: every frame spans `overlap` blocks of `hop` samples
+        blocks = output_frames.reshape(count, self.overlap, self.hop)
+        output = np.zeros((count + self.overlap - 1, self.hop), dtype=np.float32)
+        output[:self.overlap - 1] += self._tail
+        for q in range(self.overlap):
+            output[q:q + count] += blocks[:, q]
+        self._tail = output[count:].copy()
+
+        self._prev_phase = phase[-1]
+        # Wrap the carried phase so float32 precision does not degrade over time
+        self._synth_phase = np.mod(synth_phase[-1], np.float32(2 * np.pi))
+        self._position += count * self.analysis_hop
+        consumed = int(self._position)
+        self._prev_start = starts[-1] - consumed
+        self._position -= consumed
+        self._buffer = buffer[consumed:].copy()
+
+        result = output[:count].reshape(-1)
+        if self._skip:
+            skipped = min(self._skip, result.size)
+            self._skip -= skipped
+            result = result[skipped:]
+        return result
+
+    def _lock_phases(self,
+                     magnitude: np.ndarray,
+                     phase: np.ndarray,
+                     synth_phase: np.ndarray) -> np.ndarray:
+        """Lock the phase of every bin to its nearest spectral peak."""
+        count, bins = magnitude.shape
+        peaks = np.zeros(magnitude.shape, dtype=bool)
+        peaks[:, 1:-1] = ((magnitude[:, 1:-1] > magnitude[:, :-2]) &
+                          (magnitude[:, 1:-1] >= magnitude[:, 2:]))
+        index = self._bin_index
+        previous = np.maximum.accumulate(np.where(peaks, index, np.int16(-bins)), axis=1)
+        following = np.minimum.accumulate(
+            np.where(peaks, index, np.int16(2 * bins))[:, ::-1], axis=1)[:, ::-1]
+        nearest = np.where(index - previous <= following - index, previous, following)
+        # Frames without any peak keep their own phases
+        nearest = np.where((nearest >= 0) & (nearest < bins), nearest, index)
+
+        flat = nearest + self._row_offsets[:count]
+        shift = synth_phase - phase
+        return phase + shift.take(flat)
+
+    def flush(self) -> np.ndarray:
+        """Process the remaining input and return the final samples."""
+        result = self.process(np.zeros(self.frame_size, dtype=np.float32))
+        self.reset()
+        return result
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler for arbitrary ratios."""
+
+    def __init__(self, ratio: float):
+        """Initialize the resampler.
+
+        Args:
+            ratio (float): Input samples consumed per output sample
+        """
+        self.ratio = ratio
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        self._previous = np.zeros(1, dtype=np.float32)
+        self._position = 1.0  # Next read position; index 0 is the previous sample
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Resample a chunk of float32 audio."""
+        if x.size == 0:
+            return x
+        extended = np.concatenate((self._previous, x))
+        count = int(np.ceil((extended.size - 1 - self._position) / self.ratio))
+        count = max(count, 0)
+        positions = self._position + np.arange(count) * self.ratio
+        index = positions.astype(np.int64)
+        frac = (positions - index).astype(np.float32)
+        result = extended[index] * (1 - frac) + extended[index + 1] * frac
+
+        self._position += count * self.ratio - x.size
+        self._previous = x[-1:].copy()
+        return result
+
+class EmotionProcessor:
+    """Apply an emotion preset to streamed audio.
+
+    Chunks of int16 or float32 audio are processed with state carried across
+    calls; the output keeps the input dtype. Pitch is shifted by time
+    stretching followed by resampling, tempo by time stretching alone, and
+    spectral tilt is applied to the vocoder spectrum. A gain envelope with
+    optional tremolo is applied last.
+    """
+
+    def __init__(self,
+                 preset: Union[str, EmotionPreset],
+                 sample_rate: int = 22050,
+                 frame_size: int = 512,
+                 ramp_ms: float = 20.0):
+        """Initialize the processor.
+
+        Args:
+            preset (Union[str, EmotionPreset]): Preset or name in ``EMOTION_PRESETS``
+            sample_rate (int): Audio sample rate in Hz
+            frame_size (int): Vocoder frame size
+            ramp_ms (float): Gain ramp duration when the preset changes
+
+        Raises:
+            KeyError: If the preset name is unknown
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.ramp_samples = max(1, int(sample_rate * ramp_ms / 1000))
+        self._scratch = np.empty(0, dtype=np.float32)
+        self._tremolo_phase = 0.0
+        self._gain = None
+        self.set_preset(preset)
+
+    def set_preset(self, preset: Union[str, EmotionPreset]) -> None:
+        """Switch presets. The gain ramps to the new level without a click."""
+        if isinstance(preset, str):
+            preset = EMOTION_PRESETS[preset]
+        self.preset = preset
+        self.target_gain = float(10 ** (preset.gain_db / 20))
+        if self._gain is None:
+            self._gain = self.target_gain
+
+        pitch_ratio = 2 ** (preset.pitch_semitones / 12)
+        spectral_gain = None
+        if preset.tilt_db_per_octave:
+            freqs = np.fft.rfftfreq(self.frame_size, 1 / self.sample_rate)
+            octaves = np.log2(np.maximum(freqs, 50.0) / 1000.0)
+            spectral_gain = np.clip(10 ** (preset.tilt_db_per_octave * octaves / 20), 0.05, 8.0)
+
+        needs_vocoder = (pitch_ratio != 1 or preset.tempo != 1 or spectral_gain is not None)
+        self.vocoder = (PhaseVocoder(stretch=pitch_ratio / preset.tempo,
+                                     spectral_gain=spectral_gain,
+                                     frame_size=self.frame_size)
+                        if needs_vocoder else None)
+        self.resampler = LinearResampler(pitch_ratio) if pitch_ratio != 1 else None
+
+    def _to_float(self, audio: np.ndarray) -> np.ndarray:
+        """Convert input to float32 in a reused scratch buffer."""
+        if self._scratch.size < audio.size:
+            self._scratch = np.empty(audio.size, dtype=np.float32)
+        x = self._scratch[:audio.size]
+        if audio.dtype == np.int16:
+            np.multiply(audio, np.float32(1.0 / 32768.0), out=x)
+        else:
+            x[:] = audio
+        return x
+
+    def _apply_gain(self, y: np.ndarray) -> np.ndarray:
+        """Apply the gain ramp, tremolo and clipping in place."""
+        if y.size == 0:
+            return y
+        if self._gain != self.target_gain:
+            steps = min(self.ramp_samples, y.size)
+            y[:steps] *= np.linspace(self._gain, self.target_gain, steps, dtype=np.float32)
+            y[steps:] *= self.target_gain
+            if steps == self.ramp_samples:
+                self._gain = self.target_gain
+            else:
+                self._gain += (self.target_gain - self._gain) * steps / self.ramp_samples
+        elif self.target_gain != 1.0:
+            y *= np.float32(self.target_gain)
+
+        if self.preset.tremolo_depth:
+            step = 2 * np.pi * self.preset.tremolo_hz / self.sample_rate
+            phases = self._tremolo_phase + step * np.arange(y.size, dtype=np.float32)
+            y *= 1 - self.preset.tremolo_depth * (0.5 + 0.5 * np.sin(phases))
+            self._tremolo_phase = float((self._tremolo_phase + step * y.size) % (2 * np.pi))
+
+        np.clip(y, -1.0, 1.0, out=y)
+        return y
+
+    def _finish(self, y: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        y = self._apply_gain(y)
+        if dtype == np.int16:
+            return (y * 32767.0).astype(np.int16)
+        return y.astype(dtype, copy=False)
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Process a chunk of audio.
+
+        Args:
+            audio (np.ndarray): int16 or float32 samples
+
+        Returns:
+            np.ndarray: Processed samples in the input dtype
+        """
+        x = self._to_float(np.asarray(audio))
+        y = x
+        if self.vocoder is not None:
+            y = self.vocoder.process(x)
+        if self.resampler is not None:
+            y = self.resampler.process(y)
+        if y is x:
+            # Keep the scratch buffer reusable
+            y = x.copy()
+        return self._finish(y, audio.dtype)
+
+    def flush(self, dtype: np.dtype = np.int16) -> np.ndarray:
+        """Return the samples still held by the vocoder and reset it.
+
+        Args:
+            dtype (np.dtype): Output dtype
+
+        Returns:
+            np.ndarray: Remaining samples
+        """
+        if self.vocoder is None:
+            return np.zeros(0, dtype=dtype)
+        y = self.vocoder.flush()
+        if self.resampler is not None:
+            y = self.resampler.process(y)
+            self.resampler.reset()
+        return self._finish(y, np.dtype(dtype))
+
+def apply_emotion(audio: np.ndarray,
+                  preset: Union[str, EmotionPreset],
+                  sample_rate: int = 22050) -> np.ndarray:
+    """Apply an emotion preset to a complete clip.
+
+    Args:
+        audio (np.ndarray): int16 or float32 samples
+        preset (Union[str, EmotionPreset]): Preset or preset name
+        sample_rate (int): Audio sample rate in Hz
+
+    Returns:
+        np.ndarray: Processed samples in the input dtype
+    """
+    processor = EmotionProcessor(preset, sample_rate=sample_rate)
+    head = processor.process(audio)
+    tail = processor.flush(audio.dtype)
+    return np.concatenate((head, tail)) if tail.size else head
@@ -1,40 +1,334 @@
+import asyncio
+import inspect
 import logging
 import os
+import time
 from functools import wraps
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Union
 from ..exceptions import *
+from .metrics import counter, histogram
+from .resilience import (CircuitState, backoff_delay, circuit_breaker, deadline, deadline_at,
+                         expiry, hedged, no_deadline, time_remaining)
 
 logger = logging.getLogger(__name__)
 
-def handle_service_errors(retries: int = 3, backup_handler: Optional[Callable] = None):
-    """Decorator for handling service errors with retries."""
+# Returned by an attempt loop when the backup should answer instead
+_FALL_BACK = object()
+
+# Errors that say nothing about the health of the service itself
+_CALLER_ERRORS = (ValueError, TypeError)
+_NOT_SERVING_ERRORS = (ServiceNotReadyError, CircuitOpenError)
+
+def _counts_against_breaker(error: BaseException) -> bool:
+    """Whether an error should count as a failure of the service.
+
+    Caller mistakes do not, and neither do rejections by a service that is
+    still starting or by the open circuit of a nested call, even when they
+    were wrapped in another error on the way up.
+    """
+    if isinstance(error, _CALLER_ERRORS):
+        return False
+    while error is not None:
+        if isinstance(error, _NOT_SERVING_ERRORS):
+            return False
+        error = error.__cause__
+    return True
+
+def handle_service_errors(retries: int = 3,
+                          backup_handler: Optional[Callable] = None,
+                          timeout: Optional[float] = None,
+                          backoff: float = 0.05,
+                          max_backoff: float = 1.0,
+                          service: Optional[str] = None,
+                          failure_threshold: int = 5,
+                          reset_timeout: float = 30.0,
+                          hedge_after: Union[float, Callable[..., Optional[float]], None] = None):
+    """Decorator for handling service errors with retries.
+
+    Retries wait with jittered exponential backoff. A call runs within the
+    caller's ``deadline`` budget, narrowed to ``timeout`` when given, and
+    fails with ``DeadlineExceededError`` once the budget is spent; no retry
+    is started that could not finish within it. Calls that fail, after
+    their retries, count against the circuit breaker of the function.
+    Cancelled calls, ``ValueError`` and ``TypeError``, and errors caused by
+    ``ServiceNotReadyError`` or by the open circuit of a nested call count
+    neither way and are not retried. While the circuit is open, calls go
+    straight to ``backup_handler`` or fail with ``CircuitOpenError``. GPU
+    errors and exhausted budgets also fall back to ``backup_handler``,
+    which runs without a budget.
+
+    Async generator functions are supported. They are retried only until
+    their first item has been yielded, since output cannot be taken back.
+    The budget bounds the wait for the first item; producing the later
+    items is not timed out but still sees the budget, so the calls the
+    generator makes are bounded by it. The consumer of the items does not
+    run within the budget.
+
+    Every call is counted in ``service_calls_total`` by outcome (success,
+    fallback or error), with retries and caught errors in
+    ``service_retries_total`` and ``service_errors_total``, all labelled
+    with the function's qualified name. The duration of coroutine calls,
+    retries included, is recorded in ``service_call_seconds``.
+
+    Args:
+        retries (int): Attempts per call
+        backup_handler (Optional[Callable]): Called with the same arguments
+            when the service cannot answer
+        timeout (Optional[float]): Seconds each call may take, retries included
+        backoff (float): Upper bound of the first retry delay in seconds
+        max_backoff (float): Largest upper bound of a retry delay in seconds
+        service (Optional[str]): Circuit breaker to use, by default one per
+            decorated function. Functions sharing a name share a breaker.
+        failure_threshold (int): Consecutive failed calls that open the circuit
+        reset_timeout (float): Seconds before an open circuit lets a trial call through
+        hedge_after (Union[float, Callable[..., Optional[float]], None]): Start
+            a second attempt of a coroutine call that has not finished after
+            this many seconds and use whichever finishes first. A callable is
+            given the call's arguments and returns the delay, or None to not
+            hedge. Only for idempotent calls.
+    """
     def decorator(func):
+        function = func.__qualname__
+        breaker = circuit_breaker(service or function,
+                                  failure_threshold=failure_threshold,
+                                  reset_timeout=reset_timeout)
+        succeeded = counter("service_calls_total", "Calls by outcome",
+                            function=function, outcome="success")
+        fell_back = counter("service_calls_total", function=function, outcome="fallback")
+        failed = counter("service_calls_total", function=function, outcome="error")
+        retried = counter("service_retries_total", "Attempts repeated after an error",
+                          function=function)
+        hedges = counter("service_hedges_total", "Second attempts started for slow calls",
+                         function=function)
+        duration = histogram("service_call_seconds", "Call duration including retries",
+                             function=function)
+
+        def record_error(error: Exception) -> None:
+            counter("service_errors_total", "Errors caught, by type",
+                    function=function, error=type(error).__name__).inc()
+
+        def rejection() -> CircuitOpenError:
+            error = CircuitOpenError(f"{breaker.name} circuit is open")
+            record_error(error)
+            return error
+
+        def record_outcome(error: Exception) -> None:
+            """Count a call that failed for good against the breaker if it should."""
+            if _counts_against_breaker(error):
+                breaker.record_failure()
+
+        def out_of_budget() -> DeadlineExceededError:
+            return DeadlineExceededError(f"{function} ran out of its time budget")
+
+        async def wait_to_retry(attempt: int) -> bool:
+            """Back off before a retry, unless the budget would run out first."""
+            delay = backoff_delay(attempt, backoff, max_backoff)
+            remaining = time_remaining()
+            if remaining is not None and delay >= remaining:
+                return False
+            await asyncio.sleep(delay)
+            retried.inc()
+            return True
+
+        if inspect.isasyncgenfunction(func):
+            async def next_item(items, expires: Optional[float], bounded: bool):
+                """Produce the next item within the budget, timed out if ``bounded``."""
+                with deadline_at(expires):
+                    remaining = time_remaining()
+                    if not bounded or remaining is None:
+                        return await items.__anext__()
+                    try:
+                        return await asyncio.wait_for(items.__anext__(), remaining)
+                    except asyncio.TimeoutError:
+                        raise out_of_budget() from None
+
+            async def relay(items, expires: Optional[float]):
+                """Yield the items of a generator, timing out only the first."""
+                try:
+                    started = False
+                    while True:
+                        try:
+                            item = await next_item(items, expires, bounded=not started)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        yield item
+                finally:
+                    await items.aclose()
+
+            async def fall_back(*args, **kwargs):
+                fell_back.inc()
+                async for item in relay(backup_handler(*args, **kwargs), None):
+                    yield item
+
+            @wraps(func)
+            async def generator_wrapper(*args, **kwargs):
+                if not breaker.allow():
+                    error = rejection()
+                    if backup_handler:
+                        async for item in fall_back(*args, **kwargs):
+                            yield item
+                        return
+                    failed.inc()
+                    raise error
+
+                expires = expiry(timeout)
+                trial = breaker.state is CircuitState.HALF_OPEN
+                try:
+                    last_error = None
+                    for attempt in range(retries):
+                        if attempt:
+                            with deadline_at(expires):
+                                if not await wait_to_retry(attempt):
+                                    break
+                        started = False
+                        stream = relay(func(*args, **kwargs), expires)
+                        try:
+                            async for item in stream:
+                                started = True
+                                yield item
+                            succeeded.inc()
+                            breaker.record_success()
+                            return
+                        except ModelError as e:
+                            logger.error(f"Model error: {e}")
+                            record_error(e)
+                            breaker.record_failure()
+                            if backup_handler and not started:
+                                async for item in fall_back(*args, **kwargs):
+                                    yield item
+                                return
+                            failed.inc()
+                            raise
+                        except (GPUError, ProcessingError, DeadlineExceededError) as e:
+                            record_error(e)
+                            if started or not _counts_against_breaker(e):
+                                logger.error(f"{type(e).__name__} after output started: {e}"
+                                             if started else f"{type(e).__name__}: {e}")
+                                record_outcome(e)
+                                failed.inc()
+                                raise
+                            logger.warning(
+                                f"{type(e).__name__} (attempt {attempt + 1}/{retries}): {e}")
+                            last_error = e
+                            if isinstance(e, DeadlineExceededError):
+                                break
+                        except Exception as e:
+                            logger.error(f"Unexpected error: {e}")
+                            record_error(e)
+                            record_outcome(e)
+                            failed.inc()
+                            raise
+                        finally:
+                            # Also when the consumer closes the stream early
+                            await stream.aclose()
+
+                    if last_error:
+                        breaker.record_failure()
+                        if isinstance(last_error, (GPUError, DeadlineExceededError)) \
+                                and backup_handler:
+                            async for item in fall_back(*args, **kwargs):
+                                yield item
+                            return
+                        failed.inc()
+                        raise last_error
+                finally:
+                    # A trial closed early or cancelled has no outcome
+                    if trial:
+                        breaker.release()
+            return generator_wrapper
+
+        async def attempt_call(*args, **kwargs):
+            """Run one attempt, hedged if configured, within the remaining budget."""
+            delay = hedge_after(*args, **kwargs) if callable(hedge_after) else hedge_after
+            if delay is None:
+                awaitable = func(*args, **kwargs)
+            else:
+                awaitable = hedged(lambda: func(*args, **kwargs), delay, hedges.inc)
+            remaining = time_remaining()
+            if remaining is None:
+                return await awaitable
+            try:
+                return await asyncio.wait_for(awaitable, remaining)
+            except asyncio.TimeoutError:
+                raise out_of_budget() from None
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with deadline(timeout):
+                    result = await call(*args, **kwargs)
+                if result is _FALL_BACK:
+                    fell_back.inc()
+                    # The budget may be what ran out, so the backup gets none
+                    with no_deadline():
+                        return await backup_handler(*args, **kwargs)
+                return result
+            finally:
+                duration.observe(time.perf_counter() - started)
+
+        async def call(*args, **kwargs):
+            """Result of the call, or ``_FALL_BACK`` when the backup should answer."""
+            if not breaker.allow():
+                error = rejection()
+                if backup_handler:
+                    return _FALL_BACK
+                failed.inc()
+                raise error
+
+            trial = breaker.state is CircuitState.HALF_OPEN
+            try:
+                return await attempt_all(*args, **kwargs)
+            finally:
+                # A cancelled trial, or one rejected for reasons other than
+                # the service's health, has no outcome
+                if trial:
+                    breaker.release()
+
+        async def attempt_all(*args, **kwargs):
             last_error = None
             for attempt in range(retries):
+                if attempt and not await wait_to_retry(attempt):
+                    break
                 try:
-                    return await func(*args, **kwargs)
+                    result = await attempt_call(*args, **kwargs)
+                    succeeded.inc()
+                    breaker.record_success()
+                    return result
                 except ModelError as e:
                     logger.error(f"Model error: {e}")
+                    record_error(e)
+                    breaker.record_failure()
                     if backup_handler:
-                        return await backup_handler(*args, **kwargs)
+                        return _FALL_BACK
+                    failed.inc()
                     raise
-                except GPUError as e:
-                    logger.error(f"GPU error: {e}")
-                    if attempt == retries - 1:
-                        if backup_handler:
-                            return await backup_handler(*args, **kwargs)
+                except DeadlineExceededError as e:
+                    logger.warning(f"Deadline exceeded (attempt {attempt + 1}/{retries}): {e}")
+                    record_error(e)
+                    last_error = e
+                    break
+                except (GPUError, ProcessingError) as e:
+                    record_error(e)
+                    if not _counts_against_breaker(e):
+                        logger.error(f"{type(e).__name__}: {e}")
+                        failed.inc()
                         raise
-                except ProcessingError as e:
-                    logger.warning(f"Processing error (attempt {attempt + 1}/{retries}): {e}")
+                    logger.warning(f"{type(e).__name__} (attempt {attempt + 1}/{retries}): {e}")
                     last_error = e
-                    continue
                 except Exception as e:
                     logger.error(f"Unexpected error: {e}")
+                    record_error(e)
+                    record_outcome(e)
+                    failed.inc()
                     raise
             
             if last_error:
+                breaker.record_failure()
+                if isinstance(last_error, (GPUError, DeadlineExceededError)) and backup_handler:
+                    return _FALL_BACK
+                failed.inc()
                 raise last_error
         return wrapper
     return decorator
@@ -0,0 +1,218 @@
+import numpy as np
+from functools import lru_cache
+from typing import Optional
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+# NumPy 2 FFTs keep float32 precision and accept an output buffer
+_FFT_OUT = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+@lru_cache(maxsize=None)
+def hann_window(size: int) -> np.ndarray:
+    """Periodic Hann window, cached per size.
+
+    Args:
+        size (int): Window length in samples
+
+    Returns:
+        np.ndarray: Read-only float32 window
+    """
+    n = np.arange(size)
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * n / size)).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+def hz_to_mel(freq: np.ndarray) -> np.ndarray:
+    """Convert frequencies in Hz to the HTK mel scale."""
+    return 2595.0 * np.log10(1.0 + np.asarray(freq) / 700.0)
+
+def mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    """Convert HTK mel values to frequencies in Hz."""
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+@lru_cache(maxsize=None)
+def mel_filterbank(sample_rate: int,
+                   n_fft: int,
+                   n_mels: int = 128,
+                   fmin: float = 0.0,
+                   fmax: Optional[float] = None) -> np.ndarray:
+    """Triangular mel filterbank, cached per configuration.
+
+    Filters are area normalized so that wide high-frequency bands do not
+    dominate the spectrum.
+
+    Args:
+        sample_rate (int): Audio sample rate in Hz
+        n_fft (int): FFT size
+        n_mels (int): Number of mel bands
+        fmin (float): Lowest band edge in Hz
+        fmax (Optional[float]): Highest band edge in Hz, Nyquist if None
+
+    Returns:
+        np.ndarray: Read-only ``(n_fft // 2 + 1, n_mels)`` float32 matrix mapping
+        a power spectrum to mel band energies
+    """
+    fmax = sample_rate / 2 if fmax is None else fmax
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    weights = np.maximum(0.0, np.minimum(rising, falling))
+    weights *= 2.0 / (upper - lower)
+
+    filterbank = np.ascontiguousarray(weights.T, dtype=np.float32)
+    filterbank.flags.writeable = False
+    return filterbank
+
+class MelSpectrogram:
+    """Log-mel spectrogram engine shared by audio feature extractors.
+
+    Frames are causal: frame ``k`` covers the ``window_size`` samples ending
+    at sample ``(k + 1) * hop_length``, with zeros before the start of the
+    stream. A clip of ``n`` samples therefore yields ``n // hop_length``
+    frames, and streaming the same audio in chunks of any size yields the
+    same frames as a single call.
+
+    All frames of a chunk are windowed, transformed and projected onto the
+    mel bands in one batch. Scratch buffers are reused between calls, so
+    steady-state streaming does not allocate. Instances are not thread-safe.
+    """
+
+    LOG_FLOOR = 1e-10
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 window_size: int = 512,
+                 hop_length: int = 256,
+                 n_mels: int = 128,
+                 fmin: float = 0.0,
+                 fmax: Optional[float] = None):
+        """Initialize the engine.
+
+        Args:
+            sample_rate (int): Audio sample rate in Hz
+            window_size (int): Frame and FFT size in samples
+            hop_length (int): Samples between frame starts
+            n_mels (int): Number of mel bands
+            fmin (float): Lowest band edge in Hz
+            fmax (Optional[float]): Highest band edge in Hz, Nyquist if None
+        """
+        if not 0 < hop_length <= window_size:
+            raise ValueError("hop_length must be in (0, window_size]")
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.window = hann_window(window_size)
+        self.filterbank = mel_filterbank(sample_rate, window_size, n_mels, fmin, fmax)
+
+        self._bins = window_size // 2 + 1
+        self._history = window_size - hop_length
+        self._frames = np.empty((0, window_size), dtype=np.float32)
+        self._spectrum = np.empty((0, self._bins), dtype=np.complex64)
+        self._power = np.empty((0, self._bins), dtype=np.float32)
+        self._mel = np.empty((0, n_mels), dtype=np.float32)
+        self._buffer = np.zeros(self._history + 4 * window_size, dtype=np.float32)
+        self._carry = np.empty(window_size, dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        self._buffer[:self._history] = 0.0
+        self._fill = self._history
+
+    def num_frames(self, num_samples: int) -> int:
+        """Number of frames produced for a clip of ``num_samples``."""
+        return num_samples // self.hop_length
+
+    def transform(self, audio: np.ndarray) -> np.ndarray:
+        """Compute the log-mel spectrogram of complete clips.
+
+        Args:
+            audio (np.ndarray): int16 or float samples, ``(n_samples,)`` or
+                ``(batch, n_samples)``
+
+        Returns:
+            np.ndarray: float32 features of shape ``(..., n_frames, n_mels)``
+        """
+        audio = np.asarray(audio)
+        padded = np.zeros(audio.shape[:-1] + (self._history + audio.shape[-1],),
+                          dtype=np.float32)
+        self._to_float(audio, padded[..., self._history:])
+        count = self.num_frames(audio.shape[-1])
+        frames = sliding_window_view(padded, self.window_size, axis=-1)[..., ::self.hop_length, :]
+        frames = frames[..., :count, :].reshape(-1, self.window_size)
+        return self._compute(frames).reshape(audio.shape[:-1] + (count, self.n_mels)).copy()
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Compute features for the next chunk of a stream.
+
+        Args:
+            audio (np.ndarray): int16 or float samples of any length
+
+        Returns:
+            np.ndarray: ``(n_frames, n_mels)`` float32 features for the frames
+            completed by this chunk. The array is a view of an internal
+            buffer that is overwritten by the next call.
+        """
+        audio = np.asarray(audio).reshape(-1)
+        end = self._fill + audio.size
+        if end > self._buffer.size:
+            grown = np.zeros(max(end, 2 * self._buffer.size), dtype=np.float32)
+            grown[:self._fill] = self._buffer[:self._fill]
+            self._buffer = grown
+        self._to_float(audio, self._buffer[self._fill:end])
+
+        count = (end - self._history) // self.hop_length
+        if count <= 0:
+            self._fill = end
+            return self._mel[:0]
+
+        frames = sliding_window_view(self._buffer[:end], self.window_size)[::self.hop_length]
+        features = self._compute(frames[:count])
+
+        # Keep the samples still needed by upcoming frames
+        consumed = count * self.hop_length
+        self._fill = end - consumed
+        carry = self._carry[:self._fill]
+        carry[...] = self._buffer[consumed:end]
+        self._buffer[:self._fill] = carry
+        return features
+
+    def _to_float(self, audio: np.ndarray, out: np.ndarray) -> None:
+        """Write samples scaled to [-1, 1] into ``out``."""
+        if audio.dtype == np.int16:
+            np.multiply(audio, np.float32(1.0 / 32768.0), out=out)
+        else:
+            out[...] = audio
+
+    def _scratch(self, count: int) -> None:
+        """Grow the scratch buffers to hold ``count`` frames."""
+        if self._frames.shape[0] >= count:
+            return
+        rows = max(count, 2 * self._frames.shape[0])
+        self._frames = np.empty((rows, self.window_size), dtype=np.float32)
+        self._spectrum = np.empty((rows, self._bins), dtype=np.complex64)
+        self._power = np.empty((rows, self._bins), dtype=np.float32)
+        self._mel = np.empty((rows, self.n_mels), dtype=np.float32)
+
+    def _compute(self, frames: np.ndarray) -> np.ndarray:
+        """Log-mel features of a ``(n_frames, window_size)`` batch of frames."""
+        count = frames.shape[0]
+        self._scratch(count)
+        windowed = np.multiply(frames, self.window, out=self._frames[:count])
+
+        if _FFT_OUT:
+            spectrum = np.fft.rfft(windowed, out=self._spectrum[:count])
+        else:
+            spectrum = np.fft.rfft(windowed)
+        # |X|^2 from the interleaved real and imaginary parts
+        pairs = spectrum.view(spectrum.real.dtype).reshape(count, self._bins, 2)
+        power = np.einsum('fbc,fbc->fb', pairs, pairs, out=self._power[:count],
+                          casting='same_kind')
+
+        mel = np.matmul(power, self.filterbank, out=self._mel[:count])
+        np.maximum(mel, self.LOG_FLOOR, out=mel)
+        return np.log(mel, out=mel)
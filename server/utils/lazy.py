@@ -0,0 +1,40 @@
+import importlib
+from types import ModuleType
+from typing import Any
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access.
+
+    Services bind heavy dependencies such as torch and vosk through
+    ``lazy_import`` so that importing a service is cheap and the import
+    cost is paid in the service's load stage instead. Once imported, the
+    module's attributes are copied onto the proxy, so later lookups are
+    plain attribute reads.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def __getattr__(self, attribute: str) -> Any:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__["_module"] = module
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name: str) -> ModuleType:
+    """Bind a module without importing it yet.
+
+    Args:
+        name (str): Absolute module name, e.g. ``"torch"``
+
+    Returns:
+        ModuleType: Proxy importing ``name`` when an attribute is first used
+    """
+    return LazyModule(name)
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional
+from ..exceptions import *
+
+logger = logging.getLogger(__name__)
+
+class ServiceState(Enum):
+    """Lifecycle stage of a service."""
+    CREATED = "created"
+    LOADING = "loading"
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    FAILED = "failed"
+    STOPPED = "stopped"
+
+class ServiceLifecycle:
+    """Staged startup of a service: load, warm up, ready.
+
+    The load stage reads models. The warm-up stage runs dummy requests so
+    that imports, kernel compilation, allocator growth and cache fills
+    happen before the first real request. Both stages run in an executor
+    when started with ``start``, which keeps the event loop free to answer
+    health checks. Each stage is timed and logged, and ``status`` is the
+    payload of a readiness probe.
+    """
+
+    def __init__(self, name: str):
+        """Initialize the lifecycle.
+
+        Args:
+            name (str): Service name used in logs and probes
+        """
+        self.name = name
+        self.state = ServiceState.CREATED
+        self.error: Optional[BaseException] = None
+        self.timings: Dict[str, float] = {}
+        self._settled: Optional[asyncio.Event] = None
+        self._starting: Optional[asyncio.Future] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the service accepts requests."""
+        return self.state is ServiceState.READY
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness probe payload.
+
+        Returns:
+            Dict[str, Any]: Service name, state, readiness, the last startup
+            error and the duration of each completed stage in milliseconds
+        """
+        return {
+            "service": self.name,
+            "state": self.state.value,
+            "ready": self.ready,
+            "error": str(self.error) if self.error is not None else None,
+            "timings_ms": {stage: round(seconds * 1000, 1)
+                           for stage, seconds in self.timings.items()},
+        }
+
+    def check_ready(self) -> None:
+        """Raise unless the service accepts requests.
+
+        Raises:
+            ServiceNotReadyError: If the service is not ready
+        """
+        if self.state is not ServiceState.READY:
+            raise ServiceNotReadyError(f"{self.name} service is {self.state.value}")
+
+    def run(self, load: Callable[[], None], warm_up: Callable[[], None]) -> None:
+        """Load and warm up on the calling thread.
+
+        Args:
+            load (Callable[[], None]): Load stage
+            warm_up (Callable[[], None]): Warm-up stage
+        """
+        with self._stage(ServiceState.LOADING):
+            load()
+        with self._stage(ServiceState.WARMING_UP):
+            warm_up()
+        self._mark_ready()
+
+    async def start(self,
+                    load: Callable[[], None],
+                    warm_up: Callable[[], None],
+                    executor: Optional[Executor] = None) -> None:
+        """Load and warm up in an executor unless already ready.
+
+        Concurrent callers share one startup, and cancelling a caller does
+        not abort it. A failed or stopped service is started again.
+
+        Args:
+            load (Callable[[], None]): Load stage
+            warm_up (Callable[[], None]): Warm-up stage
+            executor (Optional[Executor]): Executor running the stages,
+                the loop's default executor when None
+        """
+        if self.ready:
+            return
+        if self._starting is None or self._starting.done():
+            self._starting = asyncio.ensure_future(self._start(load, warm_up, executor))
+        await asyncio.shield(self._starting)
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the service is ready or its startup failed.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait
+
+        Returns:
+            bool: Whether the service is ready
+        """
+        if self.state not in (ServiceState.READY, ServiceState.FAILED):
+            if self._settled is None:
+                self._settled = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._settled.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.ready
+
+    def stop(self) -> None:
+        """Mark the service as no longer accepting requests."""
+        self._set_state(ServiceState.STOPPED)
+
+    async def _start(self,
+                     load: Callable[[], None],
+                     warm_up: Callable[[], None],
+                     executor: Optional[Executor]) -> None:
+        loop = asyncio.get_running_loop()
+        with self._stage(ServiceState.LOADING):
+            await loop.run_in_executor(executor, load)
+        with self._stage(ServiceState.WARMING_UP):
+            await loop.run_in_executor(executor, warm_up)
+        self._mark_ready()
+
+    @contextmanager
+    def _stage(self, state: ServiceState) -> Iterator[None]:
+        """Enter a stage, timing it and recording its failure."""
+        self._set_state(state)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            elapsed = (time.perf_counter() - started) * 1000
+            logger.error(f"{self.name} {state.value} failed after {elapsed:.1f} ms: {e}")
+            self.error = e
+            self._set_state(ServiceState.FAILED)
+            raise
+        self.timings[state.value] = time.perf_counter() - started
+        logger.info(f"{self.name} {state.value} took {self.timings[state.value] * 1000:.1f} ms")
+
+    def _mark_ready(self) -> None:
+        self.error = None
+        self._set_state(ServiceState.READY)
+        total = (self.timings[ServiceState.LOADING.value]
+                 + self.timings[ServiceState.WARMING_UP.value])
+        logger.info(f"{self.name} ready in {total * 1000:.1f} ms")
+
+    def _set_state(self, state: ServiceState) -> None:
+        self.state = state
+        if self._settled is not None:
+            if state in (ServiceState.READY, ServiceState.FAILED):
+                self._settled.set()
+            else:
+                self._settled.clear()
+
+def readiness(*lifecycles: ServiceLifecycle) -> Dict[str, Any]:
+    """Combined readiness probe of several services.
+
+    Args:
+        *lifecycles (ServiceLifecycle): Lifecycles of the services in a process
+
+    Returns:
+        Dict[str, Any]: ``ready`` when every service is ready, and each
+        service's ``status`` by name
+    """
+    return {
+        "ready": all(lifecycle.ready for lifecycle in lifecycles),
+        "services": {lifecycle.name: lifecycle.status() for lifecycle in lifecycles},
+    }
@@ -0,0 +1,272 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+# Seconds, from sub-millisecond frame work up to whole responses
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.0075, 0.01, 0.015, 0.025, 0.035, 0.05, 0.075,
+    0.1, 0.15, 0.25, 0.35, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Counter:
+    """Monotonic counter."""
+
+    type = "counter"
+
+    def __init__(self, name: str, labels: Labels = ()):
+        self.name = name
+        self.labels = labels
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add to the counter."""
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        yield self.name, self.labels, self.value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0.0
+
+class Histogram:
+    """Fixed-bucket histogram with quantile estimates.
+
+    An observation costs a binary search over the bucket bounds and a few
+    additions under a lock, so it can sit on per-frame paths. Quantiles are
+    interpolated within the bucket that holds them, as Prometheus'
+    ``histogram_quantile`` does, and clamped to the observed range; their
+    error is bounded by the width of that bucket.
+    """
+
+    type = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 labels: Labels = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self.name = name
+        self.labels = labels
+        self.buckets = tuple(float(bound) for bound in buckets)
+        # The last count is the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, count: int = 1) -> None:
+        """Record ``count`` observations of ``value``."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += count
+            self.count += count
+            self.sum += value * count
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of a block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile.
+
+        Args:
+            q (float): Quantile in [0, 1], e.g. 0.95
+
+        Returns:
+            float: Estimated value, NaN without observations
+        """
+        with self._lock:
+            counts = list(self.counts)
+            total, low, high = self.count, self.min, self.max
+        if not total:
+            return math.nan
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else low
+                upper = self.buckets[index] if index < len(self.buckets) else high
+                lower, upper = max(lower, low), min(upper, high)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return high
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else math.nan,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else math.nan,
+        }
+
+    def samples(self) -> Iterator[Tuple[str, Labels, float]]:
+        with self._lock:
+            counts = list(self.counts)
+            total, value_sum = self.count, self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            yield f"{self.name}_bucket", self.labels + (("le", _format_value(bound)),), cumulative
+        yield f"{self.name}_sum", self.labels, value_sum
+        yield f"{self.name}_count", self.labels, total
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.count = 0
+            self.sum = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+
+Metric = Union[Counter, Histogram]
+
+class MetricsRegistry:
+    """Named counters and histograms with an in-process snapshot and Prometheus export.
+
+    Metrics are created once, typically at module import, and kept by the
+    caller, so recording never touches the registry. Asking again for the
+    same name and labels returns the existing metric.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[Tuple[str, Labels], Metric] = {}
+        self._help: Dict[str, str] = {}
+        self._types: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        """Get or create a counter.
+
+        Args:
+            name (str): Metric name, by convention ending in ``_total``
+            help (str): Description exported with the metric
+            **labels (str): Label values identifying this series
+
+        Returns:
+            Counter: Counter for the name and labels
+        """
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self,
+                  name: str,
+                  help: str = "",
+                  buckets: Sequence[float] = LATENCY_BUCKETS,
+                  **labels: str) -> Histogram:
+        """Get or create a histogram.
+
+        Args:
+            name (str): Metric name, by convention ending in the unit, e.g. ``_seconds``
+            help (str): Description exported with the metric
+            buckets (Sequence[float]): Increasing bucket upper bounds
+            **labels (str): Label values identifying this series
+
+        Returns:
+            Histogram: Histogram for the name and labels
+        """
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def _get(self, cls: type, name: str, help: str, labels: Dict[str, str], **options) -> Any:
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                if self._types.setdefault(name, cls.type) != cls.type:
+                    raise ValueError(f"{name} is already registered as a {self._types[name]}")
+                metric = cls(name, key[1], **options)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.type}")
+            if help:
+                self._help.setdefault(name, help)
+        return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values by series.
+
+        Returns:
+            Dict[str, Any]: Counter values, and for histograms the count, sum,
+            mean, max and p50/p95/p99 estimates, keyed by
+            ``name{label="value",...}``
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {_series(metric.name, metric.labels): metric.snapshot() for metric in metrics}
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        family = None
+        for metric in metrics:
+            if metric.name != family:
+                family = metric.name
+                if family in self._help:
+                    lines.append(f"# HELP {family} {_escape(self._help[family], False)}")
+                lines.append(f"# TYPE {family} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{_series(name, labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric, keeping the metrics registered."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+def _escape(text: str, quotes: bool = True) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
+
+def _series(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+# Process-wide registry the services record into
+REGISTRY = MetricsRegistry()
+
+def counter(name: str, help: str = "", **labels: str) -> Counter:
+    """Get or create a counter in the process-wide registry."""
+    return REGISTRY.counter(name, help, **labels)
+
+def histogram(name: str,
+              help: str = "",
+              buckets: Sequence[float] = LATENCY_BUCKETS,
+              **labels: str) -> Histogram:
+    """Get or create a histogram in the process-wide registry."""
+    return REGISTRY.histogram(name, help, buckets, **labels)
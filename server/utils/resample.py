@@ -0,0 +1,164 @@
+import numpy as np
+from functools import lru_cache
+from math import ceil, gcd
+from typing import Tuple
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Zero crossings of the windowed sinc on each side of its center
+ZERO_CROSSINGS = 16
+KAISER_BETA = 8.6
+ROLLOFF = 0.94
+
+@lru_cache(maxsize=None)
+def resample_kernel(src_rate: int, target_rate: int) -> Tuple[int, int, int, np.ndarray]:
+    """Polyphase anti-aliasing filter for a rate pair, cached per pair.
+
+    Args:
+        src_rate (int): Input sample rate in Hz
+        target_rate (int): Output sample rate in Hz
+
+    Returns:
+        Tuple[int, int, int, np.ndarray]: Upsampling factor ``L``, downsampling
+        factor ``M``, filter delay in upsampled samples, and a read-only
+        ``(L, taps)`` float32 matrix whose row ``p`` holds phase ``p`` of
+        the filter in reverse order, so it can be applied as a dot product
+        with input windows
+    """
+    divisor = gcd(src_rate, target_rate)
+    up, down = target_rate // divisor, src_rate // divisor
+
+    # Cutoff below the lower Nyquist frequency, relative to the upsampled rate
+    cutoff = ROLLOFF * 0.5 * min(src_rate, target_rate) / (src_rate * up)
+    taps = 2 * ceil(ZERO_CROSSINGS / (2 * cutoff * up))
+    length = taps * up
+    delay = length // 2
+
+    offset = np.arange(length) - delay
+    envelope = np.sqrt(np.clip(1.0 - (offset / delay) ** 2, 0.0, 1.0))
+    window = np.i0(KAISER_BETA * envelope) / np.i0(KAISER_BETA)
+    prototype = 2 * cutoff * np.sinc(2 * cutoff * offset) * window
+
+    phases = prototype.reshape(taps, up).T
+    # Each phase has unit DC gain so constant signals pass unchanged
+    phases = phases / phases.sum(axis=1, keepdims=True)
+    kernel = np.ascontiguousarray(phases[:, ::-1], dtype=np.float32)
+    kernel.flags.writeable = False
+    return up, down, delay, kernel
+
+class Resampler:
+    """Streaming rational resampler.
+
+    Output sample ``n`` is taken at input time ``n * src_rate / target_rate``
+    and computed as soon as the input it depends on has arrived, so chunked
+    and one-shot conversion produce identical samples. Outputs lag the input
+    only by half the filter length (about 1 ms); no latency is added at chunk
+    boundaries. All output samples of a chunk are computed in one batch.
+    """
+
+    def __init__(self, src_rate: int, target_rate: int):
+        """Initialize the resampler.
+
+        Args:
+            src_rate (int): Input sample rate in Hz
+            target_rate (int): Output sample rate in Hz
+        """
+        if src_rate <= 0 or target_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        self.src_rate = src_rate
+        self.target_rate = target_rate
+        self.up, self.down, self.delay, self.kernel = resample_kernel(src_rate, target_rate)
+        self.taps = self.kernel.shape[1]
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state."""
+        # Buffered input starts at absolute sample ``_start``; zeros precede the stream
+        self._buffer = np.zeros(self.taps - 1, dtype=np.float32)
+        self._start = -(self.taps - 1)
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Resample the next chunk of a stream.
+
+        Args:
+            audio (np.ndarray): int16 or float samples
+
+        Returns:
+            np.ndarray: Output samples completed by this chunk, in the input dtype
+        """
+        audio = np.asarray(audio).reshape(-1)
+        self._buffer = np.concatenate((self._buffer, self._to_float(audio)))
+        self._consumed += audio.size
+        end = self._consumed * self.up - 1 - self.delay
+        last = end // self.down if end >= 0 else -1
+        return self._finish(self._emit(last), audio.dtype)
+
+    def flush(self, dtype: np.dtype = np.int16) -> np.ndarray:
+        """Return the remaining output and reset the stream.
+
+        Args:
+            dtype (np.dtype): Output dtype
+
+        Returns:
+            np.ndarray: Samples that were waiting for lookahead input
+        """
+        total = -(-self._consumed * self.up // self.down)
+        padding = self.delay // self.up + 2
+        self._buffer = np.concatenate((self._buffer, np.zeros(padding, dtype=np.float32)))
+        output = self._emit(total - 1)
+        self.reset()
+        return self._finish(output, np.dtype(dtype))
+
+    def _emit(self, last: int) -> np.ndarray:
+        """Compute outputs up to and including index ``last``."""
+        if last < self._produced:
+            return np.zeros(0, dtype=np.float32)
+        positions = np.arange(self._produced, last + 1) * self.down + self.delay
+        base, phase = np.divmod(positions, self.up)
+
+        windows = sliding_window_view(self._buffer, self.taps)
+        frames = windows[base - (self.taps - 1) - self._start]
+        output = np.einsum('nk,nk->n', frames, self.kernel[phase])
+
+        self._produced = last + 1
+        # Drop input no longer reachable by upcoming outputs
+        next_base = (self._produced * self.down + self.delay) // self.up
+        keep_from = next_base - (self.taps - 1) - self._start
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._start += keep_from
+        return output
+
+    @staticmethod
+    def _to_float(audio: np.ndarray) -> np.ndarray:
+        if audio.dtype == np.int16:
+            return audio.astype(np.float32) * np.float32(1.0 / 32768.0)
+        return audio.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _finish(output: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        if dtype == np.int16:
+            return np.clip(np.rint(output * 32768.0), -32768, 32767).astype(np.int16)
+        return output.astype(dtype, copy=False)
+
+def resample(audio: np.ndarray, src_rate: int, target_rate: int) -> np.ndarray:
+    """Resample a complete clip.
+
+    Args:
+        audio (np.ndarray): int16 or float samples
+        src_rate (int): Input sample rate in Hz
+        target_rate (int): Output sample rate in Hz
+
+    Returns:
+        np.ndarray: ``ceil(len(audio) * target_rate / src_rate)`` samples in
+        the input dtype
+    """
+    audio = np.asarray(audio)
+    if src_rate == target_rate or audio.size == 0:
+        return audio
+    resampler = Resampler(src_rate, target_rate)
+    head = resampler.process(audio)
+    tail = resampler.flush(audio.dtype)
+    return np.concatenate((head, tail)) if tail.size else head
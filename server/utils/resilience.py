@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+from .metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# Monotonic time by which the calls of the current task must finish
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+def expiry(seconds: Optional[float]) -> Optional[float]:
+    """Monotonic time at which a budget starting now would run out.
+
+    Args:
+        seconds (Optional[float]): Budget from now, or None to keep the current one
+
+    Returns:
+        Optional[float]: The earlier of the new and the current budget's end,
+        None without either
+    """
+    expires = _DEADLINE.get()
+    if seconds is not None:
+        expires = time.monotonic() + seconds if expires is None else min(
+            expires, time.monotonic() + seconds)
+    return expires
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Give the service calls made in a block a shared time budget.
+
+    The budget follows the block into the calls and tasks it starts, so a
+    service calling another service passes on what is left of it. Nested
+    budgets never extend an outer one.
+
+    Args:
+        seconds (Optional[float]): Budget from now, or None to keep the current one
+
+    Yields:
+        Optional[float]: Monotonic time at which the budget runs out
+    """
+    with deadline_at(expiry(seconds)) as expires:
+        yield expires
+
+@contextmanager
+def deadline_at(expires: Optional[float]) -> Iterator[Optional[float]]:
+    """Run a block within a budget ending at a time returned by ``expiry``.
+
+    Used to resume a budget captured earlier, e.g. between the items of a
+    stream, whose consumer must not run within it.
+
+    Args:
+        expires (Optional[float]): Monotonic end of the budget, None for no budget
+
+    Yields:
+        Optional[float]: ``expires``
+    """
+    token = _DEADLINE.set(expires)
+    try:
+        yield expires
+    finally:
+        _DEADLINE.reset(token)
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Lift the current budget for the calls made in a block."""
+    with deadline_at(None):
+        yield
+
+def time_remaining() -> Optional[float]:
+    """Seconds left in the current budget, None without one."""
+    expires = _DEADLINE.get()
+    if expires is None:
+        return None
+    return max(expires - time.monotonic(), 0.0)
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff before a retry.
+
+    Args:
+        attempt (int): Retry number, starting at 1
+        base (float): Upper bound of the first delay in seconds
+        cap (float): Largest upper bound in seconds
+
+    Returns:
+        float: Seconds to wait, uniform in [0, min(cap, base * 2 ** (attempt - 1))]
+    """
+    return random.uniform(0.0, min(cap, base * 2 ** (attempt - 1)))
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Stops calling a service that keeps failing.
+
+    After ``failure_threshold`` consecutive failed calls the circuit opens
+    and calls are rejected without reaching the service. Once
+    ``reset_timeout`` has passed, one trial call is let through: its
+    success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the circuit breaker.
+
+        Args:
+            name (str): Service name used in logs and metrics
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a trial call
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+        self._rejected = counter("circuit_rejections_total", "Calls rejected by an open circuit",
+                                 service=name)
+        self._opened = counter("circuit_opened_total", "Times a circuit opened", service=name)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the service; counts it as rejected otherwise."""
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                if time.monotonic() - self.opened_at >= self.reset_timeout:
+                    self.state = CircuitState.HALF_OPEN
+                    self._trial = False
+            if self.state is CircuitState.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            if self.state is CircuitState.CLOSED:
+                return True
+        self._rejected.inc()
+        return False
+
+    def release(self) -> None:
+        """Give up a trial call that ended without an outcome, e.g. by cancellation.
+
+        The next call is let through as the trial instead.
+        """
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self._trial = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            if self.state is not CircuitState.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.state is CircuitState.HALF_OPEN or (
+                    self.state is CircuitState.CLOSED
+                    and self.failures >= self.failure_threshold):
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+                self._opened.inc()
+                logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+def circuit_breaker(name: str, **options: Any) -> CircuitBreaker:
+    """Get or create the circuit breaker of a service.
+
+    Args:
+        name (str): Service name
+        **options (Any): ``CircuitBreaker`` arguments, used on creation only
+
+    Returns:
+        CircuitBreaker: Breaker shared by every caller using the name
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name, **options)
+        return breaker
+
+async def hedged(call: Callable[[], Awaitable[Any]],
+                 delay: float,
+                 on_hedge: Optional[Callable[[], None]] = None) -> Any:
+    """Await a call, starting a second identical one if the first is slow.
+
+    Only use it for idempotent calls. The first result wins and the other
+    call is cancelled. The call fails only if both attempts fail.
+
+    Args:
+        call (Callable[[], Awaitable[Any]]): Starts one attempt
+        delay (float): Seconds to wait for the first attempt before hedging
+        on_hedge (Optional[Callable[[], None]]): Called when the second attempt starts
+
+    Returns:
+        Any: Result of the first attempt to succeed
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+        if on_hedge is not None:
+            on_hedge()
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,133 @@
+import re
+from typing import List, Optional, Tuple
+
+# Abbreviations whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc",
+    "e.g", "i.e", "approx", "no", "inc", "ltd", "co",
+})
+
+_SENTENCE_END = re.compile(r'([.!?…]+["\')\]]*)(\s+)')
+_CLAUSE_END = re.compile(r'([,;:—]+)(\s+)')
+
+class SentenceChunker:
+    """Incrementally split streamed text into speakable segments.
+
+    Tokens are pushed as they arrive and every sentence is emitted as soon as
+    its terminator and the following whitespace have been seen. Long
+    sentences are additionally broken at clause punctuation so speech can
+    start before the sentence closes.
+    """
+
+    def __init__(self, min_chars: int = 12, max_chars: int = 120):
+        """Initialize the chunker.
+
+        Args:
+            min_chars (int): Minimum segment length; shorter pieces are merged
+                with what follows
+            max_chars (int): Length after which a pending sentence is broken at
+                the last clause boundary
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def push(self, token: str) -> List[str]:
+        """Add streamed text.
+
+        Args:
+            token (str): Next piece of text
+
+        Returns:
+            List[str]: Segments completed by this token
+        """
+        self._buffer += token
+        segments = []
+        start = 0
+
+        for match in _SENTENCE_END.finditer(self._buffer):
+            end = match.end(1)
+            if end - start < self.min_chars or self._is_abbreviation(self._buffer[start:end]):
+                continue
+            pieces, rest = self._split_clauses(self._buffer[start:end])
+            segments.extend(pieces)
+            segments.append(rest)
+            start = match.end()
+
+        # Break a long pending sentence so speech can start before it closes
+        pieces, rest = self._split_clauses(self._buffer[start:])
+        segments.extend(pieces)
+        self._buffer = rest
+        return [segment.strip() for segment in segments if segment.strip()]
+
+    def _split_clauses(self, text: str) -> Tuple[List[str], str]:
+        """Break text longer than ``max_chars`` at clause boundaries.
+
+        Returns:
+            Tuple[List[str], str]: Completed clauses and the unsplit remainder
+        """
+        pieces = []
+        start = 0
+        while len(text) - start > self.max_chars:
+            split = None
+            for match in _CLAUSE_END.finditer(text, start, start + self.max_chars):
+                if match.end(1) - start >= self.min_chars:
+                    split = match
+            if split is None:
+                break
+            pieces.append(text[start:split.end(1)])
+            start = split.end()
+        return pieces, text[start:]
+
+    def flush(self) -> Optional[str]:
+        """Return any pending text and reset the chunker.
+
+        Returns:
+            Optional[str]: Remaining text, if any
+        """
+        remaining = self._buffer.strip()
+        self._buffer = ""
+        return remaining or None
+
+    @staticmethod
+    def _is_abbreviation(segment: str) -> bool:
+        """Check whether a segment ends with a known abbreviation."""
+        if not segment.endswith("."):
+            return False
+        words = segment[:-1].split()
+        return bool(words) and words[-1].lower().lstrip("(\"'") in ABBREVIATIONS
+
+def split_sentences(text: str, min_chars: int = 12, max_chars: int = 120) -> List[str]:
+    """Split complete text into speakable segments.
+
+    Args:
+        text (str): Text to split
+        min_chars (int): Minimum segment length
+        max_chars (int): Length after which sentences are broken at clauses
+
+    Returns:
+        List[str]: Segments in order
+    """
+    chunker = SentenceChunker(min_chars=min_chars, max_chars=max_chars)
+    # A trailing space lets the final terminator close its sentence
+    segments = chunker.push(text + " ")
+    remaining = chunker.flush()
+    if remaining:
+        segments.append(remaining)
+    return segments
+
+_NON_WORD = re.compile(r"[^\w\s']+")
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups.
+
+    Lowercases, drops punctuation and collapses whitespace so that trivially
+    different phrasings of the same utterance compare equal.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
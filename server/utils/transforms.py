@@ -1,7 +1,19 @@
 import numpy as np
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Tuple, Optional, Union
+
+ArrayLike = Union[float, np.ndarray]
 
 class Transform3D:
+    """Rigid, view and projection transforms in OpenGL conventions.
+
+    The ``create_*`` methods build one float64 matrix from scalars. The
+    plural methods build ``(N, 4, 4)`` float32 stacks from arrays of
+    parameters in one vectorized call, e.g. per-frame head poses, and agree
+    with the scalar versions to float32 precision. Matrices act on column
+    vectors.
+    """
+
     @staticmethod
     def create_rotation_matrix(angles: Tuple[float, float, float]) -> np.ndarray:
         """Create 3D rotation matrix from Euler angles (XYZ order)."""
@@ -30,7 +42,12 @@ class Transform3D:
     def create_view_matrix(eye: np.ndarray,
                           target: np.ndarray,
                           up: np.ndarray) -> np.ndarray:
-        """Create view matrix from camera parameters."""
+        """Create view matrix from camera parameters.
+
+        The camera looks down its -z axis with +y up. The rows of the
+        rotation are the camera axes in world space, and the translation
+        moves the eye to the origin.
+        """
         forward = target - eye
         forward = forward / np.linalg.norm(forward)
         
@@ -40,19 +57,23 @@ class Transform3D:
         up = np.cross(right, forward)
         
         view_matrix = np.eye(4)
-        view_matrix[:3, 0] = right
-        view_matrix[:3, 1] = up
-        view_matrix[:3, 2] = -forward
-        view_matrix[:3, 3] = -eye
+        view_matrix[0, :3] = right
+        view_matrix[1, :3] = up
+        view_matrix[2, :3] = -forward
+        view_matrix[:3, 3] = -view_matrix[:3, :3] @ eye
         
         return view_matrix
 
     @staticmethod
+    @lru_cache(maxsize=64)
     def create_perspective_matrix(fov: float,
                                 aspect: float,
                                 near: float,
                                 far: float) -> np.ndarray:
-        """Create perspective projection matrix."""
+        """Create perspective projection matrix.
+
+        Matrices are cached per ``(fov, aspect, near, far)`` and read-only.
+        """
         f = 1.0 / np.tan(fov / 2)
         
         projection = np.zeros((4, 4))
@@ -61,5 +82,145 @@ class Transform3D:
         projection[2, 2] = (far + near) / (near - far)
         projection[2, 3] = 2 * far * near / (near - far)
         projection[3, 2] = -1
+        projection.flags.writeable = False
         
-        return projection
\ No newline at end of file
+        return projection
+
+    @staticmethod
+    def rotation_matrices(angles: np.ndarray) -> np.ndarray:
+        """Rotation matrices from Euler angles (XYZ order).
+
+        Args:
+            angles (np.ndarray): ``(N, 3)`` rotations about x, y and z in radians
+
+        Returns:
+            np.ndarray: ``(N, 3, 3)`` float32 matrices ``Rz @ Ry @ Rx``
+        """
+        angles = np.asarray(angles, dtype=np.float32).reshape(-1, 3)
+        cos, sin = np.cos(angles), np.sin(angles)
+        cx, cy, cz = cos.T
+        sx, sy, sz = sin.T
+        rotation = np.empty((angles.shape[0], 3, 3), dtype=np.float32)
+        rotation[:, 0, 0] = cz * cy
+        rotation[:, 0, 1] = cz * sy * sx - sz * cx
+        rotation[:, 0, 2] = cz * sy * cx + sz * sx
+        rotation[:, 1, 0] = sz * cy
+        rotation[:, 1, 1] = sz * sy * sx + cz * cx
+        rotation[:, 1, 2] = sz * sy * cx - cz * sx
+        rotation[:, 2, 0] = -sy
+        rotation[:, 2, 1] = cy * sx
+        rotation[:, 2, 2] = cy * cx
+        return rotation
+
+    @staticmethod
+    def model_matrices(angles: np.ndarray,
+                       positions: np.ndarray,
+                       scales: Optional[np.ndarray] = None) -> np.ndarray:
+        """Model-to-world matrices from poses.
+
+        Args:
+            angles (np.ndarray): ``(N, 3)`` Euler angles (XYZ order) in radians
+            positions (np.ndarray): ``(N, 3)`` translations
+            scales (Optional[np.ndarray]): ``(N,)`` or ``(N, 3)`` scale factors
+                applied before the rotation
+
+        Returns:
+            np.ndarray: ``(N, 4, 4)`` float32 matrices ``T @ R @ S``
+        """
+        rotation = Transform3D.rotation_matrices(angles)
+        model = np.zeros((rotation.shape[0], 4, 4), dtype=np.float32)
+        model[:, :3, :3] = rotation
+        if scales is not None:
+            scales = np.asarray(scales, dtype=np.float32)
+            model[:, :3, :3] *= scales.reshape(scales.shape[0], 1, -1)
+        model[:, :3, 3] = positions
+        model[:, 3, 3] = 1.0
+        return model
+
+    @staticmethod
+    def view_matrices(eyes: np.ndarray,
+                      targets: np.ndarray,
+                      up: Tuple[float, float, float] = (0.0, 1.0, 0.0)) -> np.ndarray:
+        """World-to-camera matrices, as ``create_view_matrix`` for many cameras.
+
+        Args:
+            eyes (np.ndarray): ``(N, 3)`` camera positions
+            targets (np.ndarray): ``(N, 3)`` or ``(3,)`` points looked at
+            up (Tuple[float, float, float]): World up direction
+
+        Returns:
+            np.ndarray: ``(N, 4, 4)`` float32 matrices
+        """
+        eyes = np.asarray(eyes, dtype=np.float32).reshape(-1, 3)
+        forward = np.asarray(targets, dtype=np.float32) - eyes
+        forward /= np.linalg.norm(forward, axis=-1, keepdims=True)
+        right = np.cross(forward, np.asarray(up, dtype=np.float32))
+        right /= np.linalg.norm(right, axis=-1, keepdims=True)
+
+        view = np.zeros((eyes.shape[0], 4, 4), dtype=np.float32)
+        view[:, 0, :3] = right
+        view[:, 1, :3] = np.cross(right, forward)
+        view[:, 2, :3] = -forward
+        view[:, :3, 3] = -np.matmul(view[:, :3, :3], eyes[:, :, None])[:, :, 0]
+        view[:, 3, 3] = 1.0
+        return view
+
+    @staticmethod
+    def perspective_matrices(fov: ArrayLike,
+                             aspect: ArrayLike,
+                             near: ArrayLike,
+                             far: ArrayLike) -> np.ndarray:
+        """Perspective projections, as ``create_perspective_matrix`` for many cameras.
+
+        Args:
+            fov (ArrayLike): Vertical fields of view in radians
+            aspect (ArrayLike): Width over height
+            near (ArrayLike): Near clipping distances
+            far (ArrayLike): Far clipping distances
+
+        Returns:
+            np.ndarray: ``(N, 4, 4)`` float32 matrices, ``N`` being the
+            broadcast size of the arguments
+        """
+        fov, aspect, near, far = (np.ravel(np.asarray(value, dtype=np.float64))
+                                  for value in np.broadcast_arrays(fov, aspect, near, far))
+        f = 1.0 / np.tan(fov / 2)
+        projection = np.zeros((f.size, 4, 4), dtype=np.float32)
+        projection[:, 0, 0] = f / aspect
+        projection[:, 1, 1] = f
+        projection[:, 2, 2] = (far + near) / (near - far)
+        projection[:, 2, 3] = 2 * far * near / (near - far)
+        projection[:, 3, 2] = -1
+        return projection
+
+    @staticmethod
+    def transform_points(matrices: np.ndarray,
+                         points: np.ndarray,
+                         out: Optional[np.ndarray] = None,
+                         perspective_divide: bool = False) -> np.ndarray:
+        """Apply one or a stack of 4x4 matrices to a point cloud.
+
+        Points are multiplied by the 3x3 block and offset by the translation
+        directly, without building homogeneous copies of the cloud.
+
+        Args:
+            matrices (np.ndarray): ``(4, 4)`` or ``(N, 4, 4)`` matrices
+            points (np.ndarray): ``(M, 3)`` points
+            out (Optional[np.ndarray]): ``(M, 3)`` or ``(N, M, 3)`` float32 output
+            perspective_divide (bool): Divide by the homogeneous coordinate,
+                for projection matrices
+
+        Returns:
+            np.ndarray: Transformed points, ``(M, 3)`` or ``(N, M, 3)`` float32
+        """
+        matrices = np.asarray(matrices, dtype=np.float32)
+        points = np.asarray(points, dtype=np.float32)
+        if out is None:
+            out = np.empty(matrices.shape[:-2] + points.shape, dtype=np.float32)
+        np.matmul(points, matrices[..., :3, :3].swapaxes(-1, -2), out=out)
+        out += matrices[..., None, :3, 3]
+        if perspective_divide:
+            w = np.matmul(points, matrices[..., 3, :3, None])
+            w += matrices[..., None, 3, 3:]
+            out /= w
+        return out
@@ -0,0 +1,110 @@
+"""Stand-ins for the models and devices the services need, for CPU-only tests."""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterable, Iterator, List, Optional
+
+import numpy as np
+
+from server.stt_service import TranscriptEvent
+from server.tts_service import TTSService
+from server.utils.audio import VADEventType, VoiceActivityDetector
+from server.utils.checkpoint import save_checkpoint
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+
+
+class ScriptedSTT:
+    """Stand-in for ``STTService.transcribe_stream`` with fixed transcripts.
+
+    Segments the audio with a real voice activity detector and yields the
+    next transcript at the end of every segment. Records when each speech
+    start was detected.
+    """
+
+    sample_rate = SAMPLE_RATE
+
+    def __init__(self, transcripts: List[str]):
+        self.transcripts: Iterator[str] = iter(transcripts)
+        self.speech_starts: List[float] = []
+
+    async def transcribe_stream(
+        self,
+        frames: AsyncIterable[bytes],
+        session_id: Optional[str] = None,
+        vad: Optional[VoiceActivityDetector] = None,
+        sample_rate: Optional[int] = None,
+    ) -> AsyncGenerator:
+        vad = vad or VoiceActivityDetector(self.sample_rate)
+        loop = asyncio.get_running_loop()
+        async for frame in frames:
+            for event in vad.process(np.frombuffer(frame, dtype=np.int16)):
+                if event.type == VADEventType.SPEECH_START:
+                    self.speech_starts.append(loop.time())
+                elif event.type == VADEventType.SPEECH_END:
+                    yield TranscriptEvent(text=next(self.transcripts), is_final=True)
+                if event.type != VADEventType.SPEECH:
+                    yield event
+
+
+def speech(seconds: float) -> np.ndarray:
+    """Voiced harmonic signal with a syllable-rate envelope, as int16."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(120 + 30 * np.sin(np.pi * t)) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (np.clip(voiced * envelope * 0.3, -1, 1) * 32767).astype(np.int16)
+
+
+def utterance(seconds: float, silence: float) -> np.ndarray:
+    """Speech followed by silence."""
+    return np.concatenate((speech(seconds), np.zeros(int(silence * SAMPLE_RATE), np.int16)))
+
+
+async def microphone(audio: np.ndarray) -> AsyncGenerator[bytes, None]:
+    """Yield audio in 20 ms frames at the pace it would be spoken."""
+    step = SAMPLE_RATE * FRAME_MS // 1000
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for index, start in enumerate(range(0, len(audio), step)):
+        delay = started + index * FRAME_MS / 1000 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield audio[start : start + step].tobytes()
+
+
+def make_tts(directory: Path, **options) -> TTSService:
+    """Placeholder TTS on an empty checkpoint, without a GPU."""
+    model_path = directory / "tts.pth"
+    save_checkpoint({}, model_path)
+    config_path = directory / "tts.json"
+    config_path.write_text("{}\n")
+    return TTSService(str(model_path), str(config_path), require_gpu=False, **options)
+
+
+def write_avatar(directory: Path, count: int, seed: int = 0) -> Path:
+    """Save a random face-sized Gaussian cloud and its config, returning the model path."""
+    rng = np.random.default_rng(seed)
+    direction = rng.standard_normal((count, 3))
+    direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+    gaussians = np.concatenate(
+        (
+            direction * [0.08, 0.11, 0.1],
+            rng.uniform(-6.0, -4.5, (count, 3)),
+            rng.standard_normal((count, 4)),
+        ),
+        axis=1,
+    )
+    path = directory / "model.pth"
+    save_checkpoint(
+        {
+            "gaussians": gaussians.astype(np.float32),
+            "colors": rng.uniform(0.3, 0.9, (count, 3)).astype(np.float32),
+            "opacities": rng.uniform(0.5, 1.0, count).astype(np.float32),
+            "blendshape_deltas": (rng.standard_normal((52, count, 3)) * 0.002).astype(np.float32),
+        },
+        path,
+    )
+    (directory / "config.yaml").write_text("{}\n")
+    return path
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from server.animation.real_time_drivers import EXPRESSION_DIM, FEATURE_DIM, FacialAnimationDriver
+from server.exceptions import ServiceNotReadyError
+
+
+def test_import_does_not_import_torch():
+    code = "import sys, server.animation.real_time_drivers; sys.exit('torch' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_deferred_driver_refuses_requests_until_started():
+    driver = FacialAnimationDriver(device="cpu", defer_start=True)
+    features = np.zeros((3, FEATURE_DIM), dtype=np.float32)
+    with pytest.raises(ServiceNotReadyError):
+        driver.infer(features)
+    with pytest.raises(ServiceNotReadyError):
+        driver.create_stream()
+
+    await driver.start()
+
+    assert driver.lifecycle.ready
+    assert set(driver.lifecycle.status()["timings_ms"]) == {"loading", "warming_up"}
+    assert driver.infer(features).shape == (3, EXPRESSION_DIM)
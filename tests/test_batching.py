@@ -0,0 +1,78 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from server.llm_backends import HTTPBatchBackend
+from server.utils.batching import MicroBatcher
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers each request with its last message, or an error for "fail"."""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.batches.append(len(payload["requests"]))
+        responses = []
+        for request in payload["requests"]:
+            content = request["messages"][-1]["content"]
+            responses.append({"error": "refused"} if content == "fail" else f"echo {content}")
+        body = json.dumps({"responses": responses}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.batches = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def batcher(server):
+    backend = HTTPBatchBackend(f"http://127.0.0.1:{server.server_port}/batch", "stub")
+
+    async def handler(batch):
+        return await backend.generate_batch(batch, max_tokens=16, temperature=0.0)
+
+    return MicroBatcher(handler, max_batch_size=8, max_wait=0.05)
+
+
+async def ask(batcher, *contents):
+    requests = asyncio.gather(
+        *(batcher.submit([{"role": "user", "content": content}]) for content in contents),
+        return_exceptions=True,
+    )
+    return await asyncio.wait_for(requests, timeout=5.0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_post(server, batcher):
+    results = await ask(batcher, "a", "fail", "c")
+    await batcher.close()
+
+    assert server.batches == [3]
+    assert results[0] == "echo a"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == "echo c"
+
+
+def test_batcher_survives_a_new_event_loop(server, batcher):
+    assert asyncio.run(ask(batcher, "first")) == ["echo first"]
+    # The worker of the first loop died with it
+    assert asyncio.run(ask(batcher, "second", "third")) == ["echo second", "echo third"]
+    asyncio.run(batcher.close())
+    assert server.batches == [1, 2]
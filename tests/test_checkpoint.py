@@ -0,0 +1,24 @@
+import numpy as np
+import torch
+
+from server.utils.checkpoint import load_checkpoint, save_checkpoint
+
+
+def test_round_trip_keeps_shapes(tmp_path):
+    path = tmp_path / "model.flat"
+    save_checkpoint(
+        {
+            "scale": np.array(2.5, dtype=np.float32),
+            "step": torch.tensor(7),
+            "model": {"weight": torch.arange(6.0).reshape(2, 3)},
+            "epoch": 3,
+        },
+        path,
+    )
+
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["scale"].shape == ()
+    assert checkpoint["scale"] == np.float32(2.5)
+    assert checkpoint["step"].shape == ()
+    assert checkpoint["step"] == 7
+    np.testing.assert_array_equal(checkpoint["model.weight"], np.arange(6.0).reshape(2, 3))
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Dict, Optional
+
+import pytest
+
+from server.conversation_store import ConversationStore, RedisConversationPersistence
+from server.llm_service import LLMService
+
+
+class FakeRedis:
+    """In-process stand-in for the asyncio Redis client."""
+
+    def __init__(self):
+        self.data: Dict[str, str] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        self.data[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+def make_service(client: FakeRedis, max_conversations: int = 1000) -> LLMService:
+    store = ConversationStore(
+        max_conversations=max_conversations, persistence=RedisConversationPersistence(client=client)
+    )
+    return LLMService(conversation_store=store)
+
+
+@pytest.mark.asyncio
+async def test_evicted_conversation_is_restored():
+    client = FakeRedis()
+    llm = make_service(client, max_conversations=1)
+    await llm.get_response("Hello there.", "session", use_cache=False)
+    await llm.get_response("Hi.", "other", use_cache=False)
+    assert "session" not in llm.conversations
+
+    conversation = await llm.conversations.load("session")
+    assert [message.content for message in conversation][1] == "Hello there."
+
+
+@pytest.mark.asyncio
+async def test_reset_conversation_deletes_persisted_copy():
+    client = FakeRedis()
+    llm = make_service(client)
+    await llm.get_response("Remember the number 42.", "session", use_cache=False)
+    assert "conversation:session" in client.data
+
+    await llm.reset_conversation("session")
+    assert "conversation:session" not in client.data
+    assert await llm.conversations.load("session") is None
+
+
+@pytest.mark.asyncio
+async def test_reset_conversation_deletes_evicted_conversation():
+    client = FakeRedis()
+    llm = make_service(client, max_conversations=1)
+    await llm.get_response("Remember the number 42.", "session", use_cache=False)
+    await llm.get_response("Hi.", "other", use_cache=False)
+    assert "session" not in llm.conversations
+
+    await llm.reset_conversation("session")
+    await llm.get_response("What was the number?", "session", use_cache=False)
+    contents = [message.content for message in llm.conversations.get("session")]
+    assert "Remember the number 42." not in contents
+
+
+@pytest.mark.asyncio
+async def test_reset_conversation_is_immediate_without_awaiting():
+    client = FakeRedis()
+    llm = make_service(client)
+    await llm.get_response("Remember the number 42.", "session", use_cache=False)
+
+    llm.reset_conversation("session")
+    assert await llm.conversations.load("session") is None
+    await asyncio.sleep(0)
+    assert "conversation:session" not in client.data
+
+
+@pytest.mark.asyncio
+async def test_conversation_evicted_during_generation_keeps_reply():
+    client = FakeRedis()
+    llm = make_service(client, max_conversations=1)
+
+    # Another conversation starts while the first reply is being generated
+    first = asyncio.ensure_future(llm.get_response("Hello there.", "session", use_cache=False))
+    await asyncio.sleep(0.01)
+    await llm.get_response("Hi.", "other", use_cache=False)
+    response = await first
+
+    conversation = await llm.conversations.load("session")
+    assert [message.content for message in conversation][-1] == response
+    assert response in client.data["conversation:session"]
+    assert len(llm.conversations) == 1
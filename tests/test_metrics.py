@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from server.exceptions import ModelError, ProcessingError
+from server.utils.error_handler import handle_service_errors
+from server.utils.metrics import LATENCY_BUCKETS, REGISTRY, Histogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.histogram("latency_seconds", "Latency", stage="a").observe(0.003, count=4)
+    registry.counter("calls_total", "Calls", outcome="success").inc(3)
+    return registry
+
+
+def test_quantiles_within_one_bucket():
+    # Latencies around 20 ms with a long tail
+    values = np.random.default_rng(0).lognormal(np.log(0.02), 0.6, 20000)
+    histogram = Histogram("check_seconds")
+    for value in values:
+        histogram.observe(float(value))
+
+    edges = (0.0,) + LATENCY_BUCKETS
+    for q in (0.5, 0.95, 0.99):
+        index = int(np.searchsorted(edges, np.percentile(values, q * 100)))
+        low, high = edges[index - 1], edges[min(index, len(edges) - 1)]
+        assert low <= histogram.quantile(q) <= high
+    assert histogram.quantile(1.0) <= values.max()
+
+
+def test_snapshot(registry):
+    snapshot = registry.snapshot()
+    assert snapshot['calls_total{outcome="success"}'] == 3
+    assert snapshot['latency_seconds{stage="a"}']["count"] == 4
+    assert registry.counter("calls_total", outcome="success").snapshot() == 3
+
+
+def test_metric_name_keeps_its_type(registry):
+    with pytest.raises(ValueError):
+        registry.histogram("calls_total")
+
+
+def test_to_prometheus(registry):
+    text = registry.to_prometheus()
+    assert "# TYPE latency_seconds histogram" in text
+    assert "# TYPE calls_total counter" in text
+    assert 'latency_seconds_bucket{stage="a",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{stage="a"} 4' in text
+    assert 'calls_total{outcome="success"} 3' in text
+
+
+def test_service_error_counters():
+    attempts = []
+
+    async def fallback():
+        return "fallback"
+
+    @handle_service_errors(retries=3, backoff=0.0)
+    async def flaky():
+        attempts.append(None)
+        if len(attempts) < 3:
+            raise ProcessingError("flaky")
+        return "ok"
+
+    @handle_service_errors(retries=3, backoff=0.0, backup_handler=fallback)
+    async def broken():
+        raise ModelError("broken")
+
+    assert asyncio.run(flaky()) == "ok"
+    assert asyncio.run(broken()) == "fallback"
+
+    metrics = REGISTRY.snapshot()
+    name = flaky.__qualname__
+    assert metrics[f'service_calls_total{{function="{name}",outcome="success"}}'] == 1
+    assert metrics[f'service_retries_total{{function="{name}"}}'] == 2
+    assert metrics[f'service_errors_total{{error="ProcessingError",function="{name}"}}'] == 2
+    assert metrics[f'service_call_seconds{{function="{name}"}}']["count"] == 1
+    name = broken.__qualname__
+    assert metrics[f'service_calls_total{{function="{name}",outcome="fallback"}}'] == 1
+    assert metrics[f'service_errors_total{{error="ModelError",function="{name}"}}'] == 1
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from server.llm_service import LLMService
+from server.orchestrator import ConversationOrchestrator, PipelineEventType
+from server.render_backends import create_rasterizer
+from server.rendering_service import RenderingService
+from server.utils.audio import VoiceActivityDetector
+from tests.stubs import ScriptedSTT, make_tts, microphone, utterance, write_avatar
+
+# Generous for a loaded CI box; the placeholder LLM alone takes about 0.1 s
+FIRST_FRAME_BUDGET = 1.0
+
+
+@pytest.fixture
+def services(tmp_path):
+    model_path = write_avatar(tmp_path, 500)
+    renderer = RenderingService(
+        str(model_path),
+        str(tmp_path / "config.yaml"),
+        backend=create_rasterizer("numpy"),
+        render_scale=0.1,
+        codec="raw",
+    )
+    return LLMService(), make_tts(tmp_path), renderer
+
+
+@pytest.mark.asyncio
+async def test_first_frame_latency(services):
+    llm, tts, renderer = services
+    orchestrator = ConversationOrchestrator(ScriptedSTT([]), llm, tts, renderer)
+
+    started = time.perf_counter()
+    types = []
+    events = orchestrator.respond("Hello there.", "latency")
+    async for event in events:
+        assert event.type != PipelineEventType.ERROR, event.data
+        types.append(event.type)
+        if event.type == PipelineEventType.VIDEO_FRAME:
+            break
+    first_frame = time.perf_counter() - started
+    await events.aclose()
+
+    assert first_frame < FIRST_FRAME_BUDGET
+    # Audio is sent before the frames animating it
+    assert types.index(PipelineEventType.RESPONSE_TEXT) < types.index(PipelineEventType.AUDIO)
+    assert types.index(PipelineEventType.AUDIO) < types.index(PipelineEventType.VIDEO_FRAME)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_barge_in_cancels_turn(services):
+    llm, tts, renderer = services
+    stt = ScriptedSTT(["Hello there.", "Wait, one more thing."])
+    orchestrator = ConversationOrchestrator(stt, llm, tts, renderer)
+    # The second utterance starts while the avatar is still answering the first
+    audio = np.concatenate((utterance(1.0, 2.0), utterance(1.0, 1.0)))
+
+    loop = asyncio.get_running_loop()
+    received = []
+    events = orchestrator.run(
+        microphone(audio), "barge-in", vad=VoiceActivityDetector(ScriptedSTT.sample_rate)
+    )
+    async for event in events:
+        assert event.type != PipelineEventType.ERROR, event.data
+        received.append((loop.time(), event))
+        if event.type == PipelineEventType.VIDEO_FRAME and event.turn == 2:
+            break
+    await events.aclose()
+
+    interrupted = [
+        index
+        for index, (_, event) in enumerate(received)
+        if event.type == PipelineEventType.INTERRUPTED
+    ]
+    assert len(interrupted) == 1
+    cut = interrupted[0]
+    assert received[cut][1].turn == 1
+    # Turn 1 was answering when it was cut off, and none of its output followed
+    assert any(
+        event.type == PipelineEventType.VIDEO_FRAME and event.turn == 1
+        for _, event in received[:cut]
+    )
+    assert not any(
+        event.turn == 1
+        and event.type
+        in (PipelineEventType.RESPONSE_TEXT, PipelineEventType.AUDIO, PipelineEventType.VIDEO_FRAME)
+        for _, event in received[cut:]
+    )
+    # Cancelled as soon as the user started speaking again
+    assert received[cut][0] - stt.speech_starts[1] < 0.1
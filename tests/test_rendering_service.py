@@ -0,0 +1,56 @@
+import pytest
+
+from server.render_backends import create_rasterizer
+from server.rendering_service import RenderingService
+from tests.stubs import SAMPLE_RATE, speech, write_avatar
+
+
+@pytest.fixture
+def make_renderer(tmp_path):
+    model_path = write_avatar(tmp_path, 200)
+
+    def make_renderer(**options):
+        return RenderingService(
+            str(model_path),
+            str(tmp_path / "config.yaml"),
+            backend=create_rasterizer("numpy"),
+            render_scale=0.1,
+            codec="delta",
+            **options,
+        )
+
+    return make_renderer
+
+
+AUDIO = speech(0.2).tobytes()
+
+
+@pytest.mark.asyncio
+async def test_unnamed_calls_do_not_share_or_keep_state(make_renderer):
+    renderer = make_renderer()
+    first = renderer.render_frames(AUDIO, SAMPLE_RATE)
+    second = renderer.render_frames(AUDIO, SAMPLE_RATE)
+    await first.__anext__()
+    await second.__anext__()
+    assert len(renderer.session_encoders) == 2
+
+    await first.aclose()
+    async for _ in second:
+        pass
+    assert renderer.session_encoders == {}
+    assert renderer.session_stats == {}
+
+
+@pytest.mark.asyncio
+async def test_named_session_outlives_its_calls_until_idle(make_renderer):
+    renderer = make_renderer(session_idle_timeout=0.0)
+    async for _ in renderer.render_frames(AUDIO, SAMPLE_RATE, session_id="left"):
+        pass
+    assert renderer.get_session_stats("left")["frames_emitted"] > 0
+
+    # Rendering for another session evicts the idle one
+    async for _ in renderer.render_frames(AUDIO, SAMPLE_RATE, session_id="active"):
+        pass
+    assert "left" not in renderer.session_encoders
+    assert renderer.get_session_stats("left")["frames_emitted"] == 0
+    assert renderer.get_session_stats("active")["frames_emitted"] > 0
@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+import pytest
+
+from server.exceptions import CircuitOpenError, GPUError, ProcessingError, ServiceNotReadyError
+from server.utils.error_handler import handle_service_errors
+from server.utils.resilience import CircuitState, circuit_breaker, deadline, time_remaining
+from tests.stubs import make_tts
+
+
+async def fail_once(service: str) -> None:
+    """Open a breaker with a failure threshold of one."""
+
+    @handle_service_errors(retries=1, service=service, failure_threshold=1, reset_timeout=0.05)
+    async def broken():
+        raise GPUError("down")
+
+    with pytest.raises(GPUError):
+        await broken()
+    assert circuit_breaker(service).state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_lets_next_call_through():
+    await fail_once("cancelled-trial")
+
+    @handle_service_errors(retries=1, service="cancelled-trial")
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    await asyncio.sleep(0.06)
+    trial = asyncio.ensure_future(slow())
+    await asyncio.sleep(0.01)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert circuit_breaker("cancelled-trial").state is CircuitState.HALF_OPEN
+
+    assert await slow() == "ok"
+    assert circuit_breaker("cancelled-trial").state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_closed_generator_trial_lets_next_call_through():
+    await fail_once("closed-trial")
+
+    @handle_service_errors(retries=1, service="closed-trial")
+    async def frames():
+        for frame in range(3):
+            yield frame
+
+    await asyncio.sleep(0.06)
+    stream = frames()
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+    assert [frame async for frame in frames()] == [0, 1, 2]
+    assert circuit_breaker("closed-trial").state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_unexpected_error_counts_as_failure():
+    @handle_service_errors(retries=1, service="unexpected", failure_threshold=1)
+    async def buggy():
+        raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        await buggy()
+    with pytest.raises(CircuitOpenError):
+        await buggy()
+
+
+@pytest.mark.asyncio
+async def test_caller_errors_do_not_count_as_failures():
+    @handle_service_errors(retries=1, service="caller-error", failure_threshold=1)
+    async def strict(value):
+        raise ValueError(f"bad value {value}")
+
+    for value in range(3):
+        with pytest.raises(ValueError):
+            await strict(value)
+    assert circuit_breaker("caller-error").state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_nested_open_circuit_does_not_count_as_failure():
+    await fail_once("nested-open")
+
+    @handle_service_errors(retries=1, service="nested-open")
+    async def inner():
+        return "ok"
+
+    @handle_service_errors(retries=3, service="nested-outer", failure_threshold=1)
+    async def outer():
+        try:
+            return await inner()
+        except Exception as e:
+            raise ProcessingError(f"inner failed: {e}") from e
+
+    with pytest.raises(ProcessingError):
+        await outer()
+    assert circuit_breaker("nested-outer").state is CircuitState.CLOSED
+
+
+@pytest.fixture
+def tts(tmp_path):
+    return make_tts(tmp_path, defer_start=True)
+
+
+@pytest.fixture
+def synthesis_breaker():
+    breaker = circuit_breaker("TTSService.synthesize")
+    breaker.reset()
+    yield breaker
+    breaker.reset()
+
+
+@pytest.mark.asyncio
+async def test_emotional_synthesis_trial_closes_circuit(tts, synthesis_breaker):
+    await tts.start()
+    synthesis_breaker.state = CircuitState.OPEN
+    synthesis_breaker.opened_at = time.monotonic() - synthesis_breaker.reset_timeout
+
+    assert await tts.synthesize("Hello.", emotion="happy", use_cache=False)
+    assert synthesis_breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_calls_before_start_do_not_open_circuit(tts, synthesis_breaker):
+    for _ in range(synthesis_breaker.failure_threshold + 1):
+        with pytest.raises(ServiceNotReadyError):
+            await tts.synthesize("Hello.")
+    assert synthesis_breaker.state is CircuitState.CLOSED
+
+    await tts.start()
+    assert await tts.synthesize("Hello.", use_cache=False)
+
+
+@pytest.mark.asyncio
+async def test_stream_items_see_the_budget_but_the_consumer_does_not():
+    @handle_service_errors(retries=1, timeout=0.05, service="stream-budget")
+    async def frames():
+        yield time_remaining()
+        await asyncio.sleep(0.1)
+        yield time_remaining()
+
+    budgets = []
+    async for budget in frames():
+        assert time_remaining() is None
+        budgets.append(budget)
+    assert 0 < budgets[0] <= 0.05
+    assert budgets[1] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_when_first_item_is_late():
+    async def backup():
+        yield "backup"
+
+    @handle_service_errors(retries=3, timeout=0.02, service="stream-late", backup_handler=backup)
+    async def frames():
+        await asyncio.sleep(1)
+        yield "frame"
+
+    assert [item async for item in frames()] == ["backup"]
+
+
+@pytest.mark.asyncio
+async def test_backup_runs_without_the_exhausted_budget():
+    @handle_service_errors(service="backup-inner")
+    async def inner():
+        return time_remaining()
+
+    async def backup():
+        return await inner()
+
+    @handle_service_errors(timeout=0.02, service="backup-outer", backup_handler=backup)
+    async def slow():
+        await asyncio.sleep(1)
+
+    with deadline(0.5):
+        assert await slow() is None
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_from_arguments():
+    attempts = []
+
+    @handle_service_errors(service="hedge", hedge_after=lambda delay: delay)
+    async def first_attempt_stalls(delay):
+        attempts.append(None)
+        await asyncio.sleep(1 if len(attempts) == 1 else 0)
+        return len(attempts)
+
+    assert await first_attempt_stalls(0.01) == 2
+    attempts.clear()
+    assert await first_attempt_stalls(None) == 1
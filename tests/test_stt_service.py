@@ -0,0 +1,60 @@
+import threading
+
+from server.stt_service import RecognizerPool
+
+
+class FakeRecognizer:
+    def __init__(self, pool):
+        self.resets = 0
+        self.pool = pool
+
+    def Reset(self):
+        assert not self.pool.decoding, "Reset while a decode is running"
+        self.resets += 1
+
+
+class FakePool(RecognizerPool):
+    """Pool handing out fake recognizers, without a Vosk model."""
+
+    decoding = False
+
+    def _create_recognizer(self):
+        return FakeRecognizer(self)
+
+
+def test_release_does_not_reset_recognizer_while_decoding():
+    pool = FakePool(None, 16000, max_size=4)
+    entry = pool.acquire("session")
+    started, finish = threading.Event(), threading.Event()
+
+    def decode():
+        # What _run_decode does in the executor
+        with entry.lock:
+            pool.decoding = True
+            started.set()
+            finish.wait()
+            pool.decoding = False
+
+    thread = threading.Thread(target=decode)
+    thread.start()
+    started.wait()
+    try:
+        # The caller was cancelled: its lease is returned while decoding continues
+        pool.done(entry)
+        pool.release("session")
+    finally:
+        finish.set()
+        thread.join()
+
+    assert entry.recognizer.resets == 0
+    assert pool.acquire("next").recognizer is not entry.recognizer
+
+
+def test_release_recycles_idle_recognizer():
+    pool = FakePool(None, 16000, max_size=4)
+    entry = pool.acquire("session")
+    pool.done(entry)
+    pool.release("session")
+
+    assert entry.recognizer.resets == 1
+    assert pool.acquire("next").recognizer is entry.recognizer
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from server.utils.transforms import Transform3D
+
+POSES = 256
+UP = np.array([0.0, 1.0, 0.0])
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_rotation_and_model_matrices_match_scalar(rng):
+    angles = rng.uniform(-np.pi, np.pi, (POSES, 3))
+    positions = rng.uniform(-2, 2, (POSES, 3))
+
+    rotations = Transform3D.rotation_matrices(angles)
+    expected = np.stack([Transform3D.create_rotation_matrix(a) for a in angles])
+    np.testing.assert_allclose(rotations, expected, atol=1e-5)
+
+    models = Transform3D.model_matrices(angles, positions)
+    np.testing.assert_allclose(models[:, :3, :3], expected, atol=1e-5)
+    np.testing.assert_allclose(models[:, :3, 3], positions, atol=1e-6)
+
+
+def test_view_matrices_match_scalar(rng):
+    eyes = rng.uniform(-3, 3, (POSES, 3))
+    targets = rng.uniform(-0.5, 0.5, (POSES, 3))
+
+    views = Transform3D.view_matrices(eyes, targets, UP)
+    for view, eye, target in zip(views, eyes, targets):
+        scalar = Transform3D.create_view_matrix(eye, target, UP)
+        np.testing.assert_allclose(view, scalar, atol=1e-5)
+        np.testing.assert_allclose(scalar[:3, :3] @ scalar[:3, :3].T, np.eye(3), atol=1e-9)
+        # The eye maps to the origin and the target onto the -z axis
+        np.testing.assert_allclose(scalar[:3, :3] @ eye + scalar[:3, 3], 0, atol=1e-9)
+        camera_target = scalar[:3, :3] @ target + scalar[:3, 3]
+        np.testing.assert_allclose(camera_target[:2], 0, atol=1e-9)
+        assert camera_target[2] < 0
+
+
+def test_perspective_matrices_match_scalar(rng):
+    fovs = rng.uniform(0.3, 1.5, POSES)
+
+    projections = Transform3D.perspective_matrices(fovs, 4 / 3, 0.01, 100.0)
+    for projection, fov in zip(projections, fovs):
+        scalar = Transform3D.create_perspective_matrix(float(fov), 4 / 3, 0.01, 100.0)
+        np.testing.assert_allclose(projection, scalar, rtol=1e-5)
+
+
+def test_perspective_matrix_is_cached_read_only():
+    cached = Transform3D.create_perspective_matrix(1.0, 4 / 3, 0.01, 100.0)
+    assert cached is Transform3D.create_perspective_matrix(1.0, 4 / 3, 0.01, 100.0)
+    assert not cached.flags.writeable
+
+
+def test_transform_points(rng):
+    angles = rng.uniform(-np.pi, np.pi, (POSES, 3))
+    positions = rng.uniform(-2, 2, (POSES, 3))
+    points = rng.uniform(-1, 1, (100, 3))
+    homogeneous = np.concatenate((points, np.ones((points.shape[0], 1))), axis=1)
+
+    models = Transform3D.model_matrices(angles, positions)
+    moved = Transform3D.transform_points(models, points)
+    np.testing.assert_allclose(moved, (homogeneous @ models.transpose(0, 2, 1))[..., :3], atol=1e-5)
+    out = np.empty_like(moved)
+    assert Transform3D.transform_points(models, points, out=out) is out
+
+    view = Transform3D.create_view_matrix(np.array([0.0, 0.0, 3.0]), np.zeros(3), UP)
+    matrix = Transform3D.create_perspective_matrix(1.0, 4 / 3, 0.01, 100.0) @ view
+    clip = homogeneous @ matrix.T
+    ndc = Transform3D.transform_points(matrix, points, perspective_divide=True)
+    np.testing.assert_allclose(ndc, clip[:, :3] / clip[:, 3:], rtol=1e-4, atol=1e-4)
@@ -0,0 +1,13 @@
+from server.tts_cache import DiskAudioStore
+
+
+def test_entries_written_by_another_process_are_found(tmp_path):
+    reader = DiskAudioStore(str(tmp_path))
+    writer = DiskAudioStore(str(tmp_path))
+    writer.put("hello", b"\x01\x02" * 8)
+
+    assert "hello" in reader
+    assert bytes(reader.get("hello")) == b"\x01\x02" * 8
+    assert reader.nbytes == 16
+    assert "missing" not in reader
+    assert reader.get("missing") is None